@@ -0,0 +1,110 @@
+# benchmarks/camphouse_concurrency.py
+"""Concurrencia de un solo proceso del MCP de Camphouse contra el mock de Mediatool.
+
+Compara las tools async (cliente httpx compartido) con sus versiones
+síncronas anteriores (`requests`), que FastMCP ejecuta una detrás de otra en
+el event loop. Ambas se sirven en proceso por memory streams, sin pasar por
+el conector (y, por tanto, sin el single-flight del chat), y cada llamada usa
+un ID distinto:
+
+    python -m benchmarks.camphouse_concurrency --concurrency 1 8 32 --latency-ms 50
+"""
+import argparse
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List
+
+from benchmarks.stats import HEADER, format_row, run_concurrently
+
+AGGREGATE_ARGS = {"media_type_id": "mt01", "from_date": "2025-01-01", "to_date": "2025-01-31"}
+
+CALLS = [
+    ("get_organization", lambda i: {"organization_id": f"org{i:03d}"}),
+    ("get_aggregate_media_entries", lambda i: dict(AGGREGATE_ARGS, organization_id=f"org{i:03d}")),
+    ("get_organization_mediatypes", lambda i: {"organization_id": f"org{i:03d}"}),
+]
+
+
+def make_request(endpoint, payload=None, method='GET'):
+    """El cliente síncrono (`requests`) que usaban antes las tools."""
+    import requests
+    from camphouse_mcp.tools.requests import _decode, _prepare
+    from tools import fast_json
+
+    url, headers = _prepare(endpoint)
+    if method.upper() == 'GET':
+        response = requests.get(url, headers=headers, params=payload, timeout=60)
+    else:
+        response = requests.request(method, url, data=fast_json.dumps(payload) if payload else None,
+                                    headers=headers, timeout=60)
+    response.raise_for_status()
+    return None if response.status_code == 204 else _decode(response.content, url)
+
+
+def legacy_server():
+    """Versiones síncronas de las tools medidas, como eran antes."""
+    from mcp.server.fastmcp import FastMCP
+
+    legacy = FastMCP(name="Camphouse MCP (sync)")
+
+    @legacy.tool()
+    def get_organization(organization_id: str) -> Dict[str, Any]:
+        return make_request(f"organizations/{organization_id}", method='GET')
+
+    @legacy.tool()
+    def get_aggregate_media_entries(organization_id: str, media_type_id: str, from_date: str, to_date: str) -> List[Dict]:
+        payload = {"query": {"organizationId": [organization_id], "dateRange": {"from": from_date, "to": to_date},
+                             "mediaTypeId": [media_type_id]}}
+        return make_request("aggregatemediaentries", payload=payload, method='POST')
+
+    @legacy.tool()
+    def get_organization_mediatypes(organization_id: str) -> Dict[str, List[Dict[str, Any]]]:
+        campaigns = make_request(f"organizations/{organization_id}/campaigns", method='GET')
+        ids = list({mt for c in campaigns.get('campaigns', []) for mt in c.get('mediaTypes', [])})
+        return {"mediaTypes": [make_request(f"mediatypes/{mt}", method='GET').get('mediaType', {}) for mt in ids]}
+
+    return legacy
+
+
+async def bench_server(name: str, server, args):
+    from mcp.shared.memory import create_connected_server_and_client_session
+
+    async with create_connected_server_and_client_session(server._mcp_server) as session:
+        for concurrency in args.concurrency:
+            for tool, make_args in CALLS:
+                result = await run_concurrently(lambda i: session.call_tool(tool, make_args(i)), args.calls, concurrency)
+                print(format_row(f"{name} {tool[:22]} c={concurrency}", result))
+
+
+async def bench(args):
+    from benchmarks.mock_mediatool import MockMediatool
+
+    with MockMediatool(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms) as mock:
+        os.environ["MEDIATOOL_URL"] = mock.url
+        os.environ.setdefault("CAMPHOUSE_TOKEN_ID", "benchmark")
+        os.environ.setdefault("CAMPHOUSE_COMPANY_MAIN_ID", "org000")
+        from camphouse_mcp.server import mcp
+        from camphouse_mcp.tools.requests import close_async_client
+
+        print(HEADER)
+        await bench_server("sync", legacy_server(), args)
+        await bench_server("async", mcp, args)
+        await close_async_client()
+        print(f"\nPeticiones al mock de Mediatool: {mock.requests}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--calls", type=int, default=64, help="Llamadas por tool y nivel de concurrencia")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Latencia simulada de Mediatool")
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    logging.getLogger("mcp").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# benchmarks/fake_ga.py
+"""Cliente falso de la Data API de GA para los benchmarks, sin red.
+
+Devuelve protos reales de `data_v1beta` con el número de filas pedido, de modo
+que la conversión `proto_to_dict` y la serialización de FastMCP cuestan lo
+mismo que con la API real.
+"""
+import asyncio
+import datetime
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterator, Tuple
+from unittest import mock
+
+from google.analytics import data_v1beta
+
+
+class FakeBetaAnalyticsDataAsyncClient:
+    """Imita los métodos de `BetaAnalyticsDataAsyncClient` que usan las tools."""
+
+    def __init__(self, rows: int = 100, latency_ms: float = 0.0, rows_per_day: int = 0):
+        self.rows = rows
+        self.latency_ms = latency_ms
+        # Con `rows_per_day`, los informes con la dimensión `date` devuelven esas
+        # filas por cada día del rango (para la caché incremental).
+        self.rows_per_day = rows_per_day
+        self.calls = 0
+        self.days_requested = 0
+        self._responses: Dict[Tuple, object] = {}
+
+    async def _wait(self):
+        self.calls += 1
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+
+    def _build(self, response_cls, request):
+        key = (response_cls, tuple(d.name for d in request.dimensions), tuple(m.name for m in request.metrics))
+        if key not in self._responses:
+            self._responses[key] = response_cls(
+                dimension_headers=[data_v1beta.DimensionHeader(name=d.name) for d in request.dimensions],
+                metric_headers=[
+                    data_v1beta.MetricHeader(name=m.name, type_=data_v1beta.MetricType.TYPE_INTEGER)
+                    for m in request.metrics
+                ],
+                rows=[
+                    data_v1beta.Row(
+                        dimension_values=[data_v1beta.DimensionValue(value=f"{d.name}-{i}") for d in request.dimensions],
+                        metric_values=[data_v1beta.MetricValue(value=str(i * (j + 1))) for j, _ in enumerate(request.metrics)],
+                    )
+                    for i in range(self.rows)
+                ],
+                row_count=self.rows,
+            )
+        return self._responses[key]
+
+    async def run_report(self, request):
+        await self._wait()
+        if self.rows_per_day and "date" in [d.name for d in request.dimensions]:
+            return self._build_dated(request)
+        return self._build(data_v1beta.RunReportResponse, request)
+
+    def _build_dated(self, request):
+        from analytics_mcp.tools.report_cache import resolve_date
+
+        today = datetime.date.today()
+        date_range = request.date_ranges[0]
+        start = resolve_date(date_range.start_date, today)
+        end = resolve_date(date_range.end_date, today)
+        names = [d.name for d in request.dimensions]
+        rows = []
+        for offset in range((end - start).days + 1):
+            day = start + datetime.timedelta(days=offset)
+            self.days_requested += 1
+            for i in range(self.rows_per_day):
+                values = [day.strftime("%Y%m%d") if name == "date" else f"{name}-{i}" for name in names]
+                rows.append(data_v1beta.Row(
+                    dimension_values=[data_v1beta.DimensionValue(value=v) for v in values],
+                    metric_values=[data_v1beta.MetricValue(value=str(day.day * (i + 1))) for _ in request.metrics],
+                ))
+        return data_v1beta.RunReportResponse(
+            dimension_headers=[data_v1beta.DimensionHeader(name=name) for name in names],
+            metric_headers=[
+                data_v1beta.MetricHeader(name=m.name, type_=data_v1beta.MetricType.TYPE_INTEGER)
+                for m in request.metrics
+            ],
+            rows=rows,
+            row_count=len(rows),
+            metadata=data_v1beta.ResponseMetaData(time_zone="UTC", currency_code="EUR"),
+        )
+
+    async def run_realtime_report(self, request):
+        await self._wait()
+        return self._build(data_v1beta.RunRealtimeReportResponse, request)
+
+    async def get_metadata(self, name: str):
+        await self._wait()
+        return data_v1beta.Metadata(
+            name=name,
+            dimensions=[
+                data_v1beta.DimensionMetadata(api_name="date", ui_name="Date"),
+                data_v1beta.DimensionMetadata(
+                    api_name="customEvent:plan", ui_name="Plan", custom_definition=True
+                ),
+            ],
+            metrics=[
+                data_v1beta.MetricMetadata(api_name="sessions", ui_name="Sessions"),
+                data_v1beta.MetricMetadata(
+                    api_name="customEvent:credits", ui_name="Credits", custom_definition=True
+                ),
+            ],
+        )
+
+
+@contextmanager
+def fake_data_api(client: FakeBetaAnalyticsDataAsyncClient) -> Iterator[FakeBetaAnalyticsDataAsyncClient]:
+    """Sustituye `create_data_api_client` en los módulos de tools de GA."""
+    from analytics_mcp.tools.reporting import core, metadata, realtime
+
+    with ExitStack() as stack:
+        for module in (core, metadata, realtime):
+            stack.enter_context(mock.patch.object(module, "create_data_api_client", lambda: client))
+        yield client
@@ -0,0 +1,81 @@
+# benchmarks/ga_incremental_report.py
+"""Caché incremental de `run_report` por día (`analytics_mcp/tools/report_cache.py`).
+
+Repite preguntas de ventana móvil ("sesiones por fecha y canal de los últimos
+N días") contra el servidor de GA en proceso con el cliente falso de
+`benchmarks.fake_ga`, cuya latencia crece con los días pedidos. Compara la
+ejecución completa con `ANALYTICS_MCP_REPORT_CACHE=incremental`: latencia, días
+pedidos a la Data API (la cuota de un informe crece con las filas que recorre)
+y peticiones:
+
+    python -m benchmarks.ga_incremental_report --days 30 90 --repeat 10
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+
+
+def report_args(days: int):
+    return {
+        "property_id": 123456,
+        "date_ranges": [{"start_date": f"{days}daysAgo", "end_date": "yesterday"}],
+        "dimensions": ["date", "sessionDefaultChannelGroup"],
+        "metrics": ["sessions", "totalUsers"],
+        "order_bys": [{"dimension": {"dimension_name": "date"}}],
+    }
+
+
+class LatencyByDay:
+    """Cliente falso cuya latencia es fija más un coste por día del rango."""
+
+    def __init__(self, client, base_ms: float, per_day_ms: float):
+        self.client = client
+        self.base_ms = base_ms
+        self.per_day_ms = per_day_ms
+
+    async def run_report(self, request):
+        before = self.client.days_requested
+        response = await self.client.run_report(request)
+        days = self.client.days_requested - before
+        await asyncio.sleep((self.base_ms + self.per_day_ms * days) / 1000)
+        return response
+
+
+async def bench(args):
+    from analytics_mcp.server import mcp
+    from analytics_mcp.tools import report_cache
+    from benchmarks.fake_ga import FakeBetaAnalyticsDataAsyncClient, fake_data_api
+
+    print(f"{'escenario':<28} {'p50 ms':>8} {'1.ª ms':>8} {'llamadas':>9} {'días pedidos':>13}")
+    for days in args.days:
+        for mode in ("completo", "incremental"):
+            os.environ["ANALYTICS_MCP_REPORT_CACHE"] = mode
+            report_cache._cache = None
+            client = FakeBetaAnalyticsDataAsyncClient(rows_per_day=args.rows_per_day)
+            with fake_data_api(LatencyByDay(client, args.base_ms, args.per_day_ms)):
+                samples = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    await mcp.call_tool("run_report", report_args(days))
+                    samples.append((time.perf_counter() - started) * 1000)
+            print(f"{f'{days} días, {mode}':<28} {statistics.median(samples):>8.1f} {samples[0]:>8.1f} "
+                  f"{client.calls:>9} {client.days_requested:>13}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, nargs="+", default=[30, 90])
+    parser.add_argument("--repeat", type=int, default=10, help="Veces que se repite cada pregunta")
+    parser.add_argument("--rows-per-day", type=int, default=8)
+    parser.add_argument("--base-ms", type=float, default=150.0, help="Latencia fija de cada petición")
+    parser.add_argument("--per-day-ms", type=float, default=10.0, help="Latencia por día del rango")
+    args = parser.parse_args()
+    logging.getLogger("mcp").setLevel(logging.WARNING)
+    asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
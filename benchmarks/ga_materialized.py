@@ -0,0 +1,101 @@
+# benchmarks/ga_materialized.py
+"""Informes de GA materializados en segundo plano (`analytics_mcp/tools/materialized.py`).
+
+Escribe un YAML con dos informes recurrentes (tráfico por canal y conversiones
+por campaña), los materializa una vez como haría el scheduler y repite las
+mismas preguntas con `run_report` contra el servidor de GA en proceso, con el
+cliente falso de `benchmarks.fake_ga`. Compara la latencia y las peticiones a
+la Data API con la ejecución en vivo, y muestra el sello de frescura:
+
+    python -m benchmarks.ga_materialized --repeat 20 --rows 2000 --latency-ms 300
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+SPECS = """
+- name: traffic_by_channel
+  property_id: 123456
+  date_ranges: [{start_date: 28daysAgo, end_date: yesterday}]
+  dimensions: [sessionDefaultChannelGroup]
+  metrics: [sessions, totalUsers]
+- name: conversions_by_campaign
+  property_id: 123456
+  date_ranges: [{start_date: 28daysAgo, end_date: yesterday}]
+  dimensions: [campaignName]
+  metrics: [conversions]
+"""
+
+QUESTIONS = {
+    "canales": {
+        "property_id": "123456",
+        "date_ranges": [{"start_date": "28daysAgo", "end_date": "yesterday"}],
+        "dimensions": ["sessionDefaultChannelGroup"],
+        "metrics": ["sessions", "totalUsers"],
+        "order_bys": [{"metric": {"metric_name": "sessions"}, "desc": True}],
+        "limit": 10,
+    },
+    "campañas": {
+        "property_id": 123456,
+        "date_ranges": [{"start_date": "28daysAgo", "end_date": "yesterday"}],
+        "dimensions": ["campaignName"],
+        "metrics": ["conversions"],
+    },
+}
+
+
+async def bench(args):
+    from analytics_mcp.server import mcp
+    from analytics_mcp.tools import materialized
+    from benchmarks.fake_ga import FakeBetaAnalyticsDataAsyncClient, fake_data_api
+
+    with tempfile.TemporaryDirectory() as directory:
+        specs_path = os.path.join(directory, "reports.yaml")
+        with open(specs_path, "w", encoding="utf-8") as f:
+            f.write(SPECS)
+        os.environ["ANALYTICS_MCP_MATERIALIZED_DIR"] = directory
+
+        print(f"{'escenario':<24} {'p50 ms':>8} {'p95 ms':>8} {'llamadas':>9}")
+        stamp = None
+        for mode in ("en vivo", "materializado"):
+            os.environ["ANALYTICS_MCP_MATERIALIZED_REPORTS"] = specs_path if mode == "materializado" else ""
+            materialized._materializer = None
+            client = FakeBetaAnalyticsDataAsyncClient(rows=args.rows, latency_ms=args.latency_ms)
+            with fake_data_api(client):
+                materializer = materialized.get_materializer()
+                if materializer is not None:
+                    started = time.perf_counter()
+                    await materializer.run_due()
+                    print(f"materialización: {len(materializer.specs)} informes en "
+                          f"{(time.perf_counter() - started) * 1000:.1f} ms, {client.calls} llamadas")
+                    client.calls = 0
+                for question, tool_args in QUESTIONS.items():
+                    samples = []
+                    for _ in range(args.repeat):
+                        started = time.perf_counter()
+                        _, result = await mcp.call_tool("run_report", tool_args)
+                        samples.append((time.perf_counter() - started) * 1000)
+                    stamp = result["result"].get("materialized", stamp)
+                    p95 = statistics.quantiles(samples, n=20)[-1] if len(samples) > 1 else samples[0]
+                    print(f"{f'{question}, {mode}':<24} {statistics.median(samples):>8.1f} {p95:>8.1f} {client.calls:>9}")
+                    client.calls = 0
+        print(f"\nsello: {json.dumps(stamp)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="Veces que se repite cada pregunta")
+    parser.add_argument("--rows", type=int, default=2000, help="Filas de cada informe")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Latencia simulada de la Data API")
+    args = parser.parse_args()
+    logging.getLogger("mcp").setLevel(logging.WARNING)
+    asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
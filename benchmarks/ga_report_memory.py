@@ -0,0 +1,79 @@
+# benchmarks/ga_report_memory.py
+"""Pico de memoria y tiempo al convertir y serializar informes grandes de GA.
+
+Llama a `run_report` del servidor de GA en proceso (con el cliente falso de
+`benchmarks.fake_ga`) e incluye la serialización de FastMCP del resultado.
+Compara la conversión anterior (`ANALYTICS_MCP_ROW_FORMAT=proto`) con la
+codificación compacta por filas, en memoria y con volcado a fichero:
+
+    python -m benchmarks.ga_report_memory --rows 10000 50000 250000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+
+SCENARIOS = (
+    ("proto_to_dict", {"ANALYTICS_MCP_ROW_FORMAT": "proto"}),
+    ("compacto", {"ANALYTICS_MCP_ROW_FORMAT": "compact", "ANALYTICS_MCP_INLINE_BYTES": str(2**40)}),
+    ("compacto + fichero", {"ANALYTICS_MCP_ROW_FORMAT": "compact", "ANALYTICS_MCP_INLINE_BYTES": "1000000"}),
+)
+
+ARGS = {
+    "property_id": 123456,
+    "date_ranges": [{"start_date": "30daysAgo", "end_date": "yesterday"}],
+    "dimensions": ["date", "sessionDefaultChannelGroup", "country"],
+    "metrics": ["sessions", "totalUsers", "conversions"],
+}
+
+
+async def measure(mcp, name: str) -> None:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    content, _ = await mcp.call_tool("run_report", ARGS)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    payload = sum(len(c.text) for c in content)
+    print(f"{name:<24} {elapsed * 1000:>10.1f} {peak / 2**20:>10.1f} {payload / 2**20:>10.2f}")
+
+
+async def run(args):
+    from analytics_mcp.server import mcp
+    from benchmarks.fake_ga import FakeBetaAnalyticsDataAsyncClient, fake_data_api
+
+    os.environ.setdefault("ANALYTICS_MCP_SPILL_DIR", tempfile.mkdtemp(prefix="ga_report_memory_"))
+    for rows in args.rows:
+        client = FakeBetaAnalyticsDataAsyncClient(rows=rows)
+        with fake_data_api(client):
+            # Construye (y cachea) la respuesta falsa fuera de la medición.
+            await client.run_report(_request())
+            print(f"\n{rows} filas")
+            print(f"{'scenario':<24} {'ms':>10} {'peak MB':>10} {'texto MB':>10}")
+            for name, env in SCENARIOS:
+                os.environ.update(env)
+                await measure(mcp, name)
+
+
+def _request():
+    from google.analytics import data_v1beta
+
+    return data_v1beta.RunReportRequest(
+        dimensions=[data_v1beta.Dimension(name=d) for d in ARGS["dimensions"]],
+        metrics=[data_v1beta.Metric(name=m) for m in ARGS["metrics"]],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 50000])
+    args = parser.parse_args()
+    logging.getLogger("mcp").setLevel(logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
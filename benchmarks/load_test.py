@@ -0,0 +1,208 @@
+# benchmarks/load_test.py
+"""Prueba de carga de extremo a extremo del chat (`main.handler`), sin red.
+
+Usa el LLM falso (`LLM_PROVIDER=fake`, ver `llm/fake_llm.py`), que emite
+function calls guionizadas contra el servidor MCP de Camphouse real, y este a
+su vez contra el mock local de Mediatool. N usuarios virtuales envían turnos
+con un tiempo de espera entre ellos mientras un monitor muestrea:
+
+  - el retraso del event loop (cuánto tarda en despertar un `sleep` corto),
+  - la memoria del proceso (RSS y, con --tracemalloc, la del heap de Python),
+  - el tamaño del historial de la conversación.
+
+    python -m benchmarks.load_test --users 20 --turns 10 --llm-latency-ms 300
+    python -m benchmarks.load_test --users 50 --llm-async --script guion.json
+"""
+import argparse
+import asyncio
+import logging
+import os
+import resource
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+from benchmarks.stats import HEADER, format_row, percentile, summarize
+
+DEFAULT_SCRIPT = [
+    {"calls": [{"name": "get_organization", "args": {"organization_id": "org001"}}],
+     "answer": "La organización org001 está activa."},
+    {"calls": [{"name": "get_organization_campaigns", "args": {"organization_id": "org001"}}],
+     "answer": "org001 tiene campañas en curso."},
+    {"calls": [
+        {"name": "get_subsidiaries_organization", "args": {}},
+        {"name": "get_aggregate_media_entries", "args": {
+            "organization_id": "org001", "media_type_id": "mt01",
+            "from_date": "2025-01-01", "to_date": "2025-01-31",
+        }},
+    ], "answer": "Resumen de inversión de enero."},
+    {"calls": [], "answer": "¡De nada!"},
+]
+
+
+def rss_mb() -> float:
+    """RSS actual del proceso; si no hay /proc, el máximo según getrusage."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Monitor:
+    """Muestrea el retraso del event loop y la memoria cada `interval` segundos."""
+
+    def __init__(self, interval: float, llm_client):
+        self.interval = interval
+        self.llm_client = llm_client
+        self.lags_ms: List[float] = []
+        self.timeline: List[Dict[str, Any]] = []
+        self.turns_done = 0
+        self.started = time.perf_counter()
+        self._task = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def sample(self, window_lags: List[float] = ()):
+        self.timeline.append({
+            "t_s": time.perf_counter() - self.started,
+            "turns": self.turns_done,
+            "lag_max_ms": max(window_lags) if window_lags else 0.0,
+            "rss_mb": rss_mb(),
+            "heap_mb": tracemalloc.get_traced_memory()[0] / 2**20 if tracemalloc.is_tracing() else 0.0,
+            "history": len(self.llm_client.conversation_history),
+        })
+
+    async def _run(self):
+        tick = 0.01
+        window_lags: List[float] = []
+        next_sample = self.started + self.interval
+        self.sample()
+        while True:
+            t0 = time.perf_counter()
+            await asyncio.sleep(tick)
+            lag = max(0.0, (time.perf_counter() - t0 - tick) * 1000)
+            self.lags_ms.append(lag)
+            window_lags.append(lag)
+            if time.perf_counter() >= next_sample:
+                self.sample(window_lags)
+                window_lags = []
+                next_sample += self.interval
+
+
+async def virtual_user(user: int, handler, turns: int, think_s: float, monitor: Monitor, samples: List[float], errors: List[str]):
+    history: List[Dict[str, str]] = []
+    for turn in range(turns):
+        message = f"usuario {user}, turno {turn}"
+        t0 = time.perf_counter()
+        try:
+            answer = await handler(message, history)
+        except Exception as e:
+            answer = f"Error: {e}"
+        samples.append((time.perf_counter() - t0) * 1000)
+        if answer.startswith(("Error", "⚠️")) or "⚠️ No se encontró conector" in answer:
+            errors.append(answer)
+        history += [{"role": "user", "content": message}, {"role": "assistant", "content": answer}]
+        monitor.turns_done += 1
+        await asyncio.sleep(think_s)
+
+
+def print_report(samples: List[float], elapsed: float, errors: List[str], monitor: Monitor):
+    print(HEADER)
+    print(format_row("chat turn", summarize(samples, elapsed, len(errors))))
+
+    lags = monitor.lags_ms or [0.0]
+    print(f"\nRetraso del event loop: p50={percentile(lags, 50):.1f}ms "
+          f"p99={percentile(lags, 99):.1f}ms max={max(lags):.1f}ms")
+
+    print(f"\n{'t(s)':>7} {'turnos':>7} {'lag max':>9} {'rss MB':>8} {'heap MB':>8} {'historial':>10}")
+    for row in monitor.timeline:
+        print(f"{row['t_s']:>7.1f} {row['turns']:>7} {row['lag_max_ms']:>9.1f} "
+              f"{row['rss_mb']:>8.1f} {row['heap_mb']:>8.2f} {row['history']:>10}")
+
+    first, last = monitor.timeline[0], monitor.timeline[-1]
+    turns = max(1, last["turns"] - first["turns"])
+    print(f"\nCrecimiento de memoria: RSS {last['rss_mb'] - first['rss_mb']:+.1f} MB "
+          f"({(last['rss_mb'] - first['rss_mb']) * 1024 / turns:+.1f} KB/turno)")
+    if tracemalloc.is_tracing():
+        print(f"Heap de Python: {last['heap_mb'] - first['heap_mb']:+.2f} MB "
+              f"({(last['heap_mb'] - first['heap_mb']) * 1024 / turns:+.2f} KB/turno)")
+    for error in sorted(set(errors))[:5]:
+        print(f"⚠️ {error}")
+
+
+async def run(args):
+    from benchmarks.mock_mediatool import MockMediatool
+
+    with MockMediatool(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms) as mock:
+        os.environ["MEDIATOOL_URL"] = mock.url
+        os.environ["LLM_PROVIDER"] = "fake"
+        os.environ["FAKE_LLM_LATENCY_MS"] = str(args.llm_latency_ms)
+        os.environ["FAKE_LLM_BLOCKING"] = "0" if args.llm_async else "1"
+        os.environ.setdefault("CAMPHOUSE_TOKEN_ID", "benchmark")
+        os.environ.setdefault("CAMPHOUSE_COMPANY_MAIN_ID", "org000")
+        if args.transport:
+            os.environ["CAMPHOUSE_MCP_TRANSPORT"] = args.transport
+        if args.script:
+            os.environ["FAKE_LLM_SCRIPT"] = args.script
+
+        import main
+        from observability import loop_watchdog
+        loop_watchdog.start_from_env()
+        if not args.script:
+            main.llm_client.set_script(DEFAULT_SCRIPT)
+        await main.init_client()
+
+        if args.tracemalloc:
+            tracemalloc.start()
+        monitor = Monitor(args.sample_interval, main.llm_client)
+        monitor.start()
+        samples: List[float] = []
+        errors: List[str] = []
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(
+                virtual_user(u, main.handler, args.turns, args.think_ms / 1000, monitor, samples, errors)
+                for u in range(args.users)
+            ))
+        finally:
+            elapsed = time.perf_counter() - started
+            await monitor.stop()
+            monitor.sample()
+            for connector in main.llm_client.connectors:
+                await connector.close()
+
+        print_report(samples, elapsed, errors, monitor)
+        print(f"\nPeticiones al mock de Mediatool: {mock.requests}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10, help="Usuarios virtuales concurrentes")
+    parser.add_argument("--turns", type=int, default=10, help="Turnos por usuario")
+    parser.add_argument("--think-ms", type=float, default=100.0, help="Espera entre turnos de un usuario")
+    parser.add_argument("--llm-latency-ms", type=float, default=200.0, help="Latencia simulada de cada llamada al LLM")
+    parser.add_argument("--llm-async", action="store_true",
+                        help="Simular el LLM con asyncio.sleep en vez de bloquear el event loop como Gemini")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Latencia simulada de Mediatool")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--script", help="Guion JSON del LLM falso (por defecto, uno sobre Camphouse)")
+    parser.add_argument("--transport", help="Transporte del conector de Camphouse (stdio, memory, http, sse)")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="Segundos entre muestras del monitor")
+    parser.add_argument("--tracemalloc", action="store_true", help="Medir también el heap de Python (más lento)")
+    args = parser.parse_args()
+    logging.getLogger("mcp").setLevel(logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
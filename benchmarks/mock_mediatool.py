@@ -0,0 +1,122 @@
+# benchmarks/mock_mediatool.py
+"""Servidor HTTP local que sustituye a la API de Mediatool en los benchmarks.
+
+Reproduce las respuestas grabadas de `fixtures/mediatool.json` (ruta con
+placeholders `{id}` -> respuesta) con una latencia configurable. Cada petición
+se atiende en su propio hilo, como un upstream real con concurrencia.
+
+Uso independiente:
+    python -m benchmarks.mock_mediatool --port 8900 --latency-ms 80
+    MEDIATOOL_URL=http://127.0.0.1:8900 python -m camphouse_mcp.server
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+from urllib.parse import urlparse
+
+DEFAULT_FIXTURES = Path(__file__).parent / "fixtures" / "mediatool.json"
+
+
+def load_routes(path: Path = DEFAULT_FIXTURES) -> List[Tuple[str, "re.Pattern", bytes]]:
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    routes = []
+    for route in data["routes"]:
+        pattern = re.escape(route["path"].strip("/")).replace(r"\{id\}", r"[^/]+")
+        routes.append((route["method"].upper(), re.compile(f"^{pattern}$"), json.dumps(route["response"]).encode()))
+    return routes
+
+
+class MockMediatool:
+    """Mock de Mediatool en un hilo de fondo; usable como context manager."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0, fixtures: Optional[Path] = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.routes = load_routes(fixtures or DEFAULT_FIXTURES)
+        self.requests = 0
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self):
+                mock.requests += 1
+                delay = mock.latency_ms + random.uniform(-mock.jitter_ms, mock.jitter_ms)
+                if delay > 0:
+                    time.sleep(delay / 1000)
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                body = mock.match(self.command, urlparse(self.path).path)
+                status = 200 if body is not None else 404
+                body = body if body is not None else b'{"message": "Not found"}'
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = _reply
+
+            def log_message(self, *args: Any):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            # El backlog por defecto (5) descarta conexiones con muchos clientes concurrentes.
+            request_queue_size = 256
+
+        self.server = Server((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def match(self, method: str, path: str) -> Optional[bytes]:
+        path = path.strip("/")
+        for route_method, pattern, body in self.routes:
+            if route_method == method and pattern.match(path):
+                return body
+        return None
+
+    def start(self) -> "MockMediatool":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "MockMediatool":
+        return self.start()
+
+    def __exit__(self, *exc: Any):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES)
+    args = parser.parse_args()
+    mock = MockMediatool(args.host, args.port, args.latency_ms, args.jitter_ms, args.fixtures)
+    print(f"Mock de Mediatool en {mock.url}")
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
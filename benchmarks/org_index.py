@@ -0,0 +1,76 @@
+# benchmarks/org_index.py
+"""Índice de organizaciones de Camphouse (`camphouse_mcp/tools/org_index.py`).
+
+Contra el mock de Mediatool mide la carga del índice (raíz, filiales y socios
+de cada organización, en paralelo y con una sola petición a la vez), el
+refresco incremental y la resolución de nombres a IDs: con el índice frente a
+lo que hacía el LLM antes (`get_subsidiaries_organization` y buscar el nombre
+en la respuesta, una llamada por pregunta).
+
+    python -m benchmarks.org_index --latency-ms 50
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+NAMES = ["Subsidiary 1", "subsidiary 3", "SUBSIDIARY", "Subsidiary 12", "sub 2"]
+
+
+async def timed(coro):
+    started = time.perf_counter()
+    result = await coro
+    return result, (time.perf_counter() - started) * 1000
+
+
+async def bench(args):
+    from benchmarks.mock_mediatool import MockMediatool
+
+    with MockMediatool(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms) as mock:
+        os.environ["MEDIATOOL_URL"] = mock.url
+        os.environ.setdefault("CAMPHOUSE_TOKEN_ID", "benchmark")
+        from camphouse_mcp.tools.org_index import OrganizationIndex
+        from camphouse_mcp.tools.requests import close_async_client, make_request_async
+
+        for concurrency in (1, args.concurrency):
+            index = OrganizationIndex("org000", concurrency=concurrency)
+            _, ms = await timed(index.ensure())
+            print(f"carga (concurrency={concurrency:>2}): {ms:8.1f} ms, {index.api_calls} peticiones, "
+                  f"{len(index.organizations)} organizaciones, {len(index.partner_details)} socios")
+
+        calls = index.api_calls
+        _, ms = await timed(index.reload())
+        print(f"refresco incremental:      {ms:8.1f} ms, {index.api_calls - calls} peticiones")
+
+        async def by_api(name):
+            subsidiaries = await make_request_async("organizations/org000/subsidiaries", method='GET')
+            return [o for o in subsidiaries.get("organizations", []) if name.lower() in o.get("name", "").lower()]
+
+        requests_before = mock.requests
+        _, api_ms = await timed(asyncio.gather(*(by_api(name) for name in NAMES * args.rounds)))
+        api_requests = mock.requests - requests_before
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            for name in NAMES:
+                index.find(name)
+        index_us = (time.perf_counter() - started) / (len(NAMES) * args.rounds) * 1e6
+        lookups = len(NAMES) * args.rounds
+        print(f"\nresolver {lookups} nombres por la API: {api_ms:8.1f} ms en total, {api_requests} peticiones")
+        print(f"resolver {lookups} nombres con el índice: {index_us:6.1f} µs por nombre, 0 peticiones")
+        await close_async_client()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Latencia simulada de Mediatool")
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=16, help="Peticiones simultáneas durante la carga")
+    parser.add_argument("--rounds", type=int, default=20, help="Repeticiones de la lista de nombres")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# benchmarks/prefetch.py
+"""Precarga especulativa de tools (`connectors/prefetch.py`) contra el mock de Mediatool.
+
+Simula sesiones de chat sobre el conector de Camphouse (transporte memory):
+`get_subsidiaries_organization`, y tras un tiempo de "LLM"
+`get_organization_campaigns` y `get_organization_vehicles` de una de las
+organizaciones devueltas. Con probabilidad `--top-share` la organización es
+una de las primeras de la lista (las que el LLM suele mostrar), si no una
+cualquiera. Compara la latencia de las llamadas de seguimiento, las peticiones
+al upstream y el acierto de la precarga con y sin ella:
+
+    python -m benchmarks.prefetch --sessions 60 --latency-ms 80 --think-ms 300
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import time
+
+from benchmarks.stats import HEADER, format_row, summarize
+
+
+async def run_sessions(connector, args, seed):
+    from connectors.prefetch import result_payload
+
+    rng = random.Random(seed)
+    latencies = {"get_organization_campaigns": [], "get_organization_vehicles": []}
+    semaphore = asyncio.Semaphore(args.parallel)
+
+    async def timed(tool, tool_args, session_id):
+        started = time.perf_counter()
+        await connector.execute(tool, tool_args, session_id=session_id)
+        latencies[tool].append((time.perf_counter() - started) * 1000)
+
+    async def conversation(session_id):
+        organizations = result_payload(
+            await connector.execute("get_subsidiaries_organization", {}, session_id=session_id))["organizations"]
+        ids = [o["_id"] for o in organizations]
+        org_id = rng.choice(ids[:args.top_n] if rng.random() < args.top_share else ids)
+        await asyncio.sleep(args.think_ms / 1000)
+        await timed("get_organization_campaigns", {"organization_id": org_id}, session_id)
+        await asyncio.sleep(args.think_ms / 1000)
+        await timed("get_organization_vehicles", {"organization_id": org_id}, session_id)
+
+    async def one(i):
+        async with semaphore:
+            await asyncio.wait_for(conversation(f"s{i}"), 60)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.sessions)))
+    elapsed = time.perf_counter() - started
+    return {tool: summarize(samples, elapsed) for tool, samples in latencies.items()}
+
+
+async def bench(args):
+    from benchmarks.mock_mediatool import MockMediatool
+    from connectors.camphouse_connector import CamphouseConnector
+    from connectors.prefetch import Prefetcher
+
+    with MockMediatool(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms) as mock:
+        os.environ["MEDIATOOL_URL"] = mock.url
+        os.environ.setdefault("CAMPHOUSE_TOKEN_ID", "benchmark")
+        os.environ.setdefault("CAMPHOUSE_COMPANY_MAIN_ID", "org000")
+
+        print(HEADER)
+        for enabled in (False, True):
+            connector = CamphouseConnector(transport="memory")
+            await connector.connect_to_server()
+            if enabled:
+                connector.prefetcher = Prefetcher(connector.name, connector._prefetch_call,
+                                                  lambda: connector.cached_tools, budget=args.budget)
+            before = mock.requests
+            results = await run_sessions(connector, args, seed=args.seed)
+            label = "prefetch" if enabled else "sin prefetch"
+            for tool, result in results.items():
+                print(format_row(f"{label} {tool.replace('get_organization_', '')}", result))
+            print(f"{label}: {mock.requests - before} peticiones a Mediatool")
+            if enabled:
+                print(f"precarga: {connector.prefetcher.stats()}")
+            await connector.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=60)
+    parser.add_argument("--parallel", type=int, default=6, help="Sesiones simultáneas")
+    parser.add_argument("--latency-ms", type=float, default=80.0, help="Latencia simulada de Mediatool")
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--think-ms", type=float, default=300.0, help="Tiempo del LLM entre llamadas")
+    parser.add_argument("--budget", type=int, default=4, help="Precargas por resultado")
+    parser.add_argument("--top-share", type=float, default=0.7, help="Fracción de sesiones que eligen una de las primeras organizaciones")
+    parser.add_argument("--top-n", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    logging.getLogger("mcp").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    asyncio.run(bench(args))
+
+
+if __name__ == "__main__":
+    main()
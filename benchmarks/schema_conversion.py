@@ -0,0 +1,101 @@
+# benchmarks/schema_conversion.py
+"""Benchmark de la conversión de esquemas de tools a declaraciones de Gemini.
+
+Convierte los esquemas reales de los servidores de GA y Camphouse (cargados en
+proceso) y compara la implementación anterior (limpieza recursiva + segundo
+recorrido de whitelist) con `tools.tool_converter`, en frío y memorizada:
+
+    python -m benchmarks.schema_conversion --rounds 2000
+"""
+import argparse
+import logging
+import os
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from tools import tool_converter
+
+
+def legacy_clean(schema: Any) -> Any:
+    if not isinstance(schema, dict):
+        return schema
+    cleaned = {}
+    for k, v in schema.items():
+        if k == "additionalProperties":
+            continue
+        if isinstance(v, dict):
+            cleaned[k] = legacy_clean(v)
+        elif isinstance(v, list):
+            cleaned[k] = [legacy_clean(i) for i in v]
+        else:
+            cleaned[k] = v
+    return cleaned
+
+
+def legacy_convert(tools: List[Any]) -> List[Dict]:
+    """Conversión previa a tools/tool_converter.py, como referencia."""
+    out = []
+    for tool in tools:
+        declaration = {"name": tool.name, "description": tool.description,
+                       "parameters": {"type": "object", "properties": {}, "required": []}}
+        schema = legacy_clean(tool.inputSchema)
+        props = {}
+        for name, prop in schema.get("properties", {}).items():
+            cleaned = {k: prop[k] for k in ("type", "description", "enum") if k in prop}
+            if prop.get("type") == "array":
+                cleaned["items"] = prop.get("items", {"type": "string"})
+            props[name] = cleaned
+        declaration["parameters"]["properties"] = props
+        declaration["parameters"]["required"] = schema.get("required", [])
+        out.append({"function_declarations": [declaration]})
+    return out
+
+
+def load_tools() -> List[Any]:
+    from mcp.types import Tool
+
+    os.environ.setdefault("CAMPHOUSE_TOKEN_ID", "benchmark")
+    os.environ.setdefault("CAMPHOUSE_COMPANY_MAIN_ID", "org000")
+    from analytics_mcp.server import mcp as ga
+    from camphouse_mcp.server import mcp as camphouse
+
+    return [
+        Tool(name=t.name, description=t.description, inputSchema=t.parameters)
+        for server in (ga, camphouse)
+        for t in server._tool_manager.list_tools()
+    ]
+
+
+def measure(name: str, convert: Callable[[], Any], rounds: int, before: Callable[[], None] = lambda: None):
+    elapsed = 0.0
+    for _ in range(rounds):
+        before()
+        t0 = time.perf_counter()
+        convert()
+        elapsed += time.perf_counter() - t0
+    before()
+    tracemalloc.start()
+    convert()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<28} {elapsed / rounds * 1e6:>10.1f} {peak / 1024:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=1000, help="Conversiones del catálogo completo por escenario")
+    args = parser.parse_args()
+    logging.getLogger("mcp").setLevel(logging.WARNING)
+
+    tools = load_tools()
+    print(f"{len(tools)} tools\n")
+    print(f"{'scenario':<28} {'µs/catálogo':>10} {'peak KB':>10}")
+    measure("legacy (2 recorridos)", lambda: legacy_convert(tools), args.rounds)
+    measure("compilado, en frío", lambda: tool_converter.convert_mcp_tools_to_gemini(tools), args.rounds,
+            before=tool_converter.clear_cache)
+    measure("compilado, memorizado", lambda: tool_converter.convert_mcp_tools_to_gemini(tools), args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/stats.py
+"""Utilidades comunes de los benchmarks: percentiles y medición concurrente."""
+import asyncio
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples_ms: List[float], elapsed_s: float, errors: int = 0) -> Dict[str, float]:
+    return {
+        "calls": len(samples_ms),
+        "errors": errors,
+        "mean_ms": statistics.mean(samples_ms) if samples_ms else 0.0,
+        "p50_ms": percentile(samples_ms, 50) if samples_ms else 0.0,
+        "p95_ms": percentile(samples_ms, 95) if samples_ms else 0.0,
+        "p99_ms": percentile(samples_ms, 99) if samples_ms else 0.0,
+        "calls_per_s": len(samples_ms) / elapsed_s if elapsed_s else 0.0,
+    }
+
+
+async def run_concurrently(call: Callable[[int], Awaitable[Any]], calls: int, concurrency: int) -> Dict[str, float]:
+    """Lanza `calls` llamadas con a lo sumo `concurrency` en curso y mide cada una.
+
+    `call` recibe el índice de la llamada; una excepción o un resultado con
+    `isError` cuenta como error.
+    """
+    samples: List[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            t0 = time.perf_counter()
+            try:
+                result = await call(i)
+                if getattr(result, "isError", False):
+                    errors += 1
+            except Exception:
+                errors += 1
+            samples.append((time.perf_counter() - t0) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    return summarize(samples, time.perf_counter() - started, errors)
+
+
+HEADER = f"{'scenario':<36} {'calls':>6} {'err':>4} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'calls/s':>9}"
+
+
+def format_row(name: str, r: Dict[str, float]) -> str:
+    return (
+        f"{name:<36} {r['calls']:>6} {r['errors']:>4} {r['mean_ms']:>8.2f} {r['p50_ms']:>8.2f} "
+        f"{r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['calls_per_s']:>9.1f}"
+    )
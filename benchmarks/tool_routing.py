@@ -0,0 +1,106 @@
+# benchmarks/tool_routing.py
+"""Benchmark del router de tools (`llm/tool_router.py`).
+
+Para un conjunto de preguntas de ejemplo compara el catálogo completo con la
+selección del router: bytes de las declaraciones enviadas a Gemini, tokens
+estimados (bytes / 4, o `count_tokens` real con `--count-tokens` si hay
+`GEMINI_API_KEY`), tiempo del router por pregunta y si la tool esperada está
+en la selección (recall).
+
+    python -m benchmarks.tool_routing --top-k 6
+    python -m benchmarks.tool_routing --count-tokens   # requiere GEMINI_API_KEY
+    ANALYTICS_MCP_DESCRIPTION_MODE=compact python -m benchmarks.tool_routing
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.schema_conversion import load_tools
+from llm.tool_router import ToolRouter, catalog_names
+from tools.tool_converter import convert_mcp_tools_to_gemini
+
+# (pregunta, tool que debería elegir el modelo; None si no necesita ninguna)
+QUERIES = [
+    ("¿Cuántos usuarios tuvo la propiedad 123456 la semana pasada?", "run_report"),
+    ("Sesiones por canal de la propiedad 123456 en los últimos 30 días", "run_report"),
+    ("¿Cuántos usuarios activos hay ahora mismo en la propiedad 123456?", "run_realtime_report"),
+    ("Lista mis cuentas y propiedades de Google Analytics", "get_account_summaries"),
+    ("¿Qué dimensiones y métricas personalizadas tiene la propiedad 123456?", "get_custom_dimensions_and_metrics"),
+    ("Enlaces de Google Ads de la propiedad 123456", "list_google_ads_links"),
+    ("Dame los detalles de la propiedad 123456", "get_property_details"),
+    ("¿Qué campañas tiene la organización org001?", "get_organization_campaigns"),
+    ("Detalles de la campaña 42", "get_campaign_details"),
+    ("Gasto de la organización org001 por tipo de medio en enero", "get_aggregate_media_entries"),
+    ("¿Cuáles son las filiales de mi organización?", "get_subsidiaries_organization"),
+    ("Socios de la organización org001", "get_list_partners_organization"),
+    ("¿Cuál es el ID de la organización que se llama Subsidiary 3?", "find_organizations"),
+    ("Jerarquía de la organización org003", "get_organization_hierarchy"),
+    ("Dame un resumen de la organización org001", "get_organization_snapshot"),
+    ("Vehículos de la organización org001", "get_organization_vehicles"),
+    ("Tipos de medio de la organización org001", "get_organization_mediatypes"),
+    ("Campos estándar disponibles", "get_standard_fields"),
+    ("Dame la siguiente página del resultado", "fetch_result_page"),
+    ("Hola, ¿qué puedes hacer?", None),
+    ("¿Y el mes anterior?", None),
+]
+
+
+def declaration_bytes(declarations: List[Dict[str, Any]]) -> int:
+    return len(json.dumps(declarations, ensure_ascii=False))
+
+
+def count_tokens(model: Any, declarations: List[Dict[str, Any]]) -> Optional[int]:
+    if model is None:
+        return None
+    return model.count_tokens("ok", tools=declarations).total_tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top-k", type=int, default=None, help="Tools por pregunta (por defecto CHAT_MCP_TOOL_ROUTER_TOP_K o 6)")
+    parser.add_argument("--min-score", type=float, default=None, help="Puntuación mínima antes de mandar el catálogo completo")
+    parser.add_argument("--rounds", type=int, default=200, help="Repeticiones para medir el tiempo del router")
+    parser.add_argument("--count-tokens", action="store_true", help="Contar tokens con la API de Gemini")
+    args = parser.parse_args()
+    logging.getLogger("mcp").setLevel(logging.WARNING)
+
+    declarations = convert_mcp_tools_to_gemini(load_tools())
+    router = ToolRouter(top_k=args.top_k if args.top_k is not None else None, min_score=args.min_score)
+    model = None
+    if args.count_tokens:
+        import google.generativeai as genai
+        genai.configure(api_key=os.environ["GEMINI_API_KEY"])
+        model = genai.GenerativeModel(os.getenv("GEMINI_MODEL", "gemini-1.5-turbo"))
+
+    full_bytes = declaration_bytes(declarations)
+    full_tokens = count_tokens(model, declarations)
+    print(f"{len(declarations)} tools, catálogo completo: {full_bytes} bytes, ~{full_tokens or full_bytes // 4} tokens")
+    print(f"router: top_k={router.top_k}, min_score={router.min_score}\n")
+    print(f"{'pregunta':<64} {'tools':>5} {'bytes':>7} {'tokens':>7} {'µs':>6}  esperada")
+
+    total_bytes = hits = expected = 0
+    for query, tool in QUERIES:
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            selected = router.select(query, declarations)
+        micros = (time.perf_counter() - started) / args.rounds * 1e6
+        size = declaration_bytes(selected)
+        tokens = count_tokens(model, selected) or size // 4
+        total_bytes += size
+        names = catalog_names(selected)
+        if tool:
+            expected += 1
+            hits += tool in names
+        mark = "-" if tool is None else ("ok" if tool in names else f"FALTA {tool}")
+        print(f"{query[:64]:<64} {len(selected):>5} {size:>7} {tokens:>7} {micros:>6.0f}  {mark}")
+
+    average = total_bytes / len(QUERIES)
+    print(f"\nMedia por pregunta: {average:.0f} bytes ({average / full_bytes:.0%} del catálogo completo)")
+    print(f"Recall de la tool esperada: {hits}/{expected}")
+
+
+if __name__ == "__main__":
+    main()
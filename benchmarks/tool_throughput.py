@@ -0,0 +1,97 @@
+# benchmarks/tool_throughput.py
+"""Benchmark offline de throughput de las tools MCP, sin red.
+
+- camphouse: el servidor MCP de Camphouse contra el mock local de Mediatool
+  (`benchmarks.mock_mediatool`) con latencia configurable.
+- ga: el servidor MCP de GA (en proceso) con un `BetaAnalyticsDataAsyncClient`
+  falso (`benchmarks.fake_ga`).
+
+Reporta p50/p95/p99 de latencia por tool y llamadas/s por nivel de concurrencia:
+    python -m benchmarks.tool_throughput camphouse --concurrency 1 8 32 --latency-ms 50
+    python -m benchmarks.tool_throughput ga --rows 5000 --concurrency 1 8
+"""
+import argparse
+import asyncio
+import logging
+import os
+
+from benchmarks.stats import HEADER, format_row, run_concurrently
+
+CAMPHOUSE_CALLS = [
+    ("get_organization", {"organization_id": "org001"}),
+    ("get_organization_campaigns", {"organization_id": "org001"}),
+    ("get_subsidiaries_organization", {}),
+    ("get_aggregate_media_entries", {
+        "organization_id": "org001", "media_type_id": "mt01",
+        "from_date": "2025-01-01", "to_date": "2025-01-31",
+    }),
+]
+
+GA_CALLS = [
+    ("run_report", {
+        "property_id": 123456,
+        "date_ranges": [{"start_date": "30daysAgo", "end_date": "yesterday"}],
+        "dimensions": ["date", "sessionDefaultChannelGroup"],
+        "metrics": ["sessions", "totalUsers"],
+    }),
+    ("run_realtime_report", {
+        "property_id": 123456, "dimensions": ["country"], "metrics": ["activeUsers"],
+    }),
+    ("get_custom_dimensions_and_metrics", {"property_id": 123456}),
+]
+
+
+async def bench_calls(execute, calls, args):
+    print(HEADER)
+    for concurrency in args.concurrency:
+        for tool, tool_args in calls:
+            result = await run_concurrently(lambda i: execute(tool, tool_args), args.calls, concurrency)
+            print(format_row(f"{tool} c={concurrency}", result))
+
+
+async def bench_camphouse(args):
+    from benchmarks.mock_mediatool import MockMediatool
+    from connectors.camphouse_connector import CamphouseConnector
+
+    with MockMediatool(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms) as mock:
+        os.environ["MEDIATOOL_URL"] = mock.url
+        os.environ.setdefault("CAMPHOUSE_TOKEN_ID", "benchmark")
+        os.environ.setdefault("CAMPHOUSE_COMPANY_MAIN_ID", "org000")
+        connector = CamphouseConnector(transport=args.transport)
+        await connector.connect_to_server()
+        try:
+            await bench_calls(connector.execute, CAMPHOUSE_CALLS, args)
+        finally:
+            await connector.close()
+        print(f"\nPeticiones al mock de Mediatool: {mock.requests}")
+
+
+async def bench_ga(args):
+    from mcp.shared.memory import create_connected_server_and_client_session
+    from analytics_mcp.server import mcp
+    from benchmarks.fake_ga import FakeBetaAnalyticsDataAsyncClient, fake_data_api
+
+    client = FakeBetaAnalyticsDataAsyncClient(rows=args.rows, latency_ms=args.latency_ms)
+    with fake_data_api(client):
+        async with create_connected_server_and_client_session(mcp._mcp_server) as session:
+            await bench_calls(session.call_tool, GA_CALLS, args)
+    print(f"\nLlamadas al cliente falso de GA: {client.calls} ({args.rows} filas por informe)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("server", choices=("camphouse", "ga"))
+    parser.add_argument("--calls", type=int, default=100, help="Llamadas por tool y nivel de concurrencia")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Latencia simulada del upstream")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rows", type=int, default=1000, help="Filas por informe de GA")
+    parser.add_argument("--transport", default="stdio", help="Transporte del conector de Camphouse")
+    args = parser.parse_args()
+    # FastMCP registra cada petición a nivel INFO; en proceso ensucia el informe.
+    logging.getLogger("mcp").setLevel(logging.WARNING)
+    asyncio.run(bench_camphouse(args) if args.server == "camphouse" else bench_ga(args))
+
+
+if __name__ == "__main__":
+    main()
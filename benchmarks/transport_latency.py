@@ -0,0 +1,75 @@
+# benchmarks/transport_latency.py
+"""Compara la latencia por llamada MCP entre transportes (stdio vs memory).
+
+Uso:
+    python -m benchmarks.transport_latency --connector camphouse -n 200
+    python -m benchmarks.transport_latency --tool get_organization --args '{"organization_id": "1"}'
+
+Sin `--tool` mide `list_tools`, que no sale a ninguna API externa.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Dict, Optional
+
+from connectors.camphouse_connector import CamphouseConnector
+from connectors.ga4_connector import GA4Connector
+from benchmarks.stats import percentile
+
+CONNECTORS = {"camphouse": CamphouseConnector, "ga4": GA4Connector}
+
+
+async def measure(connector_cls, transport: str, calls: int, tool: Optional[str], args: Dict[str, Any]) -> Dict[str, float]:
+    connector = connector_cls(transport=transport, min_sessions=1, max_sessions=1)
+    started = time.perf_counter()
+    await connector.connect_to_server()
+    startup = time.perf_counter() - started
+
+    samples = []
+    try:
+        for _ in range(calls):
+            t0 = time.perf_counter()
+            if tool:
+                await connector.execute(tool, args)
+            else:
+                async with connector.pool.acquire() as session:
+                    await session.list_tools()
+            samples.append((time.perf_counter() - t0) * 1000)
+    finally:
+        await connector.close()
+
+    return {
+        "startup_ms": startup * 1000,
+        "mean_ms": statistics.mean(samples),
+        "p50_ms": percentile(samples, 50),
+        "p95_ms": percentile(samples, 95),
+        "p99_ms": percentile(samples, 99),
+    }
+
+
+async def run(args):
+    connector_cls = CONNECTORS[args.connector]
+    tool_args = json.loads(args.args) if args.args else {}
+    print(f"{'transport':<10} {'startup':>10} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9}  (ms)")
+    for transport in args.transports:
+        r = await measure(connector_cls, transport, args.calls, args.tool, tool_args)
+        print(
+            f"{transport:<10} {r['startup_ms']:>10.1f} {r['mean_ms']:>9.3f} "
+            f"{r['p50_ms']:>9.3f} {r['p95_ms']:>9.3f} {r['p99_ms']:>9.3f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connector", choices=sorted(CONNECTORS), default="camphouse")
+    parser.add_argument("--transports", nargs="+", default=["stdio", "memory"])
+    parser.add_argument("-n", "--calls", type=int, default=100)
+    parser.add_argument("--tool", help="Herramienta a llamar en lugar de list_tools")
+    parser.add_argument("--args", help="Argumentos JSON para --tool")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
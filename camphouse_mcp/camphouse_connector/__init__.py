@@ -1,4 +1,6 @@
 from . import organizations
 from . import fields
 from . import campaigns
-from . import mediatypes
\ No newline at end of file
+from . import mediatypes
+from . import results
+from . import hierarchy
\ No newline at end of file
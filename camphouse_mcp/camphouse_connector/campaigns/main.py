@@ -1,10 +1,10 @@
 from typing import Any, Dict, List
-from camphouse_mcp.tools.requests import make_request
+from camphouse_mcp.tools.requests import make_request_async
 from ...coordinator import mcp
 
 
 @mcp.tool(title="Camphouse: Get campaign details")
-def get_campaign_details(campaign_id: str) -> Dict[str, Any]:
+async def get_campaign_details(campaign_id: str) -> Dict[str, Any]:
     """
     Camphouse: Get details of a specific campaign by its ID.
     Args:
@@ -14,4 +14,4 @@ def get_campaign_details(campaign_id: str) -> Dict[str, Any]:
     """
 
     endpoint = f"campaigns/{campaign_id}"
-    return make_request(endpoint, method='GET')
\ No newline at end of file
+    return await make_request_async(endpoint, method='GET')
\ No newline at end of file
@@ -0,0 +1,74 @@
+from typing import Any, Dict
+from camphouse_mcp.tools.org_index import get_index
+from camphouse_mcp.tools.requests import MediatoolAPIError
+from ...coordinator import mcp
+
+MAX_TREE_DEPTH = 5
+
+
+@mcp.tool(title="Camphouse: Find organizations by name")
+async def find_organizations(name: str, limit: int = 10) -> Dict[str, Any]:
+    """
+    Camphouse: Find the IDs of organizations by name (the main organization, its subsidiaries and their partners).
+    Answers from an in-memory index, without calling the API; use it to resolve an organization name to its ID.
+    Matching ignores case and accents: exact names first, then prefixes and partial matches.
+    Args:
+        name (str): The name (or part of the name) of the organization.
+        limit (int): Maximum number of matches to return.
+    Returns:
+        Dict[str, Any]: A dictionary with the `organizations` found (`_id`, `name`, `parentId` and `relation`: root, subsidiary or partner).
+    """
+    index = get_index()
+    await index.ensure()
+    return {"organizations": index.find(name, limit)}
+
+
+@mcp.tool(title="Camphouse: Get the hierarchy of an organization")
+async def get_organization_hierarchy(organization_id: str = "", depth: int = 1) -> Dict[str, Any]:
+    """
+    Camphouse: Get where an organization sits in the organization tree: its path from the main organization,
+    its parent, its subsidiaries (down to `depth` levels) and its partners. Answers from an in-memory index.
+    Args:
+        organization_id (str): The ID of the organization. Empty for the main organization.
+        depth (int): Levels of subsidiaries to include (maximum 5).
+    Returns:
+        Dict[str, Any]: A dictionary with the `organization`, its `relation`, `path`, `parent`, `children` and `partners`.
+    """
+    index = get_index()
+    await index.ensure()
+    organization_id = organization_id or index.root_id
+    relation = index.relation(organization_id)
+    if relation is None:
+        raise MediatoolAPIError(f"Mediatool: la organización {organization_id} no pertenece al árbol de {index.root_id}.")
+
+    organization = index.get(organization_id)
+    if relation == "partner":
+        return {
+            "organization": organization,
+            "relation": relation,
+            "partner_of": [index.subtree(org_id, 0) for org_id, ids in index.partners.items() if organization_id in ids],
+        }
+    tree = index.subtree(organization_id, min(max(depth, 0), MAX_TREE_DEPTH))
+    return {
+        "organization": organization,
+        "relation": relation,
+        "path": index.path(organization_id),
+        "parent": index.parent(organization_id),
+        "children": tree.get("children", []),
+        "partners": [{"_id": p, "name": index.partner_details[p].get("name")} for p in index.partners.get(organization_id, [])],
+    }
+
+
+@mcp.tool(title="Camphouse: Refresh the organization index")
+async def refresh_organization_index(full: bool = False) -> Dict[str, Any]:
+    """
+    Camphouse: Reload the in-memory organization index used by `find_organizations` and `get_organization_hierarchy`.
+    Only needed when an organization was just created or renamed; the index refreshes itself periodically.
+    Args:
+        full (bool): Also reload the partners of every organization (by default only those of new organizations).
+    Returns:
+        Dict[str, Any]: A dictionary with the size and age of the index and the API calls made so far.
+    """
+    index = get_index()
+    await index.reload(full=full)
+    return index.describe()
@@ -1,9 +1,14 @@
+import os
+import asyncio
 from typing import Any, Dict, List
-from camphouse_mcp.tools.requests import make_request
+from camphouse_mcp.tools.requests import make_request_async
 from ...coordinator import mcp
 
+# Peticiones simultáneas a Mediatool por llamada, para que una lista larga de IDs no abra una por ID.
+MEDIATYPES_CONCURRENCY = max(1, int(os.getenv("CAMPHOUSE_MEDIATYPES_CONCURRENCY", 16)))
+
 @mcp.tool(title="Camphouse: Get media types details")
-def get_mediatypes_data(mediatype_ids: List[str]) -> List[Dict[str, Any]]:
+async def get_mediatypes_data(mediatype_ids: List[str]) -> List[Dict[str, Any]]:
     """
     Camphouse: Get details of multiple media types by their IDs.
     Args:
@@ -11,8 +16,12 @@ def get_mediatypes_data(mediatype_ids: List[str]) -> List[Dict[str, Any]]:
     Returns:
         List[Dict[str, Any]]: A list of dictionaries containing the details of each requested media type.
     """
-    mediatypes = []
-    for mt_id in mediatype_ids:
-        mt_details = make_request(f"mediatypes/{mt_id}", method='GET')
-        mediatypes.append(mt_details.get('mediaType', {}))
-    return mediatypes
\ No newline at end of file
+    # Las peticiones de cada media type se lanzan a la vez, hasta MEDIATYPES_CONCURRENCY en curso.
+    semaphore = asyncio.Semaphore(MEDIATYPES_CONCURRENCY)
+
+    async def fetch(mt_id):
+        async with semaphore:
+            return await make_request_async(f"mediatypes/{mt_id}", method='GET')
+
+    details = await asyncio.gather(*(fetch(mt_id) for mt_id in mediatype_ids))
+    return [mt_details.get('mediaType', {}) for mt_details in details]
\ No newline at end of file
@@ -1,14 +1,15 @@
 import os
 import json
+import asyncio
 from typing import Any, Dict, List
-from camphouse_mcp.tools.requests import make_request
+from camphouse_mcp.tools.requests import make_request_async
 from ..mediatypes.main import get_mediatypes_data
 from ...coordinator import mcp
 
 CAMPHOUSE_COMPANY_MAIN_ID = os.getenv("CAMPHOUSE_COMPANY_MAIN_ID", None)
 
 @mcp.tool(title="Camphouse: Get organization details")
-def get_organization(organization_id: str) -> Dict[str, Any]:
+async def get_organization(organization_id: str) -> Dict[str, Any]:
     """
     Camphouse: Get details of a specific organization by its ID.
     Args:
@@ -18,21 +19,21 @@ def get_organization(organization_id: str) -> Dict[str, Any]:
     """
 
     endpoint = f"organizations/{organization_id}"
-    return make_request(endpoint, method='GET')
+    return await make_request_async(endpoint, method='GET')
 
 @mcp.tool(title="Camphouse: Get all subsidiaries of an organization")
-def get_subsidiaries_organization() -> Dict[str, List[Dict[str, Any]]]:
+async def get_subsidiaries_organization() -> Dict[str, List[Dict[str, Any]]]:
     """
     Camphouse: Get all subsidiaries of the main organization associated with the provided token.
     Returns:
         Dict[str, List[Dict[str, Any]]]: A dictionary containing a list of dictionaries with the details of each subsidiary.
     """
     endpoint = f"organizations/{CAMPHOUSE_COMPANY_MAIN_ID}/subsidiaries"
-    return make_request(endpoint, method='GET')
+    return await make_request_async(endpoint, method='GET')
 
 
 @mcp.tool(title="Camphouse: Get all partners of an organization")
-def get_list_partners_organization(organization_id: str) -> Dict[str, List[Dict[str, Any]]]:
+async def get_list_partners_organization(organization_id: str) -> Dict[str, List[Dict[str, Any]]]:
     """
     Camphouse: Get all partners of a specific organization by its ID.
     Args:
@@ -42,11 +43,11 @@ def get_list_partners_organization(organization_id: str) -> Dict[str, List[Dict[
     """
 
     endpoint = f"organizations/{organization_id}/partners"
-    return make_request(endpoint, method='GET')
+    return await make_request_async(endpoint, method='GET')
 
 
 @mcp.tool(title="Camphouse: Get all campaigns of an organization")
-def get_organization_campaigns(organization_id: str) -> Dict[str, List[Dict[str, Any]]]:
+async def get_organization_campaigns(organization_id: str) -> Dict[str, List[Dict[str, Any]]]:
     """
     Camphouse: Get all campaigns of a specific organization by its ID.
     Args:
@@ -56,10 +57,10 @@ def get_organization_campaigns(organization_id: str) -> Dict[str, List[Dict[str,
     """
 
     endpoint = f"organizations/{organization_id}/campaigns"
-    return make_request(endpoint, method='GET')
+    return await make_request_async(endpoint, method='GET')
 
 @mcp.tool(title="Camphouse: Get all media types of an organization")
-def get_organization_mediatypes(organization_id: str) -> Dict[str, List[Dict[str, Any]]]:
+async def get_organization_mediatypes(organization_id: str) -> Dict[str, List[Dict[str, Any]]]:
     """
     Camphouse: Get all media types of a specific organization by its ID.
     Media types are the different mediums in which advertisement is made such as TV, Radio, SEM, Online Video. Organizations create their own media types and can have as many as they like. Media entries must always be connected to a media type.
@@ -68,15 +69,17 @@ def get_organization_mediatypes(organization_id: str) -> Dict[str, List[Dict[str
     Returns:
         Dict[str, List[Dict[str, Any]]]: A dictionary containing a list of dictionaries with the details of each media type.
     """
-    campaigns = get_organization_campaigns(organization_id)
-    mediatypes_ids = [mt for c in campaigns.get('campaigns', []) for mt in c.get('mediaTypes', [])]
-    mediatypes_ids = list(set(mediatypes_ids))
-    mediatypes_data = get_mediatypes_data(mediatypes_ids)
+    campaigns = await get_organization_campaigns(organization_id)
+    return {"mediaTypes": await _mediatypes_of_campaigns(campaigns)}
 
-    return {"mediaTypes": mediatypes_data}
+
+async def _mediatypes_of_campaigns(campaigns: Dict[str, Any]) -> List[Dict[str, Any]]:
+    mediatypes_ids = [mt for c in (campaigns or {}).get('campaigns', []) for mt in c.get('mediaTypes', [])]
+    mediatypes_ids = list(dict.fromkeys(mediatypes_ids))
+    return await get_mediatypes_data(mediatypes_ids)
 
 @mcp.tool(title="Camphouse: Get all vehicles of an organization")
-def get_organization_vehicles(organization_id: str) -> Dict[str, List[Dict[str, Any]]]:
+async def get_organization_vehicles(organization_id: str) -> Dict[str, List[Dict[str, Any]]]:
     """
     Camphouse: Get all vehicles of a specific organization by its ID.
     Vehicles are the different channels that advertisement are made throuhg. For TV they can be Fox News, BBC etc. Each vehicle must be connected to an organization and a media type. Each media entry must be connected to a vehicle.
@@ -87,11 +90,11 @@ def get_organization_vehicles(organization_id: str) -> Dict[str, List[Dict[str,
     """
 
     endpoint = f"organizations/{organization_id}/vehicles"
-    return make_request(endpoint, method='GET')
+    return await make_request_async(endpoint, method='GET')
 
 
 @mcp.tool(title="Camphouse: Get all data fields of an organization")
-def get_data_fields_for_organization(organization_id: str) -> Dict:
+async def get_data_fields_for_organization(organization_id: str) -> Dict:
     """
     Camphouse: Get all data fields associated with a specific organization by its ID.
     Args:
@@ -103,10 +106,10 @@ def get_data_fields_for_organization(organization_id: str) -> Dict:
         "q": json.dumps({"organizationId": str(organization_id)})
     }
 
-    return make_request("fields", payload=payload, method='GET')
+    return await make_request_async("fields", payload=payload, method='GET')
 
 @mcp.tool(title="Camphouse: Get all media entries for an organization")
-def get_media_entries_for_organization(organization_id: str) -> Dict[str, List[Dict[str, Any]]]:
+async def get_media_entries_for_organization(organization_id: str) -> Dict[str, List[Dict[str, Any]]]:
     """
     Camphouse: Get all media entries associated with a specific organization by its ID.
     Args:
@@ -119,11 +122,11 @@ def get_media_entries_for_organization(organization_id: str) -> Dict[str, List[D
         "q": json.dumps({"organizationId": str(organization_id)})
     }
 
-    return make_request("searchmediaentries", payload=payload, method='GET')
+    return await make_request_async("searchmediaentries", payload=payload, method='GET')
 
 
 @mcp.tool(title="Camphouse: Aggregate media entries for an organization")
-def get_aggregate_media_entries(
+async def get_aggregate_media_entries(
     organization_id: str,
     media_type_id: str,
     from_date: str,
@@ -177,4 +180,72 @@ def get_aggregate_media_entries(
         ]
     }
 
-    return make_request("aggregatemediaentries", payload=payload, method='POST')
+    return await make_request_async("aggregatemediaentries", payload=payload, method='POST')
+
+
+# Campos de cada elemento que se conservan en el resumen de `get_organization_snapshot`.
+SNAPSHOT_FIELDS = {
+    "campaigns": ("_id", "name", "startDate", "endDate", "budget", "mediaTypes"),
+    "mediaTypes": ("_id", "name"),
+    "vehicles": ("_id", "name", "mediaTypeId"),
+    "fields": ("_id", "name", "type"),
+}
+SNAPSHOT_MAX_ITEMS = 50
+
+
+def _compact(items: Any, keys, max_items: int) -> Dict[str, Any]:
+    items = items if isinstance(items, list) else []
+    compact = [{k: item[k] for k in keys if k in item} for item in items[:max_items] if isinstance(item, dict)]
+    return {"count": len(items), "items": compact, "truncated": len(items) > max_items}
+
+
+@mcp.tool(title="Camphouse: Get an overview of an organization")
+async def get_organization_snapshot(organization_id: str, max_items: int = SNAPSHOT_MAX_ITEMS) -> Dict[str, Any]:
+    """
+    Camphouse: Get a compact overview of an organization in a single call: its details plus its campaigns, media types,
+    vehicles and data fields (count and main attributes of each). Use it for overview questions instead of calling
+    `get_organization`, `get_organization_campaigns`, `get_organization_mediatypes`, `get_organization_vehicles`
+    and `get_data_fields_for_organization` one by one.
+    Args:
+        organization_id (str): The ID of the organization.
+        max_items (int): Maximum number of items listed per section (the count is always the total).
+    Returns:
+        Dict[str, Any]: A dictionary with the `organization` and one section per entity with `count`, `items` and `truncated`.
+            Sections that could not be retrieved are listed in `errors`.
+    """
+    async def campaigns_and_mediatypes():
+        # Los media types salen de las campañas: se piden una sola vez para ambas secciones.
+        campaigns = await get_organization_campaigns(organization_id)
+        return campaigns, await _mediatypes_of_campaigns(campaigns)
+
+    organization, campaigns, vehicles, fields = await asyncio.gather(
+        get_organization(organization_id),
+        campaigns_and_mediatypes(),
+        get_organization_vehicles(organization_id),
+        get_data_fields_for_organization(organization_id),
+        return_exceptions=True,
+    )
+    if isinstance(organization, BaseException):
+        raise organization
+
+    errors = {}
+    sections = {}
+    if isinstance(campaigns, BaseException):
+        errors["campaigns"] = errors["mediaTypes"] = str(campaigns)
+    else:
+        sections["campaigns"] = campaigns[0].get("campaigns") if campaigns[0] else []
+        sections["mediaTypes"] = campaigns[1]
+    for name, result in (("vehicles", vehicles), ("fields", fields)):
+        if isinstance(result, BaseException):
+            errors[name] = str(result)
+        else:
+            sections[name] = (result or {}).get(name, [])
+
+    max_items = max(max_items, 0)
+    snapshot = {"organization": (organization or {}).get("organization", organization)}
+    for name, keys in SNAPSHOT_FIELDS.items():
+        if name in sections:
+            snapshot[name] = _compact(sections[name], keys, max_items)
+    if errors:
+        snapshot["errors"] = errors
+    return snapshot
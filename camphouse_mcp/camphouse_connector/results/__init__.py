@@ -0,0 +1 @@
+from . import main
\ No newline at end of file
@@ -0,0 +1,42 @@
+from typing import Any, Dict
+from tools.result_store import get_store
+from ...coordinator import mcp
+
+MAX_PAGE_SIZE = 1000
+
+
+@mcp.tool(title="Camphouse: Fetch a page of a stored result")
+def fetch_stored_result_page(result_id: str, offset: int = 0, limit: int = 100) -> Dict[str, Any]:
+    """
+    Camphouse: Get more items of a large result that was stored on disk. Tools whose output is too large
+    return only the first items of their biggest list plus a `stored_result` handle with `result_id`, `field` and `rows`.
+    Args:
+        result_id (str): The `result_id` of the `stored_result` handle.
+        offset (int): Index of the first item to return.
+        limit (int): Number of items to return (maximum 1000).
+    Returns:
+        Dict[str, Any]: A dictionary with the `items`, the `offset`, the `total_rows` and the `next_offset` (null at the end).
+    """
+    store = get_store()
+    meta = store.describe(result_id)
+    items = store.page(result_id, offset, min(max(limit, 0), MAX_PAGE_SIZE))
+    next_offset = max(offset, 0) + len(items)
+    return {
+        "field": meta.get("field"),
+        "offset": max(offset, 0),
+        "items": items,
+        "total_rows": meta["rows"],
+        "next_offset": next_offset if next_offset < meta["rows"] else None,
+    }
+
+
+@mcp.tool(title="Camphouse: Describe a stored result")
+def describe_stored_result(result_id: str) -> Dict[str, Any]:
+    """
+    Camphouse: Get the metadata of a large result stored on disk (tool, field, number of items, size and expiry).
+    Args:
+        result_id (str): The `result_id` of the `stored_result` handle.
+    Returns:
+        Dict[str, Any]: A dictionary with the metadata of the stored result.
+    """
+    return get_store().describe(result_id)
@@ -1,14 +1,39 @@
 import os
+from contextlib import asynccontextmanager
 from mcp.server.fastmcp import FastMCP
+from observability import loop_watchdog
+from tools.result_store import spill_large_result
 
 CAMPHOUSE_COMPANY_MAIN_ID = os.getenv("CAMPHOUSE_COMPANY_MAIN_ID", None)
 print("CAMPHOUSE_COMPANY_MAIN_ID:", CAMPHOUSE_COMPANY_MAIN_ID)
 
-mcp = FastMCP(
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    # Watchdog opcional del event loop: las tools síncronas lo bloquean.
+    loop_watchdog.start_from_env(server)
+    # Precarga opcional del índice de organizaciones (ver tools/org_index.py).
+    if os.getenv("CAMPHOUSE_ORG_INDEX_WARMUP", "").lower() in ("1", "true", "yes"):
+        from camphouse_mcp.tools.org_index import get_index
+        get_index().warm_up()
+    yield {}
+
+
+class CamphouseMCP(FastMCP):
+    async def call_tool(self, name, arguments):
+        # Los resultados demasiado grandes se guardan en disco y la tool devuelve
+        # un avance más un handle para `fetch_stored_result_page` (ver tools/result_store.py).
+        result = await self._tool_manager.call_tool(name, arguments, context=self.get_context(), convert_result=False)
+        result = spill_large_result(result, tool_name=name)
+        return self._tool_manager.get_tool(name).fn_metadata.convert_result(result)
+
+
+mcp = CamphouseMCP(
     name="Camphouse MCP",
     description="MCP for Camphouse",
     version="0.1.0",
     instructions="You are a helpful assistant that helps users to interact with the Camphouse API. Use the tools below to answer user questions. Always show names and IDs in the responses you get from the API if applicable.",
+    lifespan=lifespan,
     
 )
 
@@ -1,12 +1,54 @@
 
+import argparse
+import os
+
 from .coordinator import mcp
 
+HTTP_TRANSPORTS = ("streamable-http", "sse")
+
+
+def create_app():
+    """Builds the ASGI app for the HTTP transports.
+
+    Used as the uvicorn factory so that each worker process builds its own app.
+    """
+    if os.getenv("MCP_SERVER_TRANSPORT", "streamable-http") == "sse":
+        return mcp.sse_app()
+    # Stateless so any worker behind the load balancer can serve any request.
+    mcp.settings.stateless_http = True
+    return mcp.streamable_http_app()
+
+
 def run_server() -> None:
     """Runs the server.
 
-    Serves as the entrypoint for the 'runmcp' command.
+    Serves as the entrypoint for the 'runmcp' command. Uses stdio by default;
+    `--transport streamable-http` (or `sse`) serves it over HTTP with uvicorn.
     """
-    mcp.run()
+    parser = argparse.ArgumentParser(description="Camphouse MCP server")
+    parser.add_argument("--transport", choices=("stdio",) + HTTP_TRANSPORTS,
+                        default=os.getenv("MCP_SERVER_TRANSPORT", "stdio"))
+    parser.add_argument("--host", default=mcp.settings.host)
+    parser.add_argument("--port", type=int, default=mcp.settings.port)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("MCP_SERVER_WORKERS", 1)))
+    args = parser.parse_args()
+
+    if args.transport == "stdio":
+        mcp.run()
+        return
+
+    import uvicorn
+
+    # The workers re-import this module, they read the transport from the env.
+    os.environ["MCP_SERVER_TRANSPORT"] = args.transport
+    uvicorn.run(
+        "camphouse_mcp.server:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level=mcp.settings.log_level.lower(),
+    )
 
 
 if __name__ == "__main__":
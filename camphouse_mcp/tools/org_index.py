@@ -0,0 +1,251 @@
+import os
+import time
+import asyncio
+import logging
+import unicodedata
+from typing import Any, Dict, List, Optional, Set
+from camphouse_mcp.tools.requests import MediatoolAPIError, make_request_async
+
+logger = logging.getLogger(__name__)
+
+CAMPHOUSE_COMPANY_MAIN_ID = os.getenv("CAMPHOUSE_COMPANY_MAIN_ID", None)
+# Segundos hasta que la estructura del árbol se vuelve a pedir a Mediatool.
+ORG_INDEX_TTL_SECONDS = float(os.getenv("CAMPHOUSE_ORG_INDEX_TTL_S", 900))
+# Segundos hasta que los socios de una organización se vuelven a pedir.
+ORG_INDEX_PARTNERS_TTL_SECONDS = float(os.getenv("CAMPHOUSE_ORG_INDEX_PARTNERS_TTL_S", 3600))
+# Peticiones simultáneas durante la carga (socios de cada organización).
+ORG_INDEX_CONCURRENCY = int(os.getenv("CAMPHOUSE_ORG_INDEX_CONCURRENCY", 16))
+
+
+def normalize_name(name: Any) -> str:
+    """Nombre sin tildes, en minúsculas y con los espacios colapsados."""
+    text = unicodedata.normalize("NFKD", str(name or "")).encode("ascii", "ignore").decode()
+    return " ".join(text.casefold().split())
+
+
+def _summary(org_id: str, org: Dict[str, Any]) -> Dict[str, Any]:
+    return {"_id": org_id, "name": org.get("name")}
+
+
+class OrganizationIndex:
+    """Índice en memoria del árbol de organizaciones de `root_id`.
+
+    Guarda las organizaciones de `organizations/{root}/subsidiaries` (más la
+    raíz), sus relaciones padre/hijo según `parentId` y los socios de cada una,
+    con un índice de nombres normalizados para resolver nombres a IDs sin
+    llamar a la API.
+
+    La primera carga pide la raíz y las filiales a la vez y después los socios
+    de cada organización en paralelo (hasta `concurrency` peticiones). Cuando
+    la estructura caduca se refresca de forma incremental: se vuelven a pedir
+    la raíz y las filiales, pero los socios solo de las organizaciones nuevas y
+    de las que los tienen desde hace más de `partners_ttl_seconds`;
+    `refresh(full=True)` los vuelve a pedir todos.
+    """
+
+    def __init__(self, root_id: Optional[str], ttl_seconds: Optional[float] = None,
+                 concurrency: Optional[int] = None, partners_ttl_seconds: Optional[float] = None):
+        self.root_id = root_id
+        self.ttl_seconds = ORG_INDEX_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.partners_ttl_seconds = (ORG_INDEX_PARTNERS_TTL_SECONDS if partners_ttl_seconds is None
+                                     else partners_ttl_seconds)
+        self.concurrency = max(1, concurrency or ORG_INDEX_CONCURRENCY)
+        self.organizations: Dict[str, Dict[str, Any]] = {}
+        self.children: Dict[str, List[str]] = {}
+        # organización -> IDs de sus socios; los datos de cada socio en `partner_details`.
+        self.partners: Dict[str, List[str]] = {}
+        self.partner_details: Dict[str, Dict[str, Any]] = {}
+        # organización -> instante en que se pidieron sus socios.
+        self._partners_fetched: Dict[str, float] = {}
+        self._names: Dict[str, Set[str]] = {}
+        self.loaded_at: Optional[float] = None
+        self.api_calls = 0
+        self.refreshes = 0
+        self._lock = None
+        self._lock_loop = None
+        self._warm_up = None
+
+    def fresh(self) -> bool:
+        return self.loaded_at is not None and time.monotonic() - self.loaded_at < self.ttl_seconds
+
+    def _get_lock(self) -> asyncio.Lock:
+        # Un lock por event loop (los benchmarks y el modo memory usan varios).
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    async def ensure(self):
+        """Carga o refresca el índice si ha caducado; las llamadas concurrentes esperan a la misma carga."""
+        if self.fresh():
+            return
+        async with self._get_lock():
+            if not self.fresh():
+                await self.refresh(full=self.loaded_at is None)
+
+    async def reload(self, full: bool = False):
+        """Refresca ahora, aunque no haya caducado."""
+        async with self._get_lock():
+            await self.refresh(full=full or self.loaded_at is None)
+
+    def warm_up(self):
+        """Lanza la carga en segundo plano (una sola vez a la vez)."""
+        if self.fresh() or not self.root_id or (self._warm_up is not None and not self._warm_up.done()):
+            return
+        self._warm_up = asyncio.get_running_loop().create_task(self._warm_up_task())
+
+    async def _warm_up_task(self):
+        try:
+            await self.ensure()
+        except MediatoolAPIError as e:
+            logger.warning("No se pudo precargar el índice de organizaciones: %s", e)
+
+    async def refresh(self, full: bool = False):
+        if not self.root_id:
+            raise MediatoolAPIError("La variable de entorno CAMPHOUSE_COMPANY_MAIN_ID no está configurada.")
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(endpoint):
+            async with semaphore:
+                self.api_calls += 1
+                return await make_request_async(endpoint, method='GET')
+
+        root, subsidiaries = await asyncio.gather(
+            fetch(f"organizations/{self.root_id}"),
+            fetch(f"organizations/{self.root_id}/subsidiaries"),
+        )
+        organizations = {self.root_id: (root or {}).get("organization") or {"_id": self.root_id}}
+        for org in (subsidiaries or {}).get("organizations", []):
+            if org.get("_id"):
+                organizations[org["_id"]] = org
+
+        now = time.monotonic()
+        # Se parte siempre del índice actual: si la petición de unos socios falla,
+        # esa organización conserva su lista anterior (también en un refresco completo).
+        partners = {org_id: ids for org_id, ids in self.partners.items() if org_id in organizations}
+        partner_details = dict(self.partner_details)
+        # En un refresco completo todas las listas se dan por caducadas.
+        fetched = {} if full else {org_id: at for org_id, at in self._partners_fetched.items() if org_id in partners}
+        # Organizaciones nuevas y socios caducados.
+        pending = [org_id for org_id in organizations
+                   if org_id not in fetched or now - fetched[org_id] >= self.partners_ttl_seconds]
+        results = await asyncio.gather(*(fetch(f"organizations/{org_id}/partners") for org_id in pending),
+                                       return_exceptions=True)
+        for org_id, result in zip(pending, results):
+            if isinstance(result, BaseException):
+                # Se reintenta en el siguiente refresco.
+                logger.warning("No se pudieron obtener los socios de %s: %s", org_id, result)
+                continue
+            ids = []
+            for partner in (result or {}).get("organizations", []):
+                if partner.get("_id"):
+                    partner_details[partner["_id"]] = partner
+                    ids.append(partner["_id"])
+            partners[org_id] = ids
+            fetched[org_id] = now
+
+        # Socios que ya no lo son de ninguna organización.
+        referenced = {partner_id for ids in partners.values() for partner_id in ids}
+        partner_details = {partner_id: partner for partner_id, partner in partner_details.items()
+                           if partner_id in referenced}
+        self._partners_fetched = fetched
+        self._swap(organizations, partners, partner_details)
+        self.refreshes += 1
+
+    def _swap(self, organizations, partners, partner_details):
+        children: Dict[str, List[str]] = {}
+        for org_id, org in organizations.items():
+            parent = org.get("parentId")
+            if parent in organizations and parent != org_id and org_id != self.root_id:
+                children.setdefault(parent, []).append(org_id)
+        names: Dict[str, Set[str]] = {}
+        for org_id, org in list(partner_details.items()) + list(organizations.items()):
+            names.setdefault(normalize_name(org.get("name")), set()).add(org_id)
+        # Se sustituye todo de una vez: las búsquedas nunca ven un índice a medias.
+        self.organizations, self.children, self.partners = organizations, children, partners
+        self.partner_details, self._names = partner_details, names
+        self.loaded_at = time.monotonic()
+
+    def get(self, org_id: str) -> Optional[Dict[str, Any]]:
+        return self.organizations.get(org_id) or self.partner_details.get(org_id)
+
+    def parent(self, org_id: str) -> Optional[Dict[str, Any]]:
+        """Organización padre dentro del árbol (la raíz no tiene)."""
+        parent_id = self.organizations.get(org_id, {}).get("parentId")
+        if org_id == self.root_id or parent_id == org_id or parent_id not in self.organizations:
+            return None
+        return _summary(parent_id, self.organizations[parent_id])
+
+    def relation(self, org_id: str) -> Optional[str]:
+        if org_id == self.root_id:
+            return "root"
+        if org_id in self.organizations:
+            return "subsidiary"
+        if org_id in self.partner_details:
+            return "partner"
+        return None
+
+    def path(self, org_id: str) -> List[Dict[str, Any]]:
+        """Cadena de organizaciones desde la raíz hasta `org_id`."""
+        path, seen = [], set()
+        while org_id in self.organizations and org_id not in seen:
+            seen.add(org_id)
+            path.append(_summary(org_id, self.organizations[org_id]))
+            if org_id == self.root_id:
+                break
+            org_id = self.organizations[org_id].get("parentId")
+        return path[::-1]
+
+    def find(self, name: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Organizaciones cuyo nombre coincide: exacto, por prefijo, por palabras o por subcadena."""
+        query = normalize_name(name)
+        if not query:
+            return []
+        words = query.split()
+        ranked = []
+        for normalized, ids in self._names.items():
+            if normalized == query:
+                rank = 0
+            elif normalized.startswith(query):
+                rank = 1
+            elif query in normalized:
+                rank = 2
+            elif all(word in normalized for word in words):
+                rank = 3
+            else:
+                continue
+            ranked.extend((rank, normalized, org_id) for org_id in ids)
+        ranked.sort()
+        return [dict(_summary(org_id, self.get(org_id)), parentId=self.get(org_id).get("parentId"),
+                     relation=self.relation(org_id)) for _, _, org_id in ranked[:max(limit, 0)]]
+
+    def subtree(self, org_id: str, depth: int) -> Dict[str, Any]:
+        node = _summary(org_id, self.organizations[org_id])
+        children = self.children.get(org_id, [])
+        if depth > 0:
+            node["children"] = [self.subtree(child, depth - 1) for child in children]
+        elif children:
+            node["children_count"] = len(children)
+        return node
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "root_id": self.root_id,
+            "organizations": len(self.organizations),
+            "partners": len(self.partner_details),
+            "age_seconds": None if self.loaded_at is None else round(time.monotonic() - self.loaded_at, 1),
+            "ttl_seconds": self.ttl_seconds,
+            "refreshes": self.refreshes,
+            "api_calls": self.api_calls,
+        }
+
+
+_index = None
+
+
+def get_index() -> OrganizationIndex:
+    global _index
+    if _index is None:
+        _index = OrganizationIndex(CAMPHOUSE_COMPANY_MAIN_ID)
+    return _index
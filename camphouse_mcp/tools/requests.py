@@ -1,14 +1,20 @@
-import json
 import os
-import requests
+import asyncio
 import logging
+import httpx
+from observability import tracing
+from tools import fast_json
 
 # Configuración básica de logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
+# httpx registra cada petición a nivel INFO.
+logging.getLogger("httpx").setLevel(logging.WARNING)
 
-MEDIATOOL_URL = 'https://api.mediatool.com'
+MEDIATOOL_URL = os.getenv("MEDIATOOL_URL", 'https://api.mediatool.com')
 MEDIATOOL_TOKEN = os.getenv("CAMPHOUSE_TOKEN_ID", None)
+# Conexiones simultáneas del cliente async compartido hacia Mediatool.
+MEDIATOOL_MAX_CONNECTIONS = int(os.getenv("MEDIATOOL_MAX_CONNECTIONS", 100))
 
 
 # Define una excepción personalizada para errores de la API
@@ -17,7 +23,7 @@ class MediatoolAPIError(Exception):
     pass
 
 
-def make_request(endpoint, payload=None, method='GET'):
+def _prepare(endpoint):
     if not MEDIATOOL_TOKEN:
         raise MediatoolAPIError("La variable de entorno CAMPHOUSE_TOKEN_ID no está configurada.")
 
@@ -28,42 +34,84 @@ def make_request(endpoint, payload=None, method='GET'):
         'Accept': 'application/json',
         'Authorization': f"Bearer {MEDIATOOL_TOKEN}"
     }
+    return url, headers
+
+
+def _decode(content, url):
+    # Se decodifican los bytes directamente, sin pasar por response.text.
+    try:
+        return fast_json.loads(content)
+    except fast_json.JSONDecodeError as e:
+        logger.error("Respuesta no JSON de la API de Mediatool en %s", url)
+        raise MediatoolAPIError(f"Mediatool: la API devolvió una respuesta que no es JSON válido: {e}") from e
+
+
+# Cliente async compartido por todas las tools: reutiliza conexiones y permite
+# atender muchas llamadas concurrentes en un solo proceso. Se crea en el event
+# loop que lo usa por primera vez (httpx no admite compartirlo entre loops).
+_client = None
+_client_loop = None
+
+
+def get_async_client():
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            timeout=60,
+            limits=httpx.Limits(max_connections=MEDIATOOL_MAX_CONNECTIONS,
+                                max_keepalive_connections=MEDIATOOL_MAX_CONNECTIONS),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_async_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def make_request_async(endpoint, payload=None, method='GET'):
+    """Petición a la API de Mediatool sobre el cliente compartido."""
+    url, headers = _prepare(endpoint)
+    client = get_async_client()
 
     try:
-        if method.upper() == 'GET':
-            response = requests.get(url, headers=headers, params=payload, timeout=60)
-        else:
-            json_payload = json.dumps(payload) if payload else None
-            response = requests.request(method, url, data=json_payload, headers=headers, timeout=60)
+        with tracing.span("upstream.http", api="mediatool", method=method.upper(), endpoint=endpoint) as span:
+            if method.upper() == 'GET':
+                response = await client.get(url, headers=headers, params=payload)
+            else:
+                json_payload = fast_json.dumps(payload) if payload else None
+                response = await client.request(method, url, content=json_payload, headers=headers)
+            span.set_attribute("status", response.status_code)
+            span.set_attribute("response_bytes", len(response.content))
 
-        # Lanza una excepción para respuestas con código de error (4xx o 5xx)
         response.raise_for_status()
 
         if response.status_code == 204:
             return None  # No content
 
-        return response.json()
+        return _decode(response.content, url)
 
-    except requests.exceptions.HTTPError as e:
-        # Maneja errores HTTP de forma más elegante
+    except httpx.HTTPStatusError as e:
         error_message = f"Error HTTP: {e.response.status_code} para la URL: {e.request.url}"
         try:
-            # Intenta obtener un mensaje de error más específico del cuerpo de la respuesta
-            error_details = e.response.json()
+            error_details = fast_json.loads(e.response.content)
             msg = error_details.get('message') or error_details.get('error')
             if msg:
                 error_message = f"Error de la API de Mediatool: {msg}"
-        except requests.exceptions.JSONDecodeError:
+        except (fast_json.JSONDecodeError, AttributeError):
             error_message = f"Error de la API de Mediatool: {e.response.text}"
 
         logger.error(error_message)
         raise MediatoolAPIError(error_message) from e
 
-    except requests.exceptions.ConnectionError as e:
+    except httpx.ConnectError as e:
         logger.exception("No se pudo conectar a la API de Mediatool en %s", url)
         raise MediatoolAPIError(f"Mediatool: No se pudo establecer una conexión con la API en {url}.") from e
 
-    except requests.exceptions.RequestException as e:
-        # Captura cualquier otro error relacionado con requests
+    except httpx.HTTPError as e:
         logger.exception("La solicitud a la API de Mediatool falló: %s", str(e))
         raise MediatoolAPIError(f"Mediatool: Ocurrió un error inesperado al conectar con la API: {e}") from e
@@ -1,3 +1,5 @@
 from . import ga4_connector
 from . import camphouse_connector
-from . import mcp_base_connector
\ No newline at end of file
+from . import mcp_base_connector
+from . import session_pool
+from . import tool_cache
\ No newline at end of file
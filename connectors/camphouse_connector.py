@@ -1,32 +1,37 @@
-# connectors/ga4_connector.py
+# connectors/camphouse_connector.py
 import os
-import json
-import asyncio
 
-from typing import Any, Callable, Dict, List
-from mcp import stdio_client, ClientSession, StdioServerParameters
+from mcp import StdioServerParameters
+from mcp.server.fastmcp import FastMCP
 from .mcp_base_connector import MCPBaseConnector
-from tools.tool_converter import clean_schema_for_gemini
 
 class CamphouseConnector(MCPBaseConnector):
-    def __init__(self):
-        super().__init__(name="Camphouse", cached_tools=None)
+    server_package = "camphouse_mcp"
 
-    async def connect_to_server(self):
-        server_params = StdioServerParameters(
-            command="python",   
-            args=["-m", "camphouse_mcp.server"],  
-            env={
-                "CAMPHOUSE_TOKEN_ID": os.getenv("CAMPHOUSE_TOKEN_ID"),
-                "CAMPHOUSE_COMPANY_MAIN_ID": os.getenv("CAMPHOUSE_COMPANY_MAIN_ID"),
-            }
+    def __init__(self, **options):
+        super().__init__(name="Camphouse", cached_tools=None, **options)
+
+    def server_parameters(self) -> StdioServerParameters:
+        env = {
+            "CAMPHOUSE_TOKEN_ID": os.getenv("CAMPHOUSE_TOKEN_ID"),
+            "CAMPHOUSE_COMPANY_MAIN_ID": os.getenv("CAMPHOUSE_COMPANY_MAIN_ID"),
+        }
+        # Opcionales: API alternativa (p. ej. el mock de benchmarks) y su pool de conexiones, trazas,
+        # watchdog, JSON, resultados guardados en disco, índice de organizaciones y media types.
+        for var in ("MEDIATOOL_URL", "MEDIATOOL_MAX_CONNECTIONS",
+                    "CHAT_MCP_TRACING", "CHAT_MCP_TRACE_FILE", "CHAT_MCP_LOOP_WATCHDOG_MS",
+                    "CHAT_MCP_JSON", "CHAT_MCP_INLINE_BYTES", "CHAT_MCP_RESULT_DIR", "CHAT_MCP_RESULT_TTL_S",
+                    "CAMPHOUSE_ORG_INDEX_TTL_S", "CAMPHOUSE_ORG_INDEX_PARTNERS_TTL_S",
+                    "CAMPHOUSE_ORG_INDEX_CONCURRENCY", "CAMPHOUSE_ORG_INDEX_WARMUP",
+                    "CAMPHOUSE_MEDIATYPES_CONCURRENCY"):
+            if os.getenv(var):
+                env[var] = os.getenv(var)
+        return StdioServerParameters(
+            command="python",
+            args=["-m", "camphouse_mcp.server"],
+            env=env
         )
-        self.stdio, self.write = await self.exit_stack.enter_async_context(stdio_client(server_params))
-        self.session = await self.exit_stack.enter_async_context(ClientSession(self.stdio, self.write))
-        await self.session.initialize()
 
-        # Cache tools una sola vez
-        self.cached_tools = (await self.session.list_tools()).tools
-        print(f"✅ Conectado. Herramientas disponibles: {[tool.name for tool in self.cached_tools]}")
-        return self.cached_tools
-    
\ No newline at end of file
+    def load_server(self) -> FastMCP:
+        from camphouse_mcp.server import mcp
+        return mcp
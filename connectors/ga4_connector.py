@@ -1,32 +1,41 @@
 # connectors/ga4_connector.py
 import os
 import json
-import asyncio
 
-from typing import Any, Callable, Dict, List
-from mcp import stdio_client, ClientSession, StdioServerParameters
+from mcp import StdioServerParameters
+from mcp.server.fastmcp import FastMCP
 from .mcp_base_connector import MCPBaseConnector
-from tools.tool_converter import clean_schema_for_gemini
 
 class GA4Connector(MCPBaseConnector):
-    def __init__(self):
-        super().__init__(name="GA4", cached_tools=None)
-        
-    async def connect_to_server(self):
+    server_package = "analytics_mcp"
+    server_distribution = "google-analytics-mcp"
+
+    def __init__(self, **options):
+        super().__init__(name="GA4", cached_tools=None, **options)
+
+    def server_parameters(self) -> StdioServerParameters:
         creds_path = self._prepare_credentials()
-        server_params = StdioServerParameters(
+        env = {"GOOGLE_APPLICATION_CREDENTIALS": creds_path}
+        for var in ("ANALYTICS_MCP_LOOP_WATCHDOG_MS", "ANALYTICS_MCP_DESCRIPTION_MODE",
+                    "ANALYTICS_MCP_ROW_FORMAT", "ANALYTICS_MCP_INLINE_BYTES",
+                    "ANALYTICS_MCP_SPILL_DIR", "ANALYTICS_MCP_RESULT_TTL_S",
+                    "ANALYTICS_MCP_REPORT_CACHE", "ANALYTICS_MCP_REPORT_CACHE_SETTLE_DAYS",
+                    "ANALYTICS_MCP_REPORT_CACHE_TTL_S", "ANALYTICS_MCP_REPORT_CACHE_SIZE",
+                    "ANALYTICS_MCP_MATERIALIZED_REPORTS",
+                    "ANALYTICS_MCP_MATERIALIZED_DIR", "ANALYTICS_MCP_MATERIALIZE_INTERVAL_S"):
+            if os.getenv(var):
+                env[var] = os.getenv(var)
+        return StdioServerParameters(
             command="google-analytics-mcp",
             args=[],
-            env={"GOOGLE_APPLICATION_CREDENTIALS": creds_path}
+            env=env
         )
-        self.stdio, self.write = await self.exit_stack.enter_async_context(stdio_client(server_params))
-        self.session = await self.exit_stack.enter_async_context(ClientSession(self.stdio, self.write))
-        await self.session.initialize()
-    
-        # Cache tools una sola vez
-        self.cached_tools = (await self.session.list_tools()).tools
-        print(f"✅ Conectado. Herramientas disponibles: {[tool.name for tool in self.cached_tools]}")
-        return self.cached_tools
+
+    def load_server(self) -> FastMCP:
+        # Los clientes de Google leen las credenciales del entorno del proceso.
+        os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = self._prepare_credentials()
+        from analytics_mcp.server import mcp
+        return mcp
 
     def _prepare_credentials(self):
         creds_var = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
@@ -39,4 +48,3 @@ class GA4Connector(MCPBaseConnector):
         with open(temp_path, "w") as tmp:
             json.dump(creds_json, tmp)
         return temp_path
-    
\ No newline at end of file
@@ -1,42 +1,216 @@
 # connectors/mcp_base_connector.py
 from __future__ import annotations
+import os
+import time
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
-from mcp import ClientSession
-from llm.base import LLMClient
 from contextlib import AsyncExitStack
-from llm.gemini_llm import GeminiLLM
 from typing import Optional, List, Dict, Any
-from tools.tool_converter import clean_schema_for_gemini
+from mcp import stdio_client, ClientSession, StdioServerParameters
+from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
+from observability import loop_watchdog, metrics, tracing
+from .session_pool import SessionPool
+from .prefetch import Prefetcher, prefetch_enabled
+from .single_flight import SingleFlight, canonical_args
+from .tool_cache import ToolCache, server_version
+
+TRANSPORTS = ("stdio", "memory", "http", "sse")
+
+
+def _payload_bytes(result: Any) -> int:
+    """Tamaño aproximado del resultado de una tool (bloques de texto)."""
+    return sum(len(getattr(c, "text", "") or "") for c in getattr(result, "content", None) or [])
+
 
 class MCPBaseConnector(ABC):
-    """Base para conectores MCP. Implementa process_query + LLM Strategy.
+    """Base para conectores MCP. Gestiona un pool de sesiones por servidor.
+
+    Los hijos SOLO implementan cómo arrancar su servidor MCP:
+      - server_parameters()  (transporte "stdio", un subproceso por sesión)
+      - load_server()        (transporte "memory", FastMCP dentro del proceso)
+
+    Con los transportes "http" (streamable HTTP) y "sse" el servidor corre como
+    servicio aparte en `<NOMBRE>_MCP_URL` y cada sesión del pool es una
+    conexión HTTP independiente.
+
+    El transporte se elige con el argumento `transport`, o con las variables
+    de entorno `<NOMBRE>_MCP_TRANSPORT` / `MCP_TRANSPORT`. Por defecto es
+    "http" si hay URL configurada y "stdio" si no.
 
-    Los hijos SOLO implementan la conexión MCP:
-      - connect_to_server()
-      - list_tools()
-      - execute(tool_name, args)
+    El catálogo de herramientas se persiste en disco por versión del paquete
+    del servidor (`server_package` / `server_distribution`), de modo que las
+    herramientas están disponibles antes de que el servidor termine de arrancar.
+
+    Las llamadas concurrentes a la misma tool con los mismos argumentos se
+    agrupan en una sola (ver `single_flight.py`); se desactiva con
+    `CHAT_MCP_SINGLE_FLIGHT=0`.
+
+    Con `CHAT_MCP_PREFETCH=1` el conector precarga en segundo plano las
+    llamadas que suelen seguir a cada tool (ver `prefetch.py`).
     """
 
-    def __init__(self, name: str, cached_tools: Optional[List[Any]] = None):
+    # Paquete Python del servidor y, si está instalado, su distribución.
+    server_package: str = ""
+    server_distribution: Optional[str] = None
+
+    def __init__(
+        self,
+        name: str,
+        cached_tools: Optional[List[Any]] = None,
+        min_sessions: Optional[int] = None,
+        max_sessions: Optional[int] = None,
+        scale_up_at: Optional[int] = None,
+        transport: Optional[str] = None,
+        url: Optional[str] = None,
+    ):
         self.cached_tools = cached_tools or []
         self.name = name
-        self.session: Optional[ClientSession] = None
-        self.exit_stack = AsyncExitStack()
+        self.url = url or os.getenv(f"{name.upper()}_MCP_URL")
+        self.transport = (
+            transport
+            or os.getenv(f"{name.upper()}_MCP_TRANSPORT")
+            or os.getenv("MCP_TRANSPORT")
+            or ("http" if self.url else "stdio")
+        ).lower()
+        if self.transport not in TRANSPORTS:
+            raise ValueError(f"Transporte MCP desconocido para {name}: {self.transport}")
+        if self.transport in ("http", "sse") and not self.url:
+            raise ValueError(f"Falta {name.upper()}_MCP_URL para el transporte {self.transport}")
+        if self.transport == "memory":
+            # Un único FastMCP en proceso: más sesiones no añaden paralelismo.
+            min_sessions = max_sessions = 1
+        self._connecting: Optional[asyncio.Task] = None
+        self._tool_cache: Optional[ToolCache] = None
+        self._single_flight = SingleFlight() if os.getenv("CHAT_MCP_SINGLE_FLIGHT", "1") != "0" else None
+        self.prefetcher = Prefetcher(name, self._prefetch_call, lambda: self.cached_tools) if prefetch_enabled() else None
+        self.pool = SessionPool(
+            name,
+            self._open_session,
+            min_size=min_sessions,
+            max_size=max_sessions,
+            scale_up_at=scale_up_at,
+        )
 
 
     # ---- Métodos abstractos (cada conector los implementa) ----
     @abstractmethod
-    async def connect_to_server(self) -> Any:
+    def server_parameters(self) -> StdioServerParameters:
+        """Parámetros para lanzar un subproceso del servidor MCP."""
+        ...
+
+    @abstractmethod
+    def load_server(self) -> FastMCP:
+        """Importa y devuelve la instancia FastMCP del servidor."""
         ...
 
+    @property
+    def session(self) -> Optional[ClientSession]:
+        """Primera sesión activa del pool (compatibilidad)."""
+        alive = [s for s in self.pool.sessions if s.alive]
+        return alive[0].session if alive else None
+
+    async def _open_session(self, exit_stack: AsyncExitStack) -> ClientSession:
+        if self.transport == "memory":
+            # Memory streams en lugar de stdio; la sesión ya sale inicializada.
+            server = self.load_server()
+            return await exit_stack.enter_async_context(
+                create_connected_server_and_client_session(server._mcp_server)
+            )
+        if self.transport == "http":
+            read, write, _ = await exit_stack.enter_async_context(streamablehttp_client(self.url))
+        elif self.transport == "sse":
+            read, write = await exit_stack.enter_async_context(sse_client(self.url))
+        else:
+            read, write = await exit_stack.enter_async_context(stdio_client(self.server_parameters()))
+        session = await exit_stack.enter_async_context(ClientSession(read, write))
+        await session.initialize()
+        return session
+
+    async def connect_to_server(self) -> Any:
+        session = await self.pool.start()
+
+        # Cache tools una sola vez
+        self.cached_tools = (await session.list_tools()).tools
+        print(f"✅ {self.name} conectado ({self.transport}, {self.pool.size} sesiones). Herramientas disponibles: {[tool.name for tool in self.cached_tools]}")
+        return self.cached_tools
+
+    @property
+    def tool_cache(self) -> ToolCache:
+        if self._tool_cache is None:
+            version = server_version(self.server_package, self.server_distribution)
+            self._tool_cache = ToolCache(self.name, version)
+        return self._tool_cache
+
+    def load_cached_tools(self) -> Optional[Dict[str, Any]]:
+        """Carga el catálogo persistido; devuelve tools y declaraciones por LLM."""
+        cached = self.tool_cache.load()
+        metrics.record_cache("tool_catalog", cached is not None)
+        if cached:
+            self.cached_tools = cached["tools"]
+        return cached
+
+    def save_cached_tools(self, declarations: Optional[Dict[str, Any]] = None):
+        self.tool_cache.save(self.cached_tools, declarations)
+
+    def connect_in_background(self) -> asyncio.Task:
+        """Conecta sin bloquear; `execute` espera a que termine la conexión."""
+        self._connecting = asyncio.create_task(self.connect_to_server())
+        return self._connecting
+
     async def list_tools(self) -> List[Any]:
         """Devuelve las herramientas disponibles en el MCP."""
         return self.cached_tools
 
-    async def execute(self, tool_name: str, args: Dict[str, Any]) -> Any:
-        if not self.session:
-            raise RuntimeError("No hay sesión activa.")
-        return await self.session.call_tool(tool_name, args)
+    async def execute(self, tool_name: str, args: Dict[str, Any], session_id: Optional[str] = None) -> Any:
+        """Llama a la tool; `session_id` (la sesión del chat) agrupa las
+        llamadas de las que aprende la precarga."""
+        if self._connecting and not self._connecting.done():
+            # Herramientas servidas desde la caché antes de que el servidor arranque.
+            await asyncio.wait([self._connecting])
+        with tracing.span("mcp.call_tool", connector=self.name, tool=tool_name, transport=self.transport) as span, \
+                loop_watchdog.attribute(f"tool:{self.name}/{tool_name}"):
+            if tracing.enabled():
+                span.set_attribute("queue_depth", self.pool.queue_depth)
+            started = time.perf_counter()
+            prefetched = None
+            if self.prefetcher is not None:
+                prefetched = await self.prefetcher.take(tool_name, args)
+                if tracing.enabled():
+                    span.set_attribute("prefetch_hit", prefetched is not None)
+            try:
+                result = prefetched if prefetched is not None else await self._call_tool(tool_name, args, span)
+            except Exception:
+                metrics.TOOL_ERRORS.inc(connector=self.name, tool=tool_name)
+                raise
+            finally:
+                metrics.TOOL_CALL_SECONDS.observe(time.perf_counter() - started, connector=self.name, tool=tool_name)
+            if getattr(result, "isError", False):
+                metrics.TOOL_ERRORS.inc(connector=self.name, tool=tool_name)
+            elif self.prefetcher is not None:
+                self.prefetcher.observe(tool_name, args, result, session_id or "default")
+            if tracing.enabled():
+                span.set_attribute("payload_bytes", _payload_bytes(result))
+                span.set_attribute("is_error", bool(getattr(result, "isError", False)))
+            return result
+
+    async def _call_tool(self, tool_name: str, args: Dict[str, Any], span: Any) -> Any:
+        if self._single_flight is None:
+            return await self.pool.call_tool(tool_name, args)
+        result, shared = await self._single_flight.do(
+            (tool_name, canonical_args(args)),
+            lambda: self.pool.call_tool(tool_name, args),
+        )
+        metrics.SINGLE_FLIGHT_CALLS.inc(connector=self.name, tool=tool_name, role="shared" if shared else "leader")
+        if tracing.enabled():
+            span.set_attribute("coalesced", shared)
+        return result
+
+    async def _prefetch_call(self, tool_name: str, args: Dict[str, Any]) -> Any:
+        with tracing.span("mcp.prefetch", connector=self.name, tool=tool_name, transport=self.transport) as span:
+            return await self._call_tool(tool_name, args, span)
 
-    # ---- Común: orquesta LLM + Tools (function calling) ----
+    async def close(self):
+        await self.pool.close()
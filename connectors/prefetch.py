@@ -0,0 +1,300 @@
+# connectors/prefetch.py
+"""Precarga especulativa de las llamadas a tools más probables.
+
+Tras `get_account_summaries` o `get_subsidiaries_organization` la siguiente
+llamada casi siempre es de detalle sobre uno de los IDs devueltos. El
+prefetcher aprende, por conector y dentro de cada sesión del chat:
+
+- qué tool sigue a cuál (B tras A, sobre el número de llamadas a A), y
+- de qué campo del resultado (o de los argumentos) de A sale el argumento de
+  B (por ejemplo `organization_id` <- `result.organizations[]._id`, o el
+  número final de `result.accountSummaries[].propertySummaries[].property`).
+
+Cuando A termina y la transición A -> B supera `CHAT_MCP_PREFETCH_MIN_PROBABILITY`
+con al menos `CHAT_MCP_PREFETCH_MIN_SAMPLES` observaciones, lanza en segundo
+plano B con los primeros valores de ese campo. Solo se precargan tools cuyo
+único argumento obligatorio sale del resultado, y como mucho
+`CHAT_MCP_PREFETCH_BUDGET` llamadas por resultado, con
+`CHAT_MCP_PREFETCH_CONCURRENCY` en curso a la vez y `MAX_PENDING` en cola (el
+resto se descarta). Los resultados se guardan `CHAT_MCP_PREFETCH_TTL_S`
+segundos y se sirven una vez. Una llamada real que llega mientras la precarga
+está en curso espera su resultado; si la precarga aún no había salido (espera
+turno en la cola), se cancela y la llamada real va directa al upstream, así
+nunca se pide dos veces lo mismo. La sesión la indica quien llama (`observe`).
+
+Desactivado por defecto (`CHAT_MCP_PREFETCH=1` lo activa): cada precarga que
+no se usa es una petición de más al upstream. `mcp_prefetch_calls_total`
+(outcome = issued, hit, error, dropped, cancelled) y `cache_requests_total{cache="prefetch"}`
+muestran cuántas se aprovechan.
+"""
+import os
+import time
+import asyncio
+import logging
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+from observability import metrics
+from tools import fast_json
+from .single_flight import canonical_args
+from .ttl_cache import UNCACHEABLE_TOOLS, TTLCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET = 4
+DEFAULT_CONCURRENCY = 4
+MAX_PENDING = 32
+DEFAULT_MIN_PROBABILITY = 0.3
+DEFAULT_MIN_SAMPLES = 3
+DEFAULT_TTL_SECONDS = 120
+# Una llamada solo cuenta como continuación de la anterior dentro de esta ventana.
+SEQUENCE_WINDOW_SECONDS = 600
+# Hojas del resultado que se indexan para buscar de dónde salen los argumentos.
+MAX_INDEXED_VALUES = 2000
+MAX_SESSIONS = 1000
+MAX_STORED = 256
+
+# (argumento, ruta en el resultado, transformación)
+Binding = Tuple[str, str, str]
+
+
+def prefetch_enabled() -> bool:
+    return os.getenv("CHAT_MCP_PREFETCH", "0").lower() in ("1", "true", "yes")
+
+
+def result_payload(result: Any) -> Any:
+    """Contenido JSON de un `CallToolResult` (estructurado o en el texto)."""
+    structured = getattr(result, "structuredContent", None)
+    if structured:
+        return structured["result"] if len(structured) == 1 and "result" in structured else structured
+    for content in getattr(result, "content", None) or []:
+        text = getattr(content, "text", None)
+        if text:
+            try:
+                return fast_json.loads(text)
+            except fast_json.JSONDecodeError:
+                return None
+    return None
+
+
+def _leaves(value: Any, path: str = "") -> Iterable[Tuple[str, Any]]:
+    """Pares (ruta, valor escalar); los índices de lista se escriben `[]`."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _leaves(item, f"{path}.{key}" if path else str(key))
+    elif isinstance(value, list):
+        for item in value:
+            yield from _leaves(item, f"{path}[]")
+    elif isinstance(value, (str, int)) and not isinstance(value, bool):
+        yield path, value
+
+
+def _transform(value: Any, transform: str) -> Any:
+    if transform == "exact":
+        return value
+    last = str(value).rsplit("/", 1)[-1]
+    return int(last) if transform == "int" else last
+
+
+def _value_index(payload: Any) -> Dict[str, List[Tuple[str, str]]]:
+    """valor (como texto) -> [(ruta, transformación)] que lo producen."""
+    index: Dict[str, List[Tuple[str, str]]] = {}
+    for i, (path, value) in enumerate(_leaves(payload)):
+        if i >= MAX_INDEXED_VALUES:
+            break
+        index.setdefault(str(value), []).append((path, "exact"))
+        if isinstance(value, str) and "/" in value:
+            # "properties/123" -> "123": los IDs de GA se pasan sin prefijo.
+            index.setdefault(value.rsplit("/", 1)[-1], []).append((path, "last"))
+    return index
+
+
+def _values_at(payload: Any, path: str, transform: str) -> List[Any]:
+    values = []
+    for leaf_path, value in _leaves(payload):
+        if leaf_path == path:
+            try:
+                value = _transform(value, transform)
+            except ValueError:
+                continue
+            if value not in values:
+                values.append(value)
+    return values
+
+
+class Prefetcher:
+    def __init__(
+        self,
+        name: str,
+        call: Callable[[str, Dict[str, Any]], Awaitable[Any]],
+        tools: Callable[[], List[Any]],
+        budget: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        min_probability: Optional[float] = None,
+        min_samples: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        self.name = name
+        self._call = call
+        self._tools = tools
+        self.budget = int(budget if budget is not None else os.getenv("CHAT_MCP_PREFETCH_BUDGET", DEFAULT_BUDGET))
+        self.concurrency = int(concurrency or os.getenv("CHAT_MCP_PREFETCH_CONCURRENCY", DEFAULT_CONCURRENCY))
+        self.min_probability = float(min_probability if min_probability is not None
+                                     else os.getenv("CHAT_MCP_PREFETCH_MIN_PROBABILITY", DEFAULT_MIN_PROBABILITY))
+        self.min_samples = int(min_samples if min_samples is not None
+                               else os.getenv("CHAT_MCP_PREFETCH_MIN_SAMPLES", DEFAULT_MIN_SAMPLES))
+        ttl = float(ttl_seconds if ttl_seconds is not None else os.getenv("CHAT_MCP_PREFETCH_TTL_S", DEFAULT_TTL_SECONDS))
+        self._store = TTLCache(MAX_STORED, ttl)
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        # Precargas que ya han salido hacia el upstream (no solo en cola).
+        self._started = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # Estadísticas de secuencias.
+        self._calls: Counter = Counter()
+        self._transitions: Dict[str, Counter] = {}
+        self._bindings: Dict[Tuple[str, str], Counter] = {}
+        # sesión -> (tool, índice de valores de su resultado, instante)
+        self._last: Dict[str, Tuple[str, Dict[str, List[Tuple[str, str]]], float]] = {}
+        self._required_cache: Tuple[int, Dict[str, Tuple[str, ...]]] = (0, {})
+        self.counts: Counter = Counter()
+
+    # ---- Servir ----
+    async def take(self, tool_name: str, args: Dict[str, Any]) -> Optional[Any]:
+        """Resultado precargado de la llamada, o None si hay que hacerla.
+
+        Si la precarga ya salió hacia el upstream espera su resultado; si aún
+        esperaba turno la cancela, para que la llamada real no se duplique.
+        """
+        key = (tool_name, canonical_args(args))
+        result = self._store.pop(key)
+        task = self._inflight.get(key)
+        if result is None and task is not None:
+            if key in self._started:
+                # Si quien llama se cancela, la precarga sigue y se guarda.
+                result = await asyncio.shield(task)
+                self._store.pop(key)
+            else:
+                task.cancel()
+        hit = result is not None
+        metrics.record_cache("prefetch", hit)
+        if hit:
+            self.counts["hit"] += 1
+            metrics.PREFETCH_CALLS.inc(connector=self.name, tool=tool_name, outcome="hit")
+        return result
+
+    # ---- Aprender y precargar ----
+    def observe(self, tool_name: str, args: Dict[str, Any], result: Any, session: str = "default"):
+        """Aprende de una llamada real terminada y precarga sus continuaciones."""
+        now = time.monotonic()
+        previous = self._last.get(session)
+        if previous is not None and now - previous[2] <= SEQUENCE_WINDOW_SECONDS:
+            self._learn(previous[0], previous[1], tool_name, args)
+
+        # Los argumentos también cuentan: tras `get_organization_campaigns(X)`
+        # suele venir otra tool sobre la misma X (`args.organization_id`).
+        payload = {"args": args, "result": result_payload(result)}
+        self._calls[tool_name] += 1
+        self._last.pop(session, None)
+        self._last[session] = (tool_name, _value_index(payload), now)
+        while len(self._last) > MAX_SESSIONS:
+            self._last.pop(next(iter(self._last)))
+        self._schedule(tool_name, payload)
+
+    def _learn(self, previous: str, values: Dict[str, List[Tuple[str, str]]], tool_name: str, args: Dict[str, Any]):
+        self._transitions.setdefault(previous, Counter())[tool_name] += 1
+        bindings = self._bindings.setdefault((previous, tool_name), Counter())
+        for arg, value in args.items():
+            if isinstance(value, bool) or not isinstance(value, (str, int)):
+                continue
+            # Cada ruta cuenta una vez por transición, aunque se repita en muchas filas.
+            for path, transform in set(values.get(str(value), ())):
+                if isinstance(value, int):
+                    transform = "int" if transform == "last" else "exact"
+                bindings[(arg, path, transform)] += 1
+
+    def _required(self) -> Dict[str, Tuple[str, ...]]:
+        tools = self._tools() or []
+        if self._required_cache[0] != id(tools):
+            self._required_cache = (id(tools), {
+                tool.name: tuple((getattr(tool, "inputSchema", None) or {}).get("required") or ())
+                for tool in tools
+            })
+        return self._required_cache[1]
+
+    def predictions(self, tool_name: str) -> List[Tuple[str, Binding, float]]:
+        """Continuaciones de `tool_name` que se pueden precargar: (tool, binding, probabilidad)."""
+        calls = self._calls[tool_name]
+        if calls < self.min_samples:
+            return []
+        required = self._required()
+        predicted = []
+        for follow_up, count in self._transitions.get(tool_name, Counter()).most_common():
+            probability = count / calls
+            if probability < self.min_probability:
+                break
+            if follow_up in UNCACHEABLE_TOOLS or len(required.get(follow_up, ())) != 1:
+                continue
+            arg = required[follow_up][0]
+            bindings = [(b, n) for b, n in self._bindings.get((tool_name, follow_up), Counter()).most_common() if b[0] == arg]
+            # El campo tiene que explicar al menos la mitad de las transiciones.
+            if bindings and bindings[0][1] * 2 >= count:
+                predicted.append((follow_up, bindings[0][0], probability))
+        return predicted
+
+    def _schedule(self, tool_name: str, payload: Any):
+        if self.budget <= 0:
+            return
+        remaining = self.budget
+        for follow_up, (arg, path, transform), _ in self.predictions(tool_name):
+            for value in _values_at(payload, path, transform):
+                if remaining <= 0:
+                    return
+                args = {arg: value}
+                key = (follow_up, canonical_args(args))
+                if (follow_up == tool_name and args == payload["args"]) or key in self._inflight \
+                        or self._store.get(key) is not None:
+                    continue
+                remaining -= 1
+                if len(self._inflight) >= MAX_PENDING:
+                    self.counts["dropped"] += 1
+                    metrics.PREFETCH_CALLS.inc(connector=self.name, tool=follow_up, outcome="dropped")
+                    continue
+                self._inflight[key] = asyncio.get_running_loop().create_task(self._prefetch(key, follow_up, args))
+
+    async def _prefetch(self, key: Hashable, tool_name: str, args: Dict[str, Any]) -> Optional[Any]:
+        """Hace la llamada precargada y la guarda; devuelve None si falla."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        try:
+            async with self._semaphore:
+                self._started.add(key)
+                self.counts["issued"] += 1
+                metrics.PREFETCH_CALLS.inc(connector=self.name, tool=tool_name, outcome="issued")
+                result = await self._call(tool_name, args)
+            if getattr(result, "isError", False):
+                raise RuntimeError(f"la tool {tool_name} devolvió un error")
+            self._store.put(key, result)
+            return result
+        except asyncio.CancelledError:
+            if key not in self._started:
+                self.counts["cancelled"] += 1
+                metrics.PREFETCH_CALLS.inc(connector=self.name, tool=tool_name, outcome="cancelled")
+            raise
+        except Exception as e:
+            self.counts["error"] += 1
+            metrics.PREFETCH_CALLS.inc(connector=self.name, tool=tool_name, outcome="error")
+            logger.debug("Precarga de %s/%s fallida: %s", self.name, tool_name, e)
+            return None
+        finally:
+            self._inflight.pop(key, None)
+            self._started.discard(key)
+
+    def stats(self) -> Dict[str, Any]:
+        issued = self.counts["issued"]
+        return {
+            "issued": issued,
+            "hits": self.counts["hit"],
+            "errors": self.counts["error"],
+            "dropped": self.counts["dropped"],
+            "cancelled": self.counts["cancelled"],
+            "hit_rate": self.counts["hit"] / issued if issued else 0.0,
+        }
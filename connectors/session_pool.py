@@ -0,0 +1,147 @@
+# connectors/session_pool.py
+import os
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from mcp import ClientSession
+
+# Recibe el AsyncExitStack de la sesión y devuelve una ClientSession inicializada.
+SessionFactory = Callable[[AsyncExitStack], Awaitable[ClientSession]]
+
+
+def _env_int(var: str, default: int) -> int:
+    value = os.getenv(var)
+    return int(value) if value else default
+
+
+class PooledSession:
+    """Una sesión MCP (un subproceso del servidor) con su propia tarea de vida.
+
+    La sesión se abre y se cierra dentro de la misma tarea, como exigen los
+    cancel scopes de anyio que usan `stdio_client` y `ClientSession`.
+    """
+
+    def __init__(self, factory: SessionFactory, index: int):
+        self.factory = factory
+        self.index = index
+        self.session: Optional[ClientSession] = None
+        self.in_flight = 0
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._error: Optional[BaseException] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and not self._closing.is_set()
+
+    async def start(self) -> ClientSession:
+        self._task = asyncio.create_task(self._run(), name=f"mcp-session-{self.index}")
+        await self._ready.wait()
+        if self._error:
+            raise self._error
+        return self.session
+
+    async def _run(self):
+        try:
+            async with AsyncExitStack() as stack:
+                self.session = await self.factory(stack)
+                self._ready.set()
+                await self._closing.wait()
+        except Exception as e:
+            self._error = e
+            if self._ready.is_set():
+                print(f"⚠️ Sesión MCP #{self.index} terminada: {e}")
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def close(self):
+        self._closing.set()
+        if self._task:
+            await self._task
+
+
+class SessionPool:
+    """Pool de sesiones MCP con despacho al menos cargado.
+
+    Arranca `min_size` sesiones y abre una nueva (hasta `max_size`) cuando la
+    sesión menos cargada ya tiene `scale_up_at` llamadas en curso.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        factory: SessionFactory,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        scale_up_at: Optional[int] = None,
+    ):
+        self.name = name
+        self.factory = factory
+        self.min_size = min_size if min_size is not None else _env_int("MCP_POOL_MIN_SIZE", 1)
+        self.max_size = max_size if max_size is not None else _env_int("MCP_POOL_MAX_SIZE", 4)
+        self.scale_up_at = scale_up_at if scale_up_at is not None else _env_int("MCP_POOL_SCALE_UP_AT", 2)
+        if self.min_size < 1 or self.max_size < self.min_size:
+            raise ValueError(f"Tamaño de pool inválido para {name}: min={self.min_size}, max={self.max_size}")
+        self.sessions: List[PooledSession] = []
+        self._next_index = 0
+        self._scaling: Optional[asyncio.Task] = None
+
+    @property
+    def size(self) -> int:
+        return len([s for s in self.sessions if s.alive])
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(s.in_flight for s in self.sessions)
+
+    async def start(self) -> ClientSession:
+        """Abre las `min_size` sesiones iniciales y devuelve la primera."""
+        started = await asyncio.gather(*(self._spawn() for _ in range(self.min_size)))
+        return started[0].session
+
+    async def _spawn(self) -> PooledSession:
+        pooled = PooledSession(self.factory, self._next_index)
+        self._next_index += 1
+        await pooled.start()
+        self.sessions.append(pooled)
+        return pooled
+
+    async def _scale_up(self):
+        try:
+            pooled = await self._spawn()
+            print(f"📈 {self.name}: nueva sesión MCP #{pooled.index} (total {self.size})")
+        except Exception as e:
+            print(f"⚠️ {self.name}: no se pudo abrir otra sesión MCP: {e}")
+        finally:
+            self._scaling = None
+
+    def _pick(self) -> PooledSession:
+        self.sessions = [s for s in self.sessions if s.alive]
+        if not self.sessions:
+            raise RuntimeError("No hay sesión activa.")
+        pooled = min(self.sessions, key=lambda s: s.in_flight)
+        wants_more = len(self.sessions) < self.min_size or pooled.in_flight >= self.scale_up_at
+        if wants_more and len(self.sessions) < self.max_size and self._scaling is None:
+            self._scaling = asyncio.create_task(self._scale_up())
+        return pooled
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[ClientSession]:
+        pooled = self._pick()
+        pooled.in_flight += 1
+        try:
+            yield pooled.session
+        finally:
+            pooled.in_flight -= 1
+
+    async def call_tool(self, tool_name: str, args: Dict[str, Any]) -> Any:
+        async with self.acquire() as session:
+            return await session.call_tool(tool_name, args)
+
+    async def close(self):
+        if self._scaling:
+            await self._scaling
+        sessions, self.sessions = self.sessions, []
+        await asyncio.gather(*(s.close() for s in sessions), return_exceptions=True)
@@ -0,0 +1,56 @@
+# connectors/single_flight.py
+"""Agrupa llamadas concurrentes idénticas en una sola (single-flight).
+
+Si llega una llamada con la misma clave que otra que aún está en curso, espera
+el resultado de esa en lugar de repetirla. Solo se agrupan llamadas
+simultáneas: en cuanto la primera termina, la clave se libera y la siguiente
+vuelve a ejecutarse (esto no es una caché).
+
+La llamada corre en su propia tarea, de modo que si el primero en llegar se
+cancela el resto sigue esperando el mismo resultado; la tarea solo se cancela
+cuando ya no queda nadie esperándola.
+"""
+import json
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+def canonical_args(args: Dict[str, Any]) -> str:
+    """Serialización estable de los argumentos (claves ordenadas a cualquier nivel)."""
+    return json.dumps(args or {}, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class SingleFlight:
+    def __init__(self):
+        # clave -> [tarea en curso, número de llamadas esperándola]
+        self._calls: Dict[Hashable, list] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Ejecuta `fn` o se une a la llamada en curso con la misma clave.
+
+        Devuelve (resultado, compartido); `compartido` es True si el resultado
+        es el de una llamada que ya estaba en curso.
+        """
+        call = self._calls.get(key)
+        shared = call is not None
+        if call is None:
+            task = asyncio.ensure_future(fn())
+            call = self._calls[key] = [task, 0]
+            task.add_done_callback(lambda _, key=key, call=call: self._release(key, call))
+        call[1] += 1
+        try:
+            return await asyncio.shield(call[0]), shared
+        except asyncio.CancelledError:
+            if call[1] == 1 and not call[0].done():
+                call[0].cancel()
+            raise
+        finally:
+            call[1] -= 1
+
+    def _release(self, key: Hashable, call: list):
+        if self._calls.get(key) is call:
+            del self._calls[key]
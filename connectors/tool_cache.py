@@ -0,0 +1,79 @@
+# connectors/tool_cache.py
+import os
+import json
+import hashlib
+import importlib.util
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from mcp.types import Tool
+
+# Subir cuando cambie el formato del fichero o la conversión de declaraciones.
+CACHE_FORMAT = 2
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "chat_mcp" / "tools"
+
+
+def server_version(package: str, distribution: Optional[str] = None) -> str:
+    """Versión del paquete del servidor MCP.
+
+    Usa la versión instalada de `distribution` y, si el paquete no está
+    instalado como distribución, un hash de sus ficheros fuente.
+    """
+    if distribution:
+        try:
+            return metadata.version(distribution)
+        except metadata.PackageNotFoundError:
+            pass
+
+    spec = importlib.util.find_spec(package)
+    if not spec or not spec.submodule_search_locations:
+        return "unknown"
+    digest = hashlib.sha256()
+    root = Path(list(spec.submodule_search_locations)[0])
+    for path in sorted(root.rglob("*.py")):
+        digest.update(str(path.relative_to(root)).encode())
+        digest.update(path.read_bytes())
+    return f"src-{digest.hexdigest()[:16]}"
+
+
+class ToolCache:
+    """Catálogo de herramientas de un conector persistido en disco.
+
+    Guarda el resultado de `list_tools` y las declaraciones ya convertidas
+    para cada LLM, en un fichero por conector y versión del servidor.
+    """
+
+    def __init__(self, connector_name: str, version: str, cache_dir: Optional[str] = None):
+        cache_dir = Path(cache_dir or os.getenv("MCP_TOOL_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        safe_version = "".join(c if c.isalnum() or c in ".-_" else "_" for c in version)
+        self.path = cache_dir / f"{connector_name.lower()}-{safe_version}.json"
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("format") != CACHE_FORMAT:
+                return None
+            return {
+                "tools": [Tool.model_validate(t) for t in data["tools"]],
+                "declarations": data.get("declarations", {}),
+            }
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️ Caché de herramientas inválida en {self.path}: {e}")
+            return None
+
+    def save(self, tools: List[Tool], declarations: Optional[Dict[str, Any]] = None):
+        data = {
+            "format": CACHE_FORMAT,
+            "tools": [t.model_dump(mode="json", exclude_none=True) for t in tools],
+            "declarations": declarations or {},
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(data), encoding="utf-8")
+            tmp_path.replace(self.path)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar la caché de herramientas en {self.path}: {e}")
@@ -0,0 +1,48 @@
+# connectors/ttl_cache.py
+"""LRU acotado con caducidad por entrada, compartido por las cachés de tools.
+
+Vive en `connectors` para que tanto los conectores (precarga) como el chat
+(`llm/answer_cache.py`) lo usen sin depender el uno del otro.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+# Tools cuyo resultado cambia de un momento a otro y nunca se cachean ni se precargan.
+UNCACHEABLE_TOOLS = frozenset({"run_realtime_report"})
+
+
+class TTLCache:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Como `get`, pero sin marcar la entrada como usada (no cambia el orden LRU)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] + self.ttl_seconds < time.monotonic():
+            self.pop(key)
+            return None
+        return entry[1]
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value = self.peek(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self.pop(next(iter(self._entries)))
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry else None
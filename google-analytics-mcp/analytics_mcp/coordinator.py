@@ -18,7 +18,23 @@ The singleton allows other modules to register their tools with the same MCP
 server using `@mcp.tool` annotations, thereby 'coordinating' the bootstrapping
 of the server.
 """
+
+import contextlib
+
 from mcp.server.fastmcp import FastMCP
 
+from analytics_mcp import watchdog
+from analytics_mcp.tools import materialized
+
+
+@contextlib.asynccontextmanager
+async def _lifespan(server: FastMCP):
+    """Starts the opt-in event loop watchdog and the materialized reports
+    scheduler once the tools are registered."""
+    watchdog.start_from_env(server)
+    materialized.start_from_env()
+    yield {}
+
+
 # Creates the singleton.
-mcp = FastMCP("Google Analytics Server")
+mcp = FastMCP("Google Analytics Server", lifespan=_lifespan)
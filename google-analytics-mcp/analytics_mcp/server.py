@@ -16,6 +16,9 @@
 
 """Entry point for the Google Analytics MCP server."""
 
+import argparse
+import os
+
 from analytics_mcp.coordinator import mcp
 
 # The following imports are necessary to register the tools with the `mcp`
@@ -25,14 +28,61 @@ from analytics_mcp.coordinator import mcp
 from analytics_mcp.tools.admin import info  # noqa: F401
 from analytics_mcp.tools.reporting import realtime  # noqa: F401
 from analytics_mcp.tools.reporting import core  # noqa: F401
+from analytics_mcp.tools.reporting import results  # noqa: F401
+
+_HTTP_TRANSPORTS = ("streamable-http", "sse")
+
+
+def create_app():
+    """Returns the ASGI app for the HTTP transports.
+
+    Used as a uvicorn factory so that every worker process builds its own app.
+    The streamable HTTP app is stateless, so any worker behind a load balancer
+    can serve any request.
+    """
+    if os.getenv("MCP_SERVER_TRANSPORT", "streamable-http") == "sse":
+        return mcp.sse_app()
+    mcp.settings.stateless_http = True
+    return mcp.streamable_http_app()
 
 
 def run_server() -> None:
     """Runs the server.
 
-    Serves as the entrypoint for the 'runmcp' command.
+    Serves as the entrypoint for the 'runmcp' command. Uses stdio by default;
+    `--transport streamable-http` (or `sse`) serves it over HTTP with uvicorn.
     """
-    mcp.run()
+    parser = argparse.ArgumentParser(description="Google Analytics MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=("stdio",) + _HTTP_TRANSPORTS,
+        default=os.getenv("MCP_SERVER_TRANSPORT", "stdio"),
+    )
+    parser.add_argument("--host", default=mcp.settings.host)
+    parser.add_argument("--port", type=int, default=mcp.settings.port)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("MCP_SERVER_WORKERS", "1")),
+    )
+    args = parser.parse_args()
+
+    if args.transport == "stdio":
+        mcp.run()
+        return
+
+    import uvicorn
+
+    # Workers re-import this module and read the transport from the env.
+    os.environ["MCP_SERVER_TRANSPORT"] = args.transport
+    uvicorn.run(
+        "analytics_mcp.server:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level=mcp.settings.log_level.lower(),
+    )
 
 
 if __name__ == "__main__":
@@ -18,11 +18,11 @@ from typing import Any, Dict, List
 
 from analytics_mcp.coordinator import mcp
 from analytics_mcp.tools.utils import (
+    api_span,
     construct_property_rn,
     create_admin_api_client,
     proto_to_dict,
 )
-from google.analytics import admin_v1beta
 
 
 @mcp.tool()
@@ -31,10 +31,11 @@ async def get_account_summaries() -> List[Dict[str, Any]]:
 
     # Uses an async list comprehension so the pager returned by
     # list_account_summaries retrieves all pages.
-    summary_pager = await create_admin_api_client().list_account_summaries()
-    all_pages = [
-        proto_to_dict(summary_page) async for summary_page in summary_pager
-    ]
+    with api_span("ga.list_account_summaries"):
+        summary_pager = await create_admin_api_client().list_account_summaries()
+        all_pages = [
+            proto_to_dict(summary_page) async for summary_page in summary_pager
+        ]
     return all_pages
 
 
@@ -47,15 +48,20 @@ async def list_google_ads_links(property_id: int | str) -> List[Dict[str, Any]]:
           - A number
           - A string consisting of 'properties/' followed by a number
     """
+    from google.analytics import admin_v1beta
+
     request = admin_v1beta.ListGoogleAdsLinksRequest(
         parent=construct_property_rn(property_id)
     )
     # Uses an async list comprehension so the pager returned by
     # list_google_ads_links retrieves all pages.
-    links_pager = await create_admin_api_client().list_google_ads_links(
-        request=request
-    )
-    all_pages = [proto_to_dict(link_page) async for link_page in links_pager]
+    with api_span("ga.list_google_ads_links", parent=request.parent):
+        links_pager = await create_admin_api_client().list_google_ads_links(
+            request=request
+        )
+        all_pages = [
+            proto_to_dict(link_page) async for link_page in links_pager
+        ]
     return all_pages
 
 
@@ -67,9 +73,12 @@ def get_property_details(property_id: int | str) -> Dict[str, Any]:
           - A number
           - A string consisting of 'properties/' followed by a number
     """
+    from google.analytics import admin_v1beta
+
     client = admin_v1beta.AnalyticsAdminServiceClient()
     request = admin_v1beta.GetPropertyRequest(
         name=construct_property_rn(property_id)
     )
-    response = client.get_property(request=request)
+    with api_span("ga.get_property", resource=request.name):
+        response = client.get_property(request=request)
     return proto_to_dict(response)
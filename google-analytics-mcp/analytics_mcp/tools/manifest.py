@@ -0,0 +1,163 @@
+# Copyright 2025 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Lightweight manifest of tool descriptions that are expensive to build.
+
+The `run_report` and `run_realtime_report` descriptions embed hints rendered
+from Data API protos, which requires importing `google.analytics.data_v1beta`.
+The rendered descriptions are stored in `manifest.json` next to this module so
+the server can register its tools without importing the Google client
+libraries. The manifest is keyed by the package version, the installed
+`google-analytics-data` version and the source of the modules that render the
+descriptions, so edits to the hints and client upgrades invalidate it.
+
+The packaged manifest is only written at build time, with:
+
+    python -m analytics_mcp.tools.manifest
+
+If it's stale at runtime, the rendered descriptions are cached in a file named
+after the key in the system temp directory instead, so read-only and shared
+installs keep working.
+"""
+
+from importlib import metadata
+from typing import Callable, Dict, Optional
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+
+from analytics_mcp.tools.utils import _get_package_version_with_fallback
+
+_MANIFEST_PATH = pathlib.Path(__file__).with_name("manifest.json")
+
+# Distribution whose protos the hints are rendered from.
+_DATA_API_DISTRIBUTION = "google-analytics-data"
+
+# Modules whose source determines the rendered descriptions.
+_SOURCES = (
+    "reporting/core.py",
+    "reporting/metadata.py",
+    "reporting/realtime.py",
+)
+
+_manifest = None
+_key = None
+
+
+def _data_api_version() -> str:
+    """Returns the installed version of the Data API client library."""
+    try:
+        return metadata.version(_DATA_API_DISTRIBUTION)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _manifest_key() -> str:
+    """Returns the key that identifies the current set of descriptions."""
+    global _key
+    if _key is None:
+        digest = hashlib.sha256(_get_package_version_with_fallback().encode())
+        digest.update(b"\0" + _data_api_version().encode() + b"\0")
+        tools_dir = pathlib.Path(__file__).parent
+        for source in _SOURCES:
+            digest.update((tools_dir / source).read_bytes())
+        _key = digest.hexdigest()
+    return _key
+
+
+def _runtime_path() -> pathlib.Path:
+    """Returns the cache file for descriptions rendered at runtime."""
+    return (
+        pathlib.Path(tempfile.gettempdir())
+        / "analytics_mcp"
+        / f"manifest-{_manifest_key()[:16]}.json"
+    )
+
+
+def _read(path: pathlib.Path) -> Optional[Dict[str, str]]:
+    """Returns the descriptions in `path` if they match the current key."""
+    try:
+        stored = json.loads(path.read_text(encoding="utf-8"))
+        if stored.get("key") == _manifest_key():
+            return stored["descriptions"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def _load() -> Dict[str, str]:
+    """Returns the stored descriptions, or an empty dict if they're stale."""
+    global _manifest
+    if _manifest is None:
+        _manifest = _read(_MANIFEST_PATH) or _read(_runtime_path()) or {}
+    return _manifest
+
+
+def _store(
+    descriptions: Dict[str, str], path: Optional[pathlib.Path] = None
+) -> None:
+    """Writes the descriptions, by default to the runtime cache.
+
+    The file is replaced atomically, so concurrent servers never read a
+    partial manifest. Write errors are ignored.
+    """
+    path = path or _runtime_path()
+    temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary.write_text(
+            json.dumps(
+                {"key": _manifest_key(), "descriptions": descriptions},
+                indent=2,
+                sort_keys=True,
+            ),
+            encoding="utf-8",
+        )
+        os.replace(temporary, path)
+    except OSError:
+        temporary.unlink(missing_ok=True)
+
+
+def get_description(tool_name: str, build: Callable[[], str]) -> str:
+    """Returns the description of a tool, building and storing it if needed.
+
+    Args:
+        tool_name: The name of the tool.
+        build: Renders the description. Only called if the manifest doesn't
+          contain an up-to-date description for the tool.
+    """
+    descriptions = _load()
+    if tool_name not in descriptions:
+        descriptions[tool_name] = build()
+        _store(descriptions)
+    return descriptions[tool_name]
+
+
+def main() -> None:
+    """Rebuilds the packaged manifest from scratch."""
+    _MANIFEST_PATH.unlink(missing_ok=True)
+
+    # Importing the tool modules renders every description.
+    from analytics_mcp import server  # noqa: F401
+    from analytics_mcp.tools import manifest
+
+    descriptions = manifest._load()
+    manifest._store(descriptions, _MANIFEST_PATH)
+    print(f"Wrote {len(descriptions)} descriptions to {_MANIFEST_PATH}")
+
+
+if __name__ == "__main__":
+    main()
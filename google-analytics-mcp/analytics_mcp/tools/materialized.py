@@ -0,0 +1,488 @@
+# Copyright 2025 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Recurring reports materialized in the background and served locally.
+
+Teams ask the same reports (traffic by channel, conversions by campaign) over
+and over. `ANALYTICS_MCP_MATERIALIZED_REPORTS` points to a YAML list of
+report specs, each with a `name` and the arguments of `run_report`:
+
+    - name: traffic_by_channel
+      property_id: 123456
+      date_ranges: [{start_date: 28daysAgo, end_date: yesterday}]
+      dimensions: [sessionDefaultChannelGroup]
+      metrics: [sessions, totalUsers]
+      interval_seconds: 3600
+
+A scheduler started by the server lifespan runs each spec every
+`interval_seconds` (`ANALYTICS_MCP_MATERIALIZE_INTERVAL_S`, an hour by
+default) and writes its rows to a JSON file in `ANALYTICS_MCP_MATERIALIZED_DIR`.
+`run_report` serves a request from that file when it asks for the same report
+as a spec, whatever its `order_bys`, `offset` and `limit`, which are applied to
+the stored rows. The result carries a `materialized` stamp with the time it
+was materialized.
+
+A file is served while it's younger than `max_age_seconds` (twice the interval
+by default) and its relative dates ("28daysAgo", "yesterday") still resolve to
+the same days in the property's time zone. Since the freshness is read from
+the files, server processes sharing the directory don't run a spec that
+another one has just materialized.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import asyncio
+import datetime
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+import zoneinfo
+
+from analytics_mcp.tools import report_cache
+
+_logger = logging.getLogger(__name__)
+
+# Seconds between two runs of a spec.
+_DEFAULT_INTERVAL_SECONDS = 3600
+
+# Row limit of the materialized reports.
+_MAX_ROWS = 250_000
+
+# Shortest wait of the scheduler between two checks of the specs.
+_MIN_SLEEP_SECONDS = 1.0
+
+_NAME = re.compile(r"^[A-Za-z0-9_-]+$")
+
+# Arguments of `run_report` that a spec may set.
+_REQUIRED_ARGUMENTS = ("property_id", "date_ranges", "dimensions", "metrics")
+_OPTIONAL_ARGUMENTS = (
+    "dimension_filter",
+    "metric_filter",
+    "order_bys",
+    "limit",
+    "offset",
+    "currency_code",
+)
+_SCHEDULE_KEYS = ("name", "interval_seconds", "max_age_seconds")
+
+Build = Callable[..., Any]
+Fetch = Callable[[Any], Awaitable[Dict[str, Any]]]
+
+_materializer: Optional["Materializer"] = None
+
+# Set when the specs fail to load, so that the error is logged only once.
+_load_failed = False
+
+
+class ReportSpec:
+    """A recurring report: the arguments of `run_report` and its schedule."""
+
+    def __init__(
+        self,
+        name: str,
+        arguments: Dict[str, Any],
+        interval_seconds: Optional[float] = None,
+        max_age_seconds: Optional[float] = None,
+    ):
+        """Creates a spec.
+
+        Args:
+            name: Identifies the spec and names its file.
+            arguments: Keyword arguments for `run_report`.
+            interval_seconds: Defaults to
+              `ANALYTICS_MCP_MATERIALIZE_INTERVAL_S` or an hour.
+            max_age_seconds: Defaults to twice `interval_seconds`.
+        """
+        self.name = name
+        self.arguments = arguments
+        self.interval_seconds = float(
+            interval_seconds
+            or os.getenv(
+                "ANALYTICS_MCP_MATERIALIZE_INTERVAL_S",
+                _DEFAULT_INTERVAL_SECONDS,
+            )
+        )
+        self.max_age_seconds = float(
+            max_age_seconds or 2 * self.interval_seconds
+        )
+
+
+def parse_specs(documents: Any) -> List[ReportSpec]:
+    """Validates the parsed YAML list of report specs.
+
+    Raises:
+        ValueError: If the list or one of its specs is malformed.
+    """
+    if not isinstance(documents, list):
+        raise ValueError("Materialized reports must be a list of specs")
+    specs = []
+    names = set()
+    for index, document in enumerate(documents):
+        if not isinstance(document, dict):
+            raise ValueError(f"Report spec #{index} must be a mapping")
+        name = str(document.get("name", ""))
+        if not _NAME.match(name):
+            raise ValueError(
+                f"Report spec #{index} needs a `name` made of letters, "
+                "digits, '_' and '-'"
+            )
+        if name in names:
+            raise ValueError(f"Duplicate report spec name: {name}")
+        names.add(name)
+        missing = [key for key in _REQUIRED_ARGUMENTS if key not in document]
+        unknown = sorted(
+            set(document)
+            - set(_REQUIRED_ARGUMENTS + _OPTIONAL_ARGUMENTS + _SCHEDULE_KEYS)
+        )
+        if missing or unknown:
+            raise ValueError(
+                f"Report spec {name}: missing {missing}, unknown {unknown}"
+            )
+        arguments = {
+            key: value
+            for key, value in document.items()
+            if key not in _SCHEDULE_KEYS
+        }
+        # YAML reads unquoted dates such as 2025-06-01 as dates.
+        arguments["date_ranges"] = [
+            {
+                key: (
+                    value.isoformat()
+                    if isinstance(value, datetime.date)
+                    else value
+                )
+                for key, value in date_range.items()
+            }
+            for date_range in arguments["date_ranges"]
+        ]
+        specs.append(
+            ReportSpec(
+                name,
+                arguments,
+                interval_seconds=document.get("interval_seconds"),
+                max_age_seconds=document.get("max_age_seconds"),
+            )
+        )
+    return specs
+
+
+def load_specs(path: str) -> List[ReportSpec]:
+    """Reads the report specs from a YAML file.
+
+    Raises:
+        RuntimeError: If PyYAML isn't installed.
+        ValueError: If the file isn't a valid list of specs.
+    """
+    try:
+        import yaml
+    except ImportError as e:
+        raise RuntimeError(
+            "ANALYTICS_MCP_MATERIALIZED_REPORTS requires PyYAML: "
+            "pip install 'google-analytics-mcp[materialized]'"
+        ) from e
+    with open(path, encoding="utf-8") as f:
+        return parse_specs(yaml.safe_load(f))
+
+
+def _request_key(request: Any) -> str:
+    """Returns the report a request asks for, ignoring order and pagination."""
+    stripped = type(request).deserialize(type(request).serialize(request))
+    del stripped.order_bys[:]
+    stripped.limit = 0
+    stripped.offset = 0
+    return type(request).to_json(stripped, indent=None, sort_keys=True)
+
+
+class Materializer:
+    """Runs the report specs on schedule and serves their stored results."""
+
+    def __init__(
+        self,
+        specs: List[ReportSpec],
+        build: Build,
+        fetch: Fetch,
+        directory: Optional[str] = None,
+        now: Callable[[], float] = time.time,
+    ):
+        """Creates a materializer.
+
+        Args:
+            specs: The recurring reports.
+            build: Builds a `RunReportRequest` from the arguments of
+              `run_report`.
+            fetch: Runs a `RunReportRequest` and returns the compact report,
+              with all its rows inline.
+            directory: Defaults to `ANALYTICS_MCP_MATERIALIZED_DIR` or a
+              directory in the system temp directory.
+            now: Returns the current time; only overridden by tests.
+        """
+        self.specs = specs
+        self.directory = (
+            directory
+            or os.getenv("ANALYTICS_MCP_MATERIALIZED_DIR")
+            or os.path.join(tempfile.gettempdir(), "analytics_mcp_materialized")
+        )
+        self._fetch = fetch
+        self._now = now
+        self._requests = {spec.name: build(**spec.arguments) for spec in specs}
+        self._by_key = {
+            _request_key(request): spec
+            for spec, request in zip(specs, self._requests.values())
+        }
+        # name -> (mtime, stored result)
+        self._loaded: Dict[str, Any] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def path(self, spec: ReportSpec) -> str:
+        return os.path.join(self.directory, f"{spec.name}.json")
+
+    def materialized_at(self, spec: ReportSpec) -> Optional[float]:
+        """Returns when the stored result of a spec was written, if any."""
+        try:
+            return os.path.getmtime(self.path(spec))
+        except OSError:
+            return None
+
+    async def materialize(self, spec: ReportSpec) -> bool:
+        """Runs a spec and stores its result.
+
+        Returns:
+            Whether the result was stored. Reports with more than `_MAX_ROWS`
+            rows aren't.
+        """
+        request = type(self._requests[spec.name]).deserialize(
+            type(self._requests[spec.name]).serialize(self._requests[spec.name])
+        )
+        del request.order_bys[:]
+        request.offset = 0
+        request.limit = _MAX_ROWS
+        report = await self._fetch(request)
+        if int(report.get("row_count") or 0) > len(report["rows"]):
+            _logger.warning(
+                "Materialized report %s has more than %d rows; not stored",
+                spec.name,
+                _MAX_ROWS,
+            )
+            return False
+        time_zone = (report.get("metadata") or {}).get("time_zone")
+        stored = {
+            "name": spec.name,
+            "key": _request_key(self._requests[spec.name]),
+            "time_zone": time_zone,
+            "days": self._resolve(request, time_zone),
+            "report": report,
+        }
+        await asyncio.to_thread(self._write, spec, stored)
+        return True
+
+    def _write(self, spec: ReportSpec, stored: Dict[str, Any]):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(spec)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(stored, f, separators=(",", ":"))
+        # Readers in other processes never see a partially written file.
+        os.replace(temp_path, path)
+
+    def due(self) -> List[ReportSpec]:
+        """Returns the specs whose stored result is older than their
+        interval, including the ones never materialized."""
+        now = self._now()
+        return [
+            spec
+            for spec in self.specs
+            if (self.materialized_at(spec) or 0) <= now - spec.interval_seconds
+        ]
+
+    async def run_due(self) -> int:
+        """Materializes the due specs concurrently.
+
+        Returns:
+            The number of specs materialized. Failures are logged and retried
+            on the next run.
+        """
+        due = self.due()
+        results = await asyncio.gather(
+            *(self.materialize(spec) for spec in due), return_exceptions=True
+        )
+        for spec, result in zip(due, results):
+            if isinstance(result, Exception):
+                _logger.warning(
+                    "Failed to materialize report %s: %r", spec.name, result
+                )
+        return sum(result is True for result in results)
+
+    def next_run_in(self) -> float:
+        """Returns the seconds until the next spec is due."""
+        now = self._now()
+        return max(
+            _MIN_SLEEP_SECONDS,
+            min(
+                (self.materialized_at(spec) or 0) + spec.interval_seconds - now
+                for spec in self.specs
+            ),
+        )
+
+    async def run_forever(self):
+        """Runs the due specs, then sleeps until the next one is due."""
+        while True:
+            try:
+                await self.run_due()
+            except Exception:
+                _logger.exception("Materialized reports scheduler failed")
+            await asyncio.sleep(self.next_run_in())
+
+    def start(self) -> "Materializer":
+        """Starts the scheduler on the running loop, unless it's running."""
+        loop = asyncio.get_running_loop()
+        if (
+            self._task is None
+            or self._task.done()
+            or self._task.get_loop() is not loop
+        ):
+            self._task = loop.create_task(self.run_forever())
+        return self
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def lookup(self, request: Any) -> Optional[Dict[str, Any]]:
+        """Returns a request's report from the stored result of its spec.
+
+        Returns:
+            The report, without the spilling of `encode_rows`, or None if no
+            spec matches or its stored result is missing or stale.
+        """
+        if request.return_property_quota:
+            return None
+        spec = self._by_key.get(_request_key(request))
+        if spec is None:
+            return None
+        stored = await self._load(spec)
+        if stored is None or stored["key"] != _request_key(
+            self._requests[spec.name]
+        ):
+            return None
+        mtime = self._loaded[spec.name][0]
+        age = self._now() - mtime
+        if age > spec.max_age_seconds or stored["days"] != self._resolve(
+            request, stored["time_zone"]
+        ):
+            return None
+        result = {k: v for k, v in stored["report"].items() if k != "rows"}
+        rows = report_cache.page_rows(
+            request, result["columns"], list(stored["report"]["rows"])
+        )
+        if rows is None:
+            return None
+        result["rows"] = rows
+        result["materialized"] = {
+            "report": spec.name,
+            "materialized_at": datetime.datetime.fromtimestamp(
+                mtime, datetime.timezone.utc
+            ).isoformat(timespec="seconds"),
+            "age_seconds": int(age),
+        }
+        return result
+
+    async def _load(self, spec: ReportSpec) -> Optional[Dict[str, Any]]:
+        """Returns the stored result of a spec, reading it if it changed."""
+        mtime = self.materialized_at(spec)
+        if mtime is None:
+            return None
+        loaded = self._loaded.get(spec.name)
+        if loaded is None or loaded[0] != mtime:
+            stored = await asyncio.to_thread(self._read, spec)
+            if stored is None:
+                return None
+            loaded = self._loaded[spec.name] = (mtime, stored)
+        return loaded[1]
+
+    def _read(self, spec: ReportSpec) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path(spec), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _resolve(
+        self, request: Any, time_zone: Optional[str]
+    ) -> Optional[List[List[str]]]:
+        """Resolves the date ranges of a request to days in a time zone."""
+        today = datetime.datetime.fromtimestamp(
+            self._now(), zoneinfo.ZoneInfo(time_zone or "UTC")
+        ).date()
+        days = []
+        for date_range in request.date_ranges:
+            start = report_cache.resolve_date(date_range.start_date, today)
+            end = report_cache.resolve_date(date_range.end_date, today)
+            if start is None or end is None:
+                return None
+            days.append([start.isoformat(), end.isoformat()])
+        return days
+
+
+def enabled() -> bool:
+    """Whether `ANALYTICS_MCP_MATERIALIZED_REPORTS` names a specs file."""
+    return bool(
+        os.getenv("ANALYTICS_MCP_MATERIALIZED_REPORTS")
+        and os.getenv("ANALYTICS_MCP_ROW_FORMAT") != "proto"
+    )
+
+
+def get_materializer() -> Optional[Materializer]:
+    """Returns the materializer of the server process, or None if it's
+    disabled.
+
+    If the specs can't be loaded the error is logged once and the feature
+    stays off, so that `run_report` keeps serving reports from the API.
+    """
+    global _materializer, _load_failed
+    if not enabled() or _load_failed:
+        return None
+    if _materializer is None:
+        from analytics_mcp.tools.reporting import core
+
+        path = os.environ["ANALYTICS_MCP_MATERIALIZED_REPORTS"]
+        try:
+            _materializer = Materializer(
+                load_specs(path),
+                core.build_report_request,
+                core._fetch_partial_report,
+            )
+        except Exception:
+            _load_failed = True
+            _logger.exception(
+                "Materialized reports disabled: can't load the specs in %s",
+                path,
+            )
+            return None
+    return _materializer
+
+
+def start_from_env() -> Optional[Materializer]:
+    """Starts the scheduler on the running loop if it is enabled in the env.
+
+    Idempotent, since the stateless HTTP transport enters the server lifespan
+    on every request.
+    """
+    materializer = get_materializer()
+    if materializer is None:
+        return None
+    return materializer.start()
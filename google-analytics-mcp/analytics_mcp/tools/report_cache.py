@@ -0,0 +1,387 @@
+# Copyright 2025 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Incremental cache of `run_report` results broken down by `date`.
+
+Rolling-window questions ("sessions by date for the last 30 days") are asked
+again and again, and only the newest days change between runs. With
+`ANALYTICS_MCP_REPORT_CACHE=incremental`, reports with a `date` dimension and
+a single date range are cached per day: every row belongs to exactly one day,
+so the rows of a range are the rows of its days. A run fetches only the days
+that are missing, older than `ANALYTICS_MCP_REPORT_CACHE_TTL_S`, or not yet
+settled (the last `ANALYTICS_MCP_REPORT_CACHE_SETTLE_DAYS` days, which Google
+Analytics keeps processing), one request per contiguous span of days. The
+days are then merged, sorted by `order_bys`, and `offset`, `limit` and
+`row_count` are applied to the merged rows.
+
+Relative dates ("30daysAgo", "yesterday") are resolved in the property's time
+zone, taken from the metadata of its first report, which is fetched as is.
+Reports that need the whole range at once (totals, property quota, more than
+`_MAX_SPAN_ROWS` rows for a span) bypass the cache.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import asyncio
+import collections
+import datetime
+import os
+import re
+import time
+import zoneinfo
+
+# Days, counting back from today, that are always fetched again.
+_DEFAULT_SETTLE_DAYS = 2
+
+# Seconds a settled day is reused before it is fetched again.
+_DEFAULT_TTL_SECONDS = 86400
+
+# Reports (distinct requests, ignoring dates and order) kept in memory.
+_DEFAULT_MAX_REPORTS = 64
+
+# Row limit of the requests for each span of days.
+_MAX_SPAN_ROWS = 250_000
+
+_DAYS_AGO = re.compile(r"^(\d+)daysAgo$")
+
+# Fields of a report that aren't copied from the latest partial result.
+_ROW_KEYS = ("rows", "row_count", "result")
+
+Fetch = Callable[[Any], Awaitable[Dict[str, Any]]]
+
+
+def enabled() -> bool:
+    """Whether `ANALYTICS_MCP_REPORT_CACHE` selects the incremental cache."""
+    return (
+        os.getenv("ANALYTICS_MCP_REPORT_CACHE") == "incremental"
+        and os.getenv("ANALYTICS_MCP_ROW_FORMAT") != "proto"
+    )
+
+
+def resolve_date(value: str, today: datetime.date) -> Optional[datetime.date]:
+    """Resolves a Data API date (`YYYY-MM-DD`, `today`, `NdaysAgo`...)."""
+    if value == "today":
+        return today
+    if value == "yesterday":
+        return today - datetime.timedelta(days=1)
+    match = _DAYS_AGO.match(value or "")
+    if match:
+        return today - datetime.timedelta(days=int(match.group(1)))
+    try:
+        return datetime.date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def day_spans(
+    days: List[datetime.date],
+) -> List[Tuple[datetime.date, datetime.date]]:
+    """Groups sorted days into (first, last) spans of consecutive days."""
+    spans: List[Tuple[datetime.date, datetime.date]] = []
+    for day in days:
+        if spans and day - spans[-1][1] == datetime.timedelta(days=1):
+            spans[-1] = (spans[-1][0], day)
+        else:
+            spans.append((day, day))
+    return spans
+
+
+def _sort_key(order_by: Any, columns: List[str]) -> Optional[Callable]:
+    """Returns a key function for an `OrderBy`, or None if unsupported."""
+    from google.analytics import data_v1beta
+
+    order_type = data_v1beta.OrderBy.DimensionOrderBy.OrderType
+    if "metric" in order_by:
+        name, numeric, fold = order_by.metric.metric_name, True, False
+    elif "dimension" in order_by:
+        name = order_by.dimension.dimension_name
+        kind = order_by.dimension.order_type
+        numeric = kind == order_type.NUMERIC
+        fold = kind == order_type.CASE_INSENSITIVE_ALPHANUMERIC
+    else:
+        return None
+    if name not in columns:
+        return None
+    index = columns.index(name)
+
+    def key(row: List[str]) -> Any:
+        value = row[index]
+        if numeric:
+            try:
+                return float(value)
+            except ValueError:
+                return float("-inf")
+        return value.casefold() if fold else value
+
+    return key
+
+
+def page_rows(
+    request: Any, columns: List[str], rows: List[List[str]]
+) -> Optional[List[List[str]]]:
+    """Sorts rows by the `order_bys` of a request and applies its pagination.
+
+    Args:
+        request: A `RunReportRequest`.
+        columns: The columns of the rows.
+        rows: The rows of the whole report, sorted in place.
+
+    Returns:
+        The rows from `offset` up to `limit`, or None if an `OrderBy` isn't
+        supported.
+    """
+    keys = [_sort_key(order_by, columns) for order_by in request.order_bys]
+    if any(key is None for key in keys):
+        return None
+    for order_by, key in reversed(list(zip(request.order_bys, keys))):
+        rows.sort(key=key, reverse=order_by.desc)
+    start = request.offset or 0
+    end = start + request.limit if request.limit else None
+    return rows[start:end]
+
+
+class ReportCache:
+    """Per-day partial results of `run_report`, keyed by request."""
+
+    def __init__(
+        self,
+        settle_days: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        max_reports: Optional[int] = None,
+        now: Callable[[], datetime.datetime] = None,
+    ):
+        """Creates a cache.
+
+        Args:
+            settle_days: Defaults to `ANALYTICS_MCP_REPORT_CACHE_SETTLE_DAYS`
+              or 2.
+            ttl_seconds: Defaults to `ANALYTICS_MCP_REPORT_CACHE_TTL_S` or a
+              day.
+            max_reports: Defaults to `ANALYTICS_MCP_REPORT_CACHE_SIZE` or 64.
+            now: Returns the current time; only overridden by tests.
+        """
+        self.settle_days = int(
+            settle_days
+            if settle_days is not None
+            else os.getenv(
+                "ANALYTICS_MCP_REPORT_CACHE_SETTLE_DAYS", _DEFAULT_SETTLE_DAYS
+            )
+        )
+        self.ttl_seconds = float(
+            ttl_seconds
+            if ttl_seconds is not None
+            else os.getenv(
+                "ANALYTICS_MCP_REPORT_CACHE_TTL_S", _DEFAULT_TTL_SECONDS
+            )
+        )
+        self.max_reports = int(
+            max_reports
+            or os.getenv(
+                "ANALYTICS_MCP_REPORT_CACHE_SIZE", _DEFAULT_MAX_REPORTS
+            )
+        )
+        self._now = now or (
+            lambda: datetime.datetime.now(datetime.timezone.utc)
+        )
+        self._time_zones: Dict[str, str] = {}
+        # key -> {"template": report without rows, "days": {YYYYMMDD: (rows,
+        # fetched at)}}
+        self._reports: "collections.OrderedDict[str, Dict[str, Any]]" = (
+            collections.OrderedDict()
+        )
+
+    def key(self, request: Any) -> Optional[str]:
+        """Returns the cache key of a request, or None if it isn't eligible."""
+        if (
+            len(request.date_ranges) != 1
+            or "date" not in [d.name for d in request.dimensions]
+            or request.return_property_quota
+            or request.metric_aggregations
+            or request.keep_empty_rows
+        ):
+            return None
+        columns = [d.name for d in request.dimensions] + [
+            m.name for m in request.metrics
+        ]
+        if any(_sort_key(o, columns) is None for o in request.order_bys):
+            return None
+        stripped = type(request).deserialize(type(request).serialize(request))
+        del stripped.date_ranges[:]
+        del stripped.order_bys[:]
+        stripped.limit = 0
+        stripped.offset = 0
+        return type(request).to_json(stripped, indent=None, sort_keys=True)
+
+    async def run(self, request: Any, fetch: Fetch) -> Optional[Dict[str, Any]]:
+        """Runs `request` from the cached days plus the ones it lacks.
+
+        Args:
+            request: A `RunReportRequest`.
+            fetch: Runs a `RunReportRequest` and returns the compact report,
+              with all its rows inline.
+
+        Returns:
+            The merged report, without the spilling of `encode_rows`, or None
+            if the request must run as is.
+        """
+        key = self.key(request)
+        if key is None:
+            return None
+        time_zone = self._time_zones.get(request.property)
+        if time_zone is None:
+            # The first report of a property runs as is: its metadata tells
+            # the time zone in which its relative dates were resolved.
+            partial = await fetch(self._span_request(request, None))
+            time_zone = (partial.get("metadata") or {}).get("time_zone")
+            if not time_zone or self._truncated(partial):
+                return None
+            self._time_zones[request.property] = time_zone
+            days = self._days(request, time_zone)
+            if days is None:
+                return None
+            entry = self._entry(key)
+            self._store(entry, partial, days, time.time())
+            return self._merge(request, entry, days, fetched=len(days))
+
+        days = self._days(request, time_zone)
+        if days is None:
+            return None
+        entry = self._entry(key)
+        today = self._today(time_zone)
+        settled_before = today - datetime.timedelta(days=self.settle_days)
+        stale_before = time.time() - self.ttl_seconds
+        missing = [
+            day
+            for day in days
+            if day >= settled_before
+            or day.strftime("%Y%m%d") not in entry["days"]
+            or entry["days"][day.strftime("%Y%m%d")][1] < stale_before
+        ]
+        spans = day_spans(missing)
+        partials = await asyncio.gather(
+            *(fetch(self._span_request(request, span)) for span in spans)
+        )
+        if any(self._truncated(partial) for partial in partials):
+            return None
+        fetched_at = time.time()
+        for span, partial in zip(spans, partials):
+            span_days = [
+                span[0] + datetime.timedelta(days=i)
+                for i in range((span[1] - span[0]).days + 1)
+            ]
+            self._store(entry, partial, span_days, fetched_at)
+        return self._merge(request, entry, days, fetched=len(missing))
+
+    def _today(self, time_zone: str) -> datetime.date:
+        return self._now().astimezone(zoneinfo.ZoneInfo(time_zone)).date()
+
+    def _days(
+        self, request: Any, time_zone: str
+    ) -> Optional[List[datetime.date]]:
+        today = self._today(time_zone)
+        date_range = request.date_ranges[0]
+        start = resolve_date(date_range.start_date, today)
+        end = resolve_date(date_range.end_date, today)
+        if start is None or end is None or end < start:
+            return None
+        return [
+            start + datetime.timedelta(days=i)
+            for i in range((end - start).days + 1)
+        ]
+
+    def _entry(self, key: str) -> Dict[str, Any]:
+        entry = self._reports.get(key)
+        if entry is None:
+            entry = self._reports[key] = {"template": None, "days": {}}
+            while len(self._reports) > self.max_reports:
+                self._reports.popitem(last=False)
+        self._reports.move_to_end(key)
+        return entry
+
+    @staticmethod
+    def _span_request(
+        request: Any, span: Optional[Tuple[datetime.date, datetime.date]]
+    ) -> Any:
+        from google.analytics import data_v1beta
+
+        partial = type(request).deserialize(type(request).serialize(request))
+        if span is not None:
+            partial.date_ranges = [
+                data_v1beta.DateRange(
+                    start_date=span[0].isoformat(),
+                    end_date=span[1].isoformat(),
+                )
+            ]
+        del partial.order_bys[:]
+        partial.offset = 0
+        partial.limit = _MAX_SPAN_ROWS
+        return partial
+
+    @staticmethod
+    def _truncated(partial: Dict[str, Any]) -> bool:
+        return int(partial.get("row_count") or 0) > len(partial["rows"])
+
+    @staticmethod
+    def _store(
+        entry: Dict[str, Any],
+        partial: Dict[str, Any],
+        days: List[datetime.date],
+        fetched_at: float,
+    ):
+        entry["template"] = {
+            k: v for k, v in partial.items() if k not in _ROW_KEYS
+        }
+        date_index = partial["columns"].index("date")
+        by_day: Dict[str, List[List[str]]] = {}
+        for row in partial["rows"]:
+            by_day.setdefault(row[date_index], []).append(row)
+        for day in days:
+            name = day.strftime("%Y%m%d")
+            # Days without rows are cached too, as empty days.
+            entry["days"][name] = (by_day.get(name, []), fetched_at)
+
+    def _merge(
+        self,
+        request: Any,
+        entry: Dict[str, Any],
+        days: List[datetime.date],
+        fetched: int,
+    ) -> Dict[str, Any]:
+        result = dict(entry["template"])
+        rows = [
+            row
+            for day in days
+            for row in entry["days"][day.strftime("%Y%m%d")][0]
+        ]
+        result["row_count"] = len(rows)
+        result["rows"] = page_rows(request, result["columns"], rows)
+        result["incremental_cache"] = {
+            "days": len(days),
+            "fetched_days": fetched,
+            "cached_days": len(days) - fetched,
+        }
+        return result
+
+
+_cache: Optional[ReportCache] = None
+
+
+def get_cache() -> Optional[ReportCache]:
+    """Returns the cache of the server process, or None if it's disabled."""
+    global _cache
+    if not enabled():
+        return None
+    if _cache is None:
+        _cache = ReportCache()
+    return _cache
@@ -14,34 +14,33 @@
 
 """Tools for running core reports using the Data API."""
 
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List
+
+import sys
 
 from analytics_mcp.coordinator import mcp
+from analytics_mcp.tools import materialized, report_cache
+from analytics_mcp.tools.manifest import get_description
 from analytics_mcp.tools.reporting.metadata import (
+    COMPACT_HINTS,
+    compact_descriptions,
     get_date_ranges_hints,
     get_dimension_filter_hints,
     get_metric_filter_hints,
     get_order_bys_hints,
 )
 from analytics_mcp.tools.utils import (
+    api_span,
     construct_property_rn,
     create_data_api_client,
-    proto_to_dict,
+    encode_rows,
+    report_to_dict,
 )
-from google.analytics import data_v1beta
 
+if TYPE_CHECKING:
+    from google.analytics import data_v1beta
 
-def _run_report_description() -> str:
-    """Returns the description for the `run_report` tool."""
-    return f"""
-          {run_report.__doc__}
-
-          ## Hints for arguments
-
-          Here are some hints that outline the expected format and requirements
-          for arguments.
-
-          ### Hints for `dimensions`
+_DIMENSIONS_AND_METRICS_HINTS = """### Hints for `dimensions`
 
           The `dimensions` list must consist solely of either of the following:
 
@@ -61,8 +60,20 @@ def _run_report_description() -> str:
               These metrics are available to *every* property.
           2.  Custom metrics for the `property_id`. Use the
               `get_custom_dimensions_and_metrics` tool to retrieve the list of
-              custom metrics for a property.
+              custom metrics for a property."""
+
+
+def _run_report_description() -> str:
+    """Returns the description for the `run_report` tool."""
+    return f"""
+          {run_report.__doc__}
 
+          ## Hints for arguments
+
+          Here are some hints that outline the expected format and requirements
+          for arguments.
+
+          {_DIMENSIONS_AND_METRICS_HINTS}
 
           ### Hints for `date_ranges`:
           {get_date_ranges_hints()}
@@ -79,6 +90,19 @@ def _run_report_description() -> str:
           """
 
 
+def _run_report_compact_description() -> str:
+    """Returns the description for the `run_report` tool in compact mode."""
+    return f"""
+          {run_report.__doc__}
+
+          ## Hints for arguments
+
+          {_DIMENSIONS_AND_METRICS_HINTS}
+
+          {COMPACT_HINTS}
+          """
+
+
 async def run_report(
     property_id: int | str,
     date_ranges: List[Dict[str, str]],
@@ -138,6 +162,56 @@ async def run_report(
           report uses the property's default currency.
         return_property_quota: Whether to return property quota in the response.
     """
+    request = build_report_request(
+        property_id,
+        date_ranges,
+        dimensions,
+        metrics,
+        dimension_filter=dimension_filter,
+        metric_filter=metric_filter,
+        order_bys=order_bys,
+        limit=limit,
+        offset=offset,
+        currency_code=currency_code,
+        return_property_quota=return_property_quota,
+    )
+
+    materializer = materialized.get_materializer()
+    if materializer is not None:
+        result = await materializer.lookup(request)
+        if result is not None:
+            return encode_rows(result, result.pop("rows"))
+
+    cache = report_cache.get_cache()
+    if cache is not None:
+        result = await cache.run(request, _fetch_partial_report)
+        if result is not None:
+            return encode_rows(result, result.pop("rows"))
+
+    with api_span("ga.run_report", property=request.property) as span:
+        response = await create_data_api_client().run_report(request)
+        span.set_attribute("row_count", response.row_count)
+
+    with api_span("ga.report_to_dict", rows=len(response.rows)):
+        return report_to_dict(response)
+
+
+def build_report_request(
+    property_id: int | str,
+    date_ranges: List[Dict[str, str]],
+    dimensions: List[str],
+    metrics: List[str],
+    dimension_filter: Dict[str, Any] = None,
+    metric_filter: Dict[str, Any] = None,
+    order_bys: List[Dict[str, Any]] = None,
+    limit: int = None,
+    offset: int = None,
+    currency_code: str = None,
+    return_property_quota: bool = False,
+) -> "data_v1beta.RunReportRequest":
+    """Builds the `RunReportRequest` for the arguments of `run_report`."""
+    from google.analytics import data_v1beta
+
     request = data_v1beta.RunReportRequest(
         property=construct_property_rn(property_id),
         dimensions=[
@@ -167,18 +241,35 @@ async def run_report(
         request.offset = offset
     if currency_code:
         request.currency_code = currency_code
+    return request
 
-    response = await create_data_api_client().run_report(request)
 
-    return proto_to_dict(response)
+async def _fetch_partial_report(request) -> Dict[str, Any]:
+    """Runs a report with all its rows inline, for the incremental cache and
+    the materialized reports."""
+    with api_span(
+        "ga.run_report",
+        property=request.property,
+        date_range=f"{request.date_ranges[0].start_date}"
+        f"..{request.date_ranges[0].end_date}",
+    ) as span:
+        response = await create_data_api_client().run_report(request)
+        span.set_attribute("row_count", response.row_count)
+    return report_to_dict(response, inline_bytes=sys.maxsize)
 
 
 # The `run_report` tool requires a more complex description that's generated at
 # runtime. Uses the `add_tool` method instead of an annnotation since `add_tool`
 # provides the flexibility needed to generate the description while also
 # including the `run_report` method's docstring.
+# The rendered description is read from the tool manifest so that registering
+# the tool doesn't import the Data API client library.
 mcp.add_tool(
     run_report,
     title="Run a Google Analytics Data API report using the Data API",
-    description=_run_report_description(),
+    description=(
+        _run_report_compact_description()
+        if compact_descriptions()
+        else get_description("run_report", _run_report_description)
+    ),
 )
@@ -16,17 +16,22 @@
 
 from typing import Any, Dict, List
 
+import functools
+import os
+
 from analytics_mcp.coordinator import mcp
 from analytics_mcp.tools.utils import (
+    api_span,
     construct_property_rn,
     create_data_api_client,
     proto_to_dict,
     proto_to_json,
 )
-from google.analytics import data_v1beta
 
 
 def get_date_ranges_hints():
+    from google.analytics import data_v1beta
+
     range_jan = data_v1beta.DateRange(
         start_date="2025-01-01", end_date="2025-01-31", name="Jan2025"
     )
@@ -116,8 +121,10 @@ _FILTER_NOTES = """
   """
 
 
-def get_metric_filter_hints():
+def get_metric_filter_hints(include_notes: bool = True):
     """Returns hints and samples for metric_filter arguments."""
+    from google.analytics import data_v1beta
+
     event_count_gt_10_filter = data_v1beta.FilterExpression(
         filter=data_v1beta.Filter(
             field_name="eventCount",
@@ -155,8 +162,7 @@ def get_metric_filter_hints():
             expressions=[event_count_gt_10_filter, revenue_between_filter]
         )
     )
-    return (
-        f"""Example metric_filter arguments:
+    return f"""Example metric_filter arguments:
       1. A simple filter:
         {proto_to_json(event_count_gt_10_filter)}
 
@@ -172,13 +178,13 @@ def get_metric_filter_hints():
       5. An OR group filter:
         {proto_to_json(or_filter)}
 
-    """
-        + _FILTER_NOTES
-    )
+    """ + (_FILTER_NOTES if include_notes else "")
 
 
-def get_dimension_filter_hints():
+def get_dimension_filter_hints(include_notes: bool = True):
     """Returns hints and samples for dimension_filter arguments."""
+    from google.analytics import data_v1beta
+
     begins_with = data_v1beta.FilterExpression(
         filter=data_v1beta.Filter(
             field_name="eventName",
@@ -222,8 +228,7 @@ def get_dimension_filter_hints():
             expressions=[source_medium_filter, event_list_filter]
         )
     )
-    return (
-        f"""Example dimension_filter arguments:
+    return f"""Example dimension_filter arguments:
       1. A simple filter:
         {proto_to_json(begins_with)}
 
@@ -239,13 +244,13 @@ def get_dimension_filter_hints():
       5. An OR group filter:
         {proto_to_json(or_filter)}
 
-    """
-        + _FILTER_NOTES
-    )
+    """ + (_FILTER_NOTES if include_notes else "")
 
 
 def get_order_bys_hints():
     """Returns hints and examples for order_bys arguments."""
+    from google.analytics import data_v1beta
+
     dimension_alphanumeric_ascending = data_v1beta.OrderBy(
         dimension=data_v1beta.OrderBy.DimensionOrderBy(
             dimension_name="eventName",
@@ -315,6 +320,77 @@ def get_order_bys_hints():
     """
 
 
+def compact_descriptions() -> bool:
+    """Returns whether the report tools use compact descriptions.
+
+    Set `ANALYTICS_MCP_DESCRIPTION_MODE=compact` to leave the hints for
+    `date_ranges`, `dimension_filter`, `metric_filter` and `order_bys` out of
+    the `run_report` and `run_realtime_report` descriptions, which every LLM
+    request carries, and serve them through the `get_report_hints` tool
+    instead.
+    """
+    return os.getenv("ANALYTICS_MCP_DESCRIPTION_MODE", "full") == "compact"
+
+
+# Paragraph of the compact descriptions that replaces the argument hints.
+COMPACT_HINTS = """### Hints for `date_ranges`, `dimension_filter`, `metric_filter` and `order_bys`
+
+          Example `date_ranges`:
+          [ {"start_date": "30daysAgo", "end_date": "yesterday"} ]
+
+          Before passing a `dimension_filter`, `metric_filter` or `order_bys`,
+          or other date ranges, call the `get_report_hints` tool with the names
+          of those arguments to get their expected format and examples."""
+
+_HINTS = {
+    "date_ranges": get_date_ranges_hints,
+    "dimension_filter": functools.partial(
+        get_dimension_filter_hints, include_notes=False
+    ),
+    "metric_filter": functools.partial(
+        get_metric_filter_hints, include_notes=False
+    ),
+    "order_bys": get_order_bys_hints,
+}
+
+
+@functools.cache
+def _render_hints(argument: str) -> str:
+    """Returns the rendered hints for an argument, rendering them once."""
+    return _HINTS[argument]()
+
+
+async def get_report_hints(arguments: List[str]) -> Dict[str, str]:
+    """Returns the expected format and examples of report arguments.
+
+    Use it before passing a `dimension_filter`, `metric_filter`, `order_bys`
+    or non-trivial `date_ranges` to the `run_report` or `run_realtime_report`
+    tools.
+
+    Args:
+        arguments: The names of the arguments. Supported names are
+          "date_ranges", "dimension_filter", "metric_filter" and "order_bys".
+    """
+    unknown = [argument for argument in arguments if argument not in _HINTS]
+    if unknown:
+        raise ValueError(
+            f"Unknown arguments: {unknown}. Supported arguments are"
+            f" {list(_HINTS)}."
+        )
+    hints = {argument: _render_hints(argument) for argument in arguments}
+    if "dimension_filter" in hints or "metric_filter" in hints:
+        hints["filter_notes"] = _FILTER_NOTES
+    return hints
+
+
+# The hints tool is only useful when the report descriptions leave them out.
+if compact_descriptions():
+    mcp.add_tool(
+        get_report_hints,
+        title="Returns hints and examples for the arguments of the report tools",
+    )
+
+
 @mcp.tool(
     title="Retrieves the custom Core Reporting dimensions and metrics for a specific property"
 )
@@ -329,9 +405,9 @@ async def get_custom_dimensions_and_metrics(
           - A string consisting of 'properties/' followed by a number
 
     """
-    metadata = await create_data_api_client().get_metadata(
-        name=f"{construct_property_rn(property_id)}/metadata"
-    )
+    name = f"{construct_property_rn(property_id)}/metadata"
+    with api_span("ga.get_metadata", resource=name):
+        metadata = await create_data_api_client().get_metadata(name=name)
     custom_metrics = [
         proto_to_dict(metric)
         for metric in metadata.metrics
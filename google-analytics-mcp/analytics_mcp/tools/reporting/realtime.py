@@ -17,31 +17,23 @@
 from typing import Any, Dict, List
 
 from analytics_mcp.coordinator import mcp
+from analytics_mcp.tools.manifest import get_description
 from analytics_mcp.tools.utils import (
+    api_span,
     construct_property_rn,
     create_data_api_client,
-    proto_to_dict,
+    report_to_dict,
 )
 from analytics_mcp.tools.reporting.metadata import (
+    COMPACT_HINTS,
+    compact_descriptions,
     get_date_ranges_hints,
     get_dimension_filter_hints,
     get_metric_filter_hints,
     get_order_bys_hints,
 )
-from google.analytics import data_v1beta
 
-
-def _run_realtime_report_description() -> str:
-    """Returns the description for the `run_realtime_report` tool."""
-    return f"""
-          {run_realtime_report.__doc__}
-
-          ## Hints for arguments
-
-          Here are some hints that outline the expected format and requirements
-          for arguments.
-
-          ### Hints for `dimensions`
+_DIMENSIONS_AND_METRICS_HINTS = """### Hints for `dimensions`
 
           The `dimensions` list must consist solely of either of the following:
 
@@ -60,7 +52,20 @@ def _run_realtime_report_description() -> str:
           https://developers.google.com/analytics/devguides/reporting/data/v1/realtime-api-schema#metrics.
           These metrics are available to *every* property.
 
-          Realtime reports can't use custom metrics.
+          Realtime reports can't use custom metrics."""
+
+
+def _run_realtime_report_description() -> str:
+    """Returns the description for the `run_realtime_report` tool."""
+    return f"""
+          {run_realtime_report.__doc__}
+
+          ## Hints for arguments
+
+          Here are some hints that outline the expected format and requirements
+          for arguments.
+
+          {_DIMENSIONS_AND_METRICS_HINTS}
 
           ### Hints for `date_ranges`:
           {get_date_ranges_hints()}
@@ -77,6 +82,19 @@ def _run_realtime_report_description() -> str:
 """
 
 
+def _run_realtime_report_compact_description() -> str:
+    """Returns the description for the `run_realtime_report` tool in compact mode."""
+    return f"""
+          {run_realtime_report.__doc__}
+
+          ## Hints for arguments
+
+          {_DIMENSIONS_AND_METRICS_HINTS}
+
+          {COMPACT_HINTS}
+          """
+
+
 async def run_realtime_report(
     property_id: int | str,
     dimensions: List[str],
@@ -131,6 +149,8 @@ async def run_realtime_report(
           https://developers.google.com/analytics/devguides/reporting/data/v1/basics#pagination.
         return_property_quota: Whether to return realtime property quota in the response.
     """
+    from google.analytics import data_v1beta
+
     request = data_v1beta.RunRealtimeReportRequest(
         property=construct_property_rn(property_id),
         dimensions=[
@@ -158,16 +178,28 @@ async def run_realtime_report(
     if offset:
         request.offset = offset
 
-    response = await create_data_api_client().run_realtime_report(request)
-    return proto_to_dict(response)
+    with api_span("ga.run_realtime_report", property=request.property) as span:
+        response = await create_data_api_client().run_realtime_report(request)
+        span.set_attribute("row_count", response.row_count)
+
+    with api_span("ga.report_to_dict", rows=len(response.rows)):
+        return report_to_dict(response)
 
 
 # The `run_realtime_report` tool requires a more complex description that's generated at
 # runtime. Uses the `add_tool` method instead of an annnotation since `add_tool`
 # provides the flexibility needed to generate the description while also
 # including the `run_realtime_report` method's docstring.
+# The rendered description is read from the tool manifest so that registering
+# the tool doesn't import the Data API client library.
 mcp.add_tool(
     run_realtime_report,
     title="Run a Google Analytics realtime report using the Data API",
-    description=_run_realtime_report_description(),
+    description=(
+        _run_realtime_report_compact_description()
+        if compact_descriptions()
+        else get_description(
+            "run_realtime_report", _run_realtime_report_description
+        )
+    ),
 )
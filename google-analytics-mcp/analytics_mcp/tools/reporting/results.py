@@ -0,0 +1,65 @@
+# Copyright 2025 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Tools for paging through report rows kept in the result store."""
+
+from typing import Any, Dict
+
+from analytics_mcp.coordinator import mcp
+from analytics_mcp.tools.result_store import get_store
+
+# Maximum number of rows returned by a single `fetch_result_page` call.
+_MAX_PAGE_ROWS = 1000
+
+
+@mcp.tool(title="Fetch a page of a stored report result")
+def fetch_result_page(
+    result_id: str, offset: int = 0, limit: int = 100
+) -> Dict[str, Any]:
+    """Returns rows of a report that was too large to return inline.
+
+    When a report is too large, `run_report` and `run_realtime_report` return
+    only its first rows along with a `result` handle. Use the `result_id` of
+    that handle to read the remaining rows, a page at a time. Each row lists
+    the dimension values followed by the metric values, in the order given by
+    `columns`.
+
+    Args:
+        result_id: The `result_id` from the `result` handle of a report.
+        offset: The index of the first row to return, starting at 0.
+        limit: The number of rows to return, at most 1000.
+    """
+    store = get_store()
+    meta = store.describe(result_id)
+    rows = store.page(result_id, offset, min(limit, _MAX_PAGE_ROWS))
+    next_offset = max(0, offset) + len(rows)
+    return {
+        "result_id": result_id,
+        "columns": meta.get("columns", []),
+        "offset": max(0, offset),
+        "rows": rows,
+        "total_rows": meta["rows"],
+        "next_offset": next_offset if next_offset < meta["rows"] else None,
+    }
+
+
+@mcp.tool(title="Describe a stored report result")
+def describe_result(result_id: str) -> Dict[str, Any]:
+    """Returns the columns, row count, size and expiry of a stored result.
+
+    Args:
+        result_id: The `result_id` from the `result` handle of a report.
+    """
+    return get_store().describe(result_id)
@@ -0,0 +1,215 @@
+# Copyright 2025 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""On-disk store for report rows that are too large to return inline.
+
+Each result is an NDJSON file with one JSON list of values per row, next to a
+small JSON file with its metadata (columns, row count, size). Pages are read
+through a memory map and an index of line offsets, so fetching a page never
+loads the whole file. Results expire after a TTL and are removed whenever a
+new result is stored.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import array
+import json
+import mmap
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+
+# Seconds a stored result stays available.
+_DEFAULT_TTL_SECONDS = 3600
+
+# Line offset indexes kept in memory, for the most recently paged results.
+_MAX_INDEXES = 16
+
+_RESULT_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+class ResultNotFoundError(ValueError):
+    """Raised for unknown, malformed or expired result IDs."""
+
+
+class ResultWriter:
+    """Streams rows to a new result. Use `ResultStore.create`."""
+
+    def __init__(self, store: "ResultStore", meta: Dict[str, Any]):
+        self.store = store
+        self.result_id = uuid.uuid4().hex
+        self.meta = dict(meta)
+        self.rows = 0
+        self._file = open(
+            store.rows_path(self.result_id), "w", encoding="utf-8"
+        )
+
+    def write(self, values: List[Any]):
+        """Appends a row."""
+        self._file.write(json.dumps(values, separators=(",", ":")) + "\n")
+        self.rows += 1
+
+    def discard(self):
+        """Abandons an unfinished result, removing its rows."""
+        self._file.close()
+        try:
+            os.remove(self.store.rows_path(self.result_id))
+        except OSError:
+            pass
+
+    def close(self) -> Dict[str, Any]:
+        """Finishes the result and returns its handle."""
+        self._file.close()
+        self.meta.update(
+            result_id=self.result_id,
+            rows=self.rows,
+            bytes=os.path.getsize(self.store.rows_path(self.result_id)),
+            created=time.time(),
+        )
+        with open(
+            self.store.meta_path(self.result_id), "w", encoding="utf-8"
+        ) as f:
+            json.dump(self.meta, f)
+        return self.store.handle(self.meta)
+
+
+class ResultStore:
+    """Temp directory of NDJSON results with TTL cleanup and paged reads."""
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        """Creates a store.
+
+        Args:
+            directory: Defaults to `ANALYTICS_MCP_SPILL_DIR` or a directory
+              in the system temp directory.
+            ttl_seconds: Defaults to `ANALYTICS_MCP_RESULT_TTL_S` or an hour.
+        """
+        self.directory = (
+            directory
+            or os.getenv("ANALYTICS_MCP_SPILL_DIR")
+            or os.path.join(tempfile.gettempdir(), "analytics_mcp")
+        )
+        self.ttl_seconds = float(
+            ttl_seconds
+            if ttl_seconds is not None
+            else os.getenv("ANALYTICS_MCP_RESULT_TTL_S", _DEFAULT_TTL_SECONDS)
+        )
+        self._indexes: Dict[str, "array.array"] = {}
+        self._lock = threading.Lock()
+
+    def rows_path(self, result_id: str) -> str:
+        return os.path.join(self.directory, f"{result_id}.ndjson")
+
+    def meta_path(self, result_id: str) -> str:
+        return os.path.join(self.directory, f"{result_id}.json")
+
+    def create(self, **meta: Any) -> ResultWriter:
+        """Returns a writer for a new result, after removing expired ones."""
+        os.makedirs(self.directory, exist_ok=True)
+        self.cleanup()
+        return ResultWriter(self, meta)
+
+    def handle(self, meta: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns the handle returned to the LLM in place of the rows."""
+        return {
+            "result_id": meta["result_id"],
+            "rows": meta["rows"],
+            "bytes": meta["bytes"],
+            "expires_in_seconds": max(
+                0, int(meta["created"] + self.ttl_seconds - time.time())
+            ),
+        }
+
+    def describe(self, result_id: str) -> Dict[str, Any]:
+        """Returns the metadata of a result."""
+        meta = self._meta(result_id)
+        return dict(meta, **self.handle(meta))
+
+    def page(self, result_id: str, offset: int, limit: int) -> List[Any]:
+        """Returns `limit` rows starting at row `offset`."""
+        meta = self._meta(result_id)
+        offset = max(0, offset)
+        end = min(meta["rows"], offset + max(0, limit))
+        if offset >= end:
+            return []
+        with open(self.rows_path(result_id), "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                index = self._index(result_id, mm)
+                stop = index[end] if end < len(index) else len(mm)
+                return [
+                    json.loads(line)
+                    for line in mm[index[offset] : stop].splitlines()
+                ]
+
+    def cleanup(self):
+        """Removes the expired results."""
+        if not os.path.isdir(self.directory):
+            return
+        deadline = time.time() - self.ttl_seconds
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < deadline:
+                    os.remove(path)
+                    self._indexes.pop(name.split(".")[0], None)
+            except OSError:
+                pass
+
+    def _meta(self, result_id: str) -> Dict[str, Any]:
+        if not _RESULT_ID.match(result_id or ""):
+            raise ResultNotFoundError(f"Invalid result ID: {result_id}")
+        try:
+            with open(self.meta_path(result_id), encoding="utf-8") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            raise ResultNotFoundError(
+                f"Result {result_id} not found or expired. Run the report"
+                " again."
+            ) from None
+        if meta["created"] + self.ttl_seconds < time.time():
+            raise ResultNotFoundError(f"Result {result_id} expired.")
+        return meta
+
+    def _index(self, result_id: str, mm: mmap.mmap) -> "array.array":
+        """Returns the offset of the start of each line, cached per result."""
+        with self._lock:
+            index = self._indexes.get(result_id)
+            if index is None:
+                index = array.array("Q", [0])
+                position = mm.find(b"\n")
+                while position != -1 and position + 1 < len(mm):
+                    index.append(position + 1)
+                    position = mm.find(b"\n", position + 1)
+                if len(self._indexes) >= _MAX_INDEXES:
+                    self._indexes.pop(next(iter(self._indexes)))
+                self._indexes[result_id] = index
+            return index
+
+
+_store: Optional[ResultStore] = None
+
+
+def get_store() -> ResultStore:
+    """Returns the store of the server process."""
+    global _store
+    if _store is None:
+        _store = ResultStore()
+    return _store
@@ -12,15 +12,41 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Common utilities used by the MCP server."""
+"""Common utilities used by the MCP server.
 
-from typing import Any, Dict
+The Google client libraries are imported lazily, on the first API call, so
+that importing the tools (and answering `initialize`/`list_tools`) stays fast.
+"""
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
 
-from google.analytics import admin_v1beta, data_v1beta
-from google.api_core.gapic_v1.client_info import ClientInfo
 from importlib import metadata
-import google.auth
-import proto
+import contextlib
+import functools
+import logging
+import os
+import time
+
+from analytics_mcp.tools import result_store
+
+try:
+    from opentelemetry import trace as _otel_trace
+except ImportError:
+    _otel_trace = None
+
+if TYPE_CHECKING:
+    from google.analytics import admin_v1beta, data_v1beta
+    from google.api_core.gapic_v1.client_info import ClientInfo
+    import google.auth
+    import proto
 
 
 def _get_package_version_with_fallback():
@@ -34,8 +60,17 @@ def _get_package_version_with_fallback():
         return "unknown"
 
 
-# Client information that adds a custom user agent to all API requests.
-_CLIENT_INFO = ClientInfo(user_agent=f"analytics-mcp/{_get_package_version_with_fallback()}")
+@functools.cache
+def _client_info() -> "ClientInfo":
+    """Returns client information that adds a custom user agent to all API requests."""
+    from google.api_core.gapic_v1.client_info import ClientInfo
+
+    return ClientInfo(
+        user_agent=f"analytics-mcp/{_get_package_version_with_fallback()}"
+    )
+
+
+_logger = logging.getLogger(__name__)
 
 # Read-only scope for Analytics Admin API and Analytics Data API.
 _READ_ONLY_ANALYTICS_SCOPE = (
@@ -43,29 +78,37 @@ _READ_ONLY_ANALYTICS_SCOPE = (
 )
 
 
-def _create_credentials() -> google.auth.credentials.Credentials:
+def _create_credentials() -> "google.auth.credentials.Credentials":
     """Returns Application Default Credentials with read-only scope."""
+    import google.auth
+
     (credentials, _) = google.auth.default(scopes=[_READ_ONLY_ANALYTICS_SCOPE])
     return credentials
 
 
-def create_admin_api_client() -> admin_v1beta.AnalyticsAdminServiceAsyncClient:
+def create_admin_api_client() -> (
+    "admin_v1beta.AnalyticsAdminServiceAsyncClient"
+):
     """Returns a properly configured Google Analytics Admin API async client.
 
     Uses Application Default Credentials with read-only scope.
     """
+    from google.analytics import admin_v1beta
+
     return admin_v1beta.AnalyticsAdminServiceAsyncClient(
-        client_info=_CLIENT_INFO, credentials=_create_credentials()
+        client_info=_client_info(), credentials=_create_credentials()
     )
 
 
-def create_data_api_client() -> data_v1beta.BetaAnalyticsDataAsyncClient:
+def create_data_api_client() -> "data_v1beta.BetaAnalyticsDataAsyncClient":
     """Returns a properly configured Google Analytics Data API async client.
 
     Uses Application Default Credentials with read-only scope.
     """
+    from google.analytics import data_v1beta
+
     return data_v1beta.BetaAnalyticsDataAsyncClient(
-        client_info=_CLIENT_INFO, credentials=_create_credentials()
+        client_info=_client_info(), credentials=_create_credentials()
     )
 
 
@@ -94,13 +137,183 @@ def construct_property_rn(property_value: int | str) -> str:
     return f"properties/{property_num}"
 
 
-def proto_to_dict(obj: proto.Message) -> Dict[str, Any]:
+def proto_to_dict(obj: "proto.Message") -> Dict[str, Any]:
     """Converts a proto message to a dictionary."""
     return type(obj).to_dict(
         obj, use_integers_for_enums=False, preserving_proto_field_name=True
     )
 
 
-def proto_to_json(obj: proto.Message) -> str:
+def proto_to_json(obj: "proto.Message") -> str:
     """Converts a proto message to a JSON string."""
     return type(obj).to_json(obj, indent=None, preserving_proto_field_name=True)
+
+
+# Repeated `Row` fields of the report responses, encoded as lists of values.
+_ROW_FIELDS = ("rows", "totals", "maximums", "minimums")
+
+# Encoded size of the rows returned inline before they are spilled to a file.
+_DEFAULT_INLINE_BYTES = 1_000_000
+
+# Number of rows kept inline, as a preview, when the rows are spilled.
+_PREVIEW_ROWS = 50
+
+
+def _row_values(row: Any) -> List[str]:
+    """Returns the dimension values followed by the metric values of a row."""
+    return [value.value for value in row.dimension_values] + [
+        value.value for value in row.metric_values
+    ]
+
+
+def report_to_dict(
+    response: "proto.Message",
+    inline_bytes: Optional[int] = None,
+    store: Optional["result_store.ResultStore"] = None,
+) -> Dict[str, Any]:
+    """Converts a report response to a compact dictionary, one row at a time.
+
+    Unlike `proto_to_dict`, which builds nested dictionaries for every value
+    of every row, each row is encoded as a list with its dimension values
+    followed by its metric values, in the order given by `columns`. The other
+    fields (headers, metadata, quota) are converted as usual.
+
+    When the encoded rows exceed `inline_bytes`, they are streamed to the
+    result store and only the first rows are returned inline, along with a
+    `result` handle for the `fetch_result_page` and `describe_result` tools.
+    Memory stays bounded by `inline_bytes` instead of growing with the size
+    of the report.
+
+    Setting `ANALYTICS_MCP_ROW_FORMAT=proto` restores the `proto_to_dict`
+    output.
+
+    Args:
+        response: A `RunReportResponse` or `RunRealtimeReportResponse`.
+        inline_bytes: Defaults to `ANALYTICS_MCP_INLINE_BYTES` or 1 MB.
+        store: Defaults to the store of the server process.
+    """
+    if os.getenv("ANALYTICS_MCP_ROW_FORMAT") == "proto":
+        return proto_to_dict(response)
+    from google.protobuf import json_format
+
+    pb = type(response).pb(response)
+
+    result: Dict[str, Any] = {}
+    for field in pb.DESCRIPTOR.fields:
+        value = getattr(pb, field.name)
+        if field.name in _ROW_FIELDS:
+            continue
+        if field.label == field.LABEL_REPEATED:
+            result[field.name] = [
+                json_format.MessageToDict(
+                    item, preserving_proto_field_name=True
+                )
+                for item in value
+            ]
+        elif field.message_type is not None:
+            if pb.HasField(field.name):
+                result[field.name] = json_format.MessageToDict(
+                    value, preserving_proto_field_name=True
+                )
+        else:
+            result[field.name] = value
+    result["columns"] = [header.name for header in pb.dimension_headers] + [
+        header.name for header in pb.metric_headers
+    ]
+    for field_name in _ROW_FIELDS[1:]:
+        if getattr(pb, field_name):
+            result[field_name] = [
+                _row_values(row) for row in getattr(pb, field_name)
+            ]
+
+    return encode_rows(
+        result, (_row_values(row) for row in pb.rows), inline_bytes, store
+    )
+
+
+def encode_rows(
+    result: Dict[str, Any],
+    rows: Iterable[List[str]],
+    inline_bytes: Optional[int] = None,
+    store: Optional["result_store.ResultStore"] = None,
+) -> Dict[str, Any]:
+    """Adds the compact `rows` of a report to `result`.
+
+    Rows past `inline_bytes` are streamed to the result store, as described
+    in `report_to_dict`.
+
+    Args:
+        result: A compact report dictionary with its `columns`.
+        rows: The values of each row, in the order given by `columns`.
+        inline_bytes: Defaults to `ANALYTICS_MCP_INLINE_BYTES` or 1 MB.
+        store: Defaults to the store of the server process.
+    """
+    if inline_bytes is None:
+        inline_bytes = int(
+            os.getenv("ANALYTICS_MCP_INLINE_BYTES", _DEFAULT_INLINE_BYTES)
+        )
+    inline: List[List[str]] = []
+    size = 0
+    writer = None
+    try:
+        for values in rows:
+            if writer is not None:
+                writer.write(values)
+                continue
+            inline.append(values)
+            # Approximate size of the compact JSON encoding of the row.
+            size += sum(len(value) + 3 for value in values) + 2
+            if size > inline_bytes:
+                writer = (store or result_store.get_store()).create(
+                    columns=result["columns"]
+                )
+                for spilled in inline:
+                    writer.write(spilled)
+                del inline[_PREVIEW_ROWS:]
+    except BaseException:
+        # A partial result is never published.
+        if writer is not None:
+            writer.discard()
+        raise
+    if writer is not None:
+        result["result"] = writer.close()
+
+    result["rows"] = inline
+    return result
+
+
+class _NoopSpan:
+    """Stands in for an OpenTelemetry span when tracing isn't available."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+@contextlib.contextmanager
+def api_span(name: str, **attributes: Any) -> Iterator[Any]:
+    """Measures an upstream API call or a costly conversion.
+
+    Emits an OpenTelemetry span if `opentelemetry-api` is installed (a no-op
+    unless the host configures an SDK) and logs the duration at DEBUG level.
+
+    Args:
+        name: The name of the span, such as "ga.run_report".
+        attributes: Primitive attributes to attach to the span.
+    """
+    started = time.perf_counter()
+    try:
+        if _otel_trace is None:
+            yield _NoopSpan()
+        else:
+            tracer = _otel_trace.get_tracer("analytics_mcp")
+            with tracer.start_as_current_span(
+                name, attributes=attributes
+            ) as span:
+                yield span
+    finally:
+        _logger.debug(
+            "%s took %.1f ms %s",
+            name,
+            (time.perf_counter() - started) * 1000,
+            attributes,
+        )
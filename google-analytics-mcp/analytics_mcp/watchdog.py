@@ -0,0 +1,155 @@
+# Copyright 2025 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Opt-in detector for synchronous work that blocks the event loop.
+
+Enabled with `ANALYTICS_MCP_LOOP_WATCHDOG_MS=<threshold in ms>`. A heartbeat
+task on the event loop records when the loop last woke up and a daemon thread
+checks it. When the loop has not woken up for longer than the threshold, the
+thread logs a warning with the stack of the event loop thread, attributed to
+the tool whose code is on that stack (e.g. `proto_to_dict` on a large report
+under `run_report`).
+"""
+
+from typing import Any, Dict, Optional
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+import types
+
+_logger = logging.getLogger(__name__)
+
+# Number of innermost frames logged for each stall.
+_STACK_DEPTH = 25
+
+_watchdog: Optional["LoopWatchdog"] = None
+
+
+class LoopWatchdog:
+    """Logs the event loop stack whenever the loop is blocked for too long."""
+
+    def __init__(
+        self,
+        threshold_ms: float,
+        tool_codes: Dict[types.CodeType, str],
+        interval_ms: Optional[float] = None,
+    ):
+        """Creates a watchdog.
+
+        Args:
+            threshold_ms: How long the loop can be blocked before logging.
+            tool_codes: Maps the code object of each tool function to the tool
+              name, used to attribute the stall.
+            interval_ms: Heartbeat interval. Defaults to a quarter of the
+              threshold.
+        """
+        self.threshold = threshold_ms / 1000
+        self.interval = (
+            interval_ms if interval_ms is not None else max(threshold_ms / 4, 5)
+        ) / 1000
+        self.tool_codes = tool_codes
+        self.stalls = 0
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._heartbeat = time.monotonic()
+        self._stop = threading.Event()
+
+    def start(self) -> "LoopWatchdog":
+        """Starts the watchdog. Must be called from the event loop thread."""
+        self.loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self.loop.create_task(self._beat())
+        threading.Thread(
+            target=self._watch, name="analytics-mcp-watchdog", daemon=True
+        ).start()
+        return self
+
+    def stop(self):
+        """Stops the watchdog thread."""
+        self._stop.set()
+
+    async def _beat(self):
+        while not self._stop.is_set():
+            self._heartbeat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _watch(self):
+        stalled_at = None
+        while not self._stop.wait(self.interval / 2):
+            if self.loop.is_closed():
+                return
+            if not self.loop.is_running():
+                continue
+            beat = self._heartbeat
+            blocked = time.monotonic() - beat - self.interval
+            if stalled_at is None and blocked > self.threshold:
+                stalled_at = beat
+                self._report(blocked)
+            elif stalled_at is not None and beat != stalled_at:
+                stalled_at = None
+
+    def attribution(self, frame: Optional[types.FrameType]) -> str:
+        """Returns the name of the innermost tool on the stack of `frame`."""
+        while frame is not None:
+            tool_name = self.tool_codes.get(frame.f_code)
+            if tool_name:
+                return tool_name
+            frame = frame.f_back
+        return "unknown"
+
+    def _report(self, blocked: float):
+        frame = sys._current_frames().get(self._loop_thread)
+        self.stalls += 1
+        stack = (
+            "".join(traceback.format_stack(frame, limit=_STACK_DEPTH))
+            if frame
+            else ""
+        )
+        _logger.warning(
+            "Event loop blocked for more than %.0fms (tool: %s)\n%s",
+            blocked * 1000,
+            self.attribution(frame),
+            stack,
+        )
+
+
+def start_from_env(server: Any) -> Optional[LoopWatchdog]:
+    """Starts the watchdog on the running loop if it is enabled in the env.
+
+    Idempotent, since the stateless HTTP transport enters the server lifespan
+    on every request.
+
+    Args:
+        server: The FastMCP server whose tools are used for attribution.
+    """
+    global _watchdog
+    threshold = os.getenv("ANALYTICS_MCP_LOOP_WATCHDOG_MS")
+    if not threshold:
+        return None
+    loop = asyncio.get_running_loop()
+    if _watchdog is None or _watchdog.loop is not loop:
+        if _watchdog is not None:
+            _watchdog.stop()
+        tool_codes = {
+            tool.fn.__code__: tool.name
+            for tool in server._tool_manager.list_tools()
+        }
+        _watchdog = LoopWatchdog(float(threshold), tool_codes).start()
+    return _watchdog
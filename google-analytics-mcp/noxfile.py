@@ -35,6 +35,7 @@ FREEZE_COMMAND = ["python", "-m", "pip", "freeze"]
 TEST_DEPENDENCIES = [
     "pyfakefs>=5.0.0,<6.0",
     "coverage==6.5.0",
+    "PyYAML>=6.0",
 ]
 
 
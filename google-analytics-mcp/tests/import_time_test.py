@@ -0,0 +1,147 @@
+# Copyright 2025 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Import-time benchmark for the server module, based on `-X importtime`."""
+
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Budget for the modules of this package, excluding the `mcp` SDK itself.
+_IMPORT_BUDGET_US = int(
+    os.environ.get("ANALYTICS_MCP_IMPORT_BUDGET_US", "250000")
+)
+
+_HEAVY_MODULES = (
+    "google.analytics.admin_v1beta",
+    "google.analytics.data_v1beta",
+    "google.auth",
+    "proto",
+)
+
+
+def _import_times(module: str) -> dict:
+    """Returns the cumulative import time, in microseconds, of each module
+    imported by a fresh interpreter that imports `module`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestImportTime(unittest.TestCase):
+    """Test cases for the cold start of the server module."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Renders the manifest if it's stale, so the measured import is the
+        # one a deployed server performs.
+        from analytics_mcp import server  # noqa: F401
+
+        cls.times = _import_times("analytics_mcp.server")
+
+    def test_google_clients_are_imported_lazily(self):
+        """Tests that registering the tools doesn't import the API clients."""
+        for module in _HEAVY_MODULES:
+            self.assertNotIn(
+                module,
+                self.times,
+                f"{module} should only be imported on the first tool call",
+            )
+
+    def test_import_time_budget(self):
+        """Tests the import time of the server, excluding the MCP SDK."""
+        own_time = (
+            self.times["analytics_mcp.server"]
+            - self.times["mcp.server.fastmcp"]
+        )
+        self.assertLess(
+            own_time,
+            _IMPORT_BUDGET_US,
+            f"analytics_mcp.server import takes {own_time} us, over its"
+            f" {_IMPORT_BUDGET_US} us budget",
+        )
+
+
+class TestManifest(unittest.TestCase):
+    """Test cases for the tool description manifest."""
+
+    def test_manifest_matches_rendered_descriptions(self):
+        """Tests that the stored descriptions match freshly rendered ones."""
+        from analytics_mcp.tools import manifest
+        from analytics_mcp.tools.reporting import core, realtime
+
+        descriptions = manifest._load()
+        self.assertEqual(
+            descriptions["run_report"], core._run_report_description()
+        )
+        self.assertEqual(
+            descriptions["run_realtime_report"],
+            realtime._run_realtime_report_description(),
+        )
+
+    def test_key_includes_data_api_version(self):
+        """Tests that upgrading the Data API client invalidates the manifest."""
+        from analytics_mcp.tools import manifest
+
+        self.addCleanup(setattr, manifest, "_key", None)
+        keys = set()
+        for version in ("0.18.0", "0.19.0"):
+            manifest._key = None
+            with mock.patch.object(
+                manifest.metadata, "version", return_value=version
+            ):
+                keys.add(manifest._manifest_key())
+
+        self.assertEqual(len(keys), 2)
+
+    def test_stale_manifest_is_cached_outside_the_package(self):
+        """Tests that runtime renders never write the packaged manifest."""
+        from analytics_mcp.tools import manifest
+
+        with tempfile.TemporaryDirectory() as directory:
+            packaged = pathlib.Path(directory, "package", "manifest.json")
+            packaged.parent.mkdir()
+            packaged.write_text('{"key": "stale", "descriptions": {}}')
+            with mock.patch.object(
+                manifest, "_MANIFEST_PATH", packaged
+            ), mock.patch.object(
+                manifest.tempfile, "gettempdir", return_value=directory
+            ), mock.patch.object(
+                manifest, "_manifest", None
+            ):
+                description = manifest.get_description(
+                    "tool", lambda: "Rendered"
+                )
+                manifest._manifest = None
+                reloaded = manifest._load()
+
+            self.assertEqual(description, "Rendered")
+            self.assertEqual(reloaded, {"tool": "Rendered"})
+            self.assertEqual(
+                packaged.read_text(), '{"key": "stale", "descriptions": {}}'
+            )
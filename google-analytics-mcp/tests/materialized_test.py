@@ -0,0 +1,216 @@
+# Copyright 2025 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test cases for the materialized module."""
+
+import asyncio
+import datetime
+import os
+import tempfile
+import textwrap
+import unittest
+from unittest import mock
+
+from analytics_mcp.tools import materialized
+from analytics_mcp.tools.reporting.core import build_report_request
+
+_SPECS = """
+- name: traffic_by_channel
+  property_id: 123
+  date_ranges: [{start_date: 7daysAgo, end_date: yesterday}]
+  dimensions: [sessionDefaultChannelGroup]
+  metrics: [sessions]
+  interval_seconds: 600
+- name: conversions_by_campaign
+  property_id: properties/123
+  date_ranges: [{start_date: 2025-06-01, end_date: 2025-06-30}]
+  dimensions: [campaignName]
+  metrics: [conversions]
+  interval_seconds: 86400
+"""
+
+# 2025-06-15 12:00 UTC.
+_NOW = datetime.datetime(
+    2025, 6, 15, 12, 0, tzinfo=datetime.timezone.utc
+).timestamp()
+
+
+class _FakeDataApi:
+    """Returns three rows per report and records the requests."""
+
+    def __init__(self):
+        self.requests = []
+
+    async def fetch(self, request):
+        self.requests.append(request)
+        columns = [d.name for d in request.dimensions] + [
+            m.name for m in request.metrics
+        ]
+        rows = [["Direct", "12"], ["Email", "30"], ["Organic", "7"]]
+        return {
+            "metadata": {"time_zone": "UTC"},
+            "columns": columns,
+            "row_count": len(rows),
+            "rows": rows,
+        }
+
+
+def _traffic(**kwargs):
+    return build_report_request(
+        "123",
+        [{"start_date": "7daysAgo", "end_date": "yesterday"}],
+        ["sessionDefaultChannelGroup"],
+        ["sessions"],
+        **kwargs,
+    )
+
+
+class TestMaterializer(unittest.TestCase):
+    """Test cases for the materialized reports."""
+
+    def setUp(self):
+        self.now = _NOW
+        self.api = _FakeDataApi()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        path = os.path.join(self.directory.name, "specs.yaml")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(textwrap.dedent(_SPECS))
+        self.materializer = materialized.Materializer(
+            materialized.load_specs(path),
+            build_report_request,
+            self.api.fetch,
+            directory=self.directory.name,
+            now=lambda: self.now,
+        )
+
+    def _materialize(self):
+        count = asyncio.run(self.materializer.run_due())
+        # Stored files are stamped with the fake clock.
+        for spec in self.materializer.specs:
+            path = self.materializer.path(spec)
+            if os.path.exists(path):
+                os.utime(path, (self.now, self.now))
+        return count
+
+    def _lookup(self, request):
+        return asyncio.run(self.materializer.lookup(request))
+
+    def test_serves_matching_request(self):
+        """Tests that a matching request is served with a freshness stamp."""
+        self.assertEqual(self._materialize(), 2)
+        self.now += 120
+
+        result = self._lookup(_traffic())
+
+        self.assertEqual(result["rows"][0], ["Direct", "12"])
+        self.assertEqual(
+            result["materialized"],
+            {
+                "report": "traffic_by_channel",
+                "materialized_at": "2025-06-15T12:00:00+00:00",
+                "age_seconds": 120,
+            },
+        )
+        self.assertEqual(len(self.api.requests), 2)
+
+    def test_order_and_limit(self):
+        """Tests that order_bys and limit apply to the stored rows."""
+        self._materialize()
+        order_by = {"metric": {"metric_name": "sessions"}, "desc": True}
+
+        result = self._lookup(_traffic(order_bys=[order_by], limit=2))
+
+        self.assertEqual(result["rows"], [["Email", "30"], ["Direct", "12"]])
+        self.assertEqual(result["row_count"], 3)
+
+    def test_ignores_other_requests(self):
+        """Tests that requests for other reports aren't served."""
+        self._materialize()
+        other = build_report_request(
+            "123",
+            [{"start_date": "7daysAgo", "end_date": "yesterday"}],
+            ["sessionDefaultChannelGroup"],
+            ["totalUsers"],
+        )
+
+        self.assertIsNone(self._lookup(other))
+        self.assertIsNone(self._lookup(_traffic(return_property_quota=True)))
+
+    def test_stale_results(self):
+        """Tests that old results and shifted relative dates aren't served."""
+        self._materialize()
+        fixed = build_report_request(
+            123,
+            [{"start_date": "2025-06-01", "end_date": "2025-06-30"}],
+            ["campaignName"],
+            ["conversions"],
+        )
+
+        # Next day: "yesterday" no longer means the materialized day.
+        self.now += 13 * 3600
+        self.assertIsNone(self._lookup(_traffic()))
+        self.assertIsNotNone(self._lookup(fixed))
+
+        # Past twice its interval.
+        self.now += 2 * 86400
+        self.assertIsNone(self._lookup(fixed))
+
+    def test_schedule(self):
+        """Tests that only the specs past their interval are due."""
+        self._materialize()
+        self.assertEqual(self.materializer.due(), [])
+        self.assertEqual(self.materializer.next_run_in(), 600)
+
+        self.now += 900
+        self.assertEqual(
+            [spec.name for spec in self.materializer.due()],
+            ["traffic_by_channel"],
+        )
+
+    def test_invalid_specs(self):
+        """Tests the validation of the report specs."""
+        with self.assertRaisesRegex(ValueError, "needs a `name`"):
+            materialized.parse_specs([{"property_id": 123}])
+        with self.assertRaisesRegex(ValueError, "unknown \\['dimension'\\]"):
+            materialized.parse_specs(
+                [
+                    {
+                        "name": "traffic",
+                        "property_id": 123,
+                        "date_ranges": [],
+                        "dimension": [],
+                        "metrics": [],
+                    }
+                ]
+            )
+
+    def test_invalid_file_disables_feature(self):
+        """Tests that a broken specs file is logged once and turns it off."""
+        path = os.path.join(self.directory.name, "broken.yaml")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("- name: traffic\n")
+        self.addCleanup(setattr, materialized, "_load_failed", False)
+        self.addCleanup(setattr, materialized, "_materializer", None)
+        materialized._materializer = None
+
+        with mock.patch.dict(
+            "os.environ", {"ANALYTICS_MCP_MATERIALIZED_REPORTS": path}
+        ):
+            with self.assertLogs(materialized._logger, "ERROR") as logs:
+                self.assertIsNone(materialized.get_materializer())
+                self.assertIsNone(materialized.get_materializer())
+
+        self.assertEqual(len(logs.output), 1, "The error should log once")
@@ -0,0 +1,57 @@
+# Copyright 2025 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the metadata module."""
+
+import asyncio
+import unittest
+
+from analytics_mcp.tools.reporting import core, metadata, realtime
+
+
+class TestCompactDescriptions(unittest.TestCase):
+    """Test cases for the compact report descriptions and hints tool."""
+
+    def test_compact_descriptions_leave_out_hints(self):
+        """Tests that compact descriptions point to the hints tool."""
+        for compact, full in (
+            (
+                core._run_report_compact_description(),
+                core._run_report_description(),
+            ),
+            (
+                realtime._run_realtime_report_compact_description(),
+                realtime._run_realtime_report_description(),
+            ),
+        ):
+            self.assertIn("get_report_hints", compact)
+            self.assertNotIn("Example dimension_filter arguments", compact)
+            self.assertLess(len(compact), len(full) / 2)
+
+    def test_get_report_hints(self):
+        """Tests that the filter notes are returned once."""
+        hints = asyncio.run(
+            metadata.get_report_hints(["dimension_filter", "metric_filter"])
+        )
+
+        self.assertEqual(
+            set(hints), {"dimension_filter", "metric_filter", "filter_notes"}
+        )
+        self.assertNotIn("Notes:", hints["dimension_filter"])
+        self.assertNotIn("Notes:", hints["metric_filter"])
+
+    def test_get_report_hints_unknown_argument(self):
+        """Tests that unknown argument names are rejected."""
+        with self.assertRaises(ValueError):
+            asyncio.run(metadata.get_report_hints(["limit"]))
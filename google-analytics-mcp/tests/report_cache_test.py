@@ -0,0 +1,162 @@
+# Copyright 2025 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test cases for the report_cache module."""
+
+import asyncio
+import datetime
+import unittest
+
+from google.analytics import data_v1beta
+
+from analytics_mcp.tools import report_cache
+
+_NOW = datetime.datetime(2025, 6, 15, 12, 0, tzinfo=datetime.timezone.utc)
+_TODAY = datetime.date(2025, 6, 15)
+
+
+class _FakeDataApi:
+    """Returns two rows per day (none on June 10) and records the requests."""
+
+    def __init__(self):
+        self.ranges = []
+
+    async def fetch(self, request):
+        date_range = request.date_ranges[0]
+        start = report_cache.resolve_date(date_range.start_date, _TODAY)
+        end = report_cache.resolve_date(date_range.end_date, _TODAY)
+        self.ranges.append((start, end))
+        rows = []
+        day = start
+        while day <= end:
+            if day.day != 10:
+                name = day.strftime("%Y%m%d")
+                rows.append([name, "Direct", str(day.day)])
+                rows.append([name, "Email", str(day.day * 2)])
+            day += datetime.timedelta(days=1)
+        return {
+            "metadata": {"time_zone": "America/Los_Angeles"},
+            "columns": ["date", "sessionDefaultChannelGroup", "sessions"],
+            "row_count": len(rows),
+            "rows": rows,
+        }
+
+
+def _request(start="30daysAgo", end="yesterday", **kwargs):
+    return data_v1beta.RunReportRequest(
+        property="properties/123",
+        dimensions=[
+            data_v1beta.Dimension(name="date"),
+            data_v1beta.Dimension(name="sessionDefaultChannelGroup"),
+        ],
+        metrics=[data_v1beta.Metric(name="sessions")],
+        date_ranges=[data_v1beta.DateRange(start_date=start, end_date=end)],
+        **kwargs,
+    )
+
+
+class TestReportCache(unittest.TestCase):
+    """Test cases for the incremental report cache."""
+
+    def setUp(self):
+        self.api = _FakeDataApi()
+        self.cache = report_cache.ReportCache(
+            settle_days=2, ttl_seconds=3600, now=lambda: _NOW
+        )
+
+    def _run(self, request):
+        return asyncio.run(self.cache.run(request, self.api.fetch))
+
+    def test_fetches_only_unsettled_days(self):
+        """Tests that a repeated report only fetches the newest days."""
+        first = self._run(_request())
+        second = self._run(_request())
+
+        self.assertEqual(
+            self.api.ranges,
+            [
+                (datetime.date(2025, 5, 16), datetime.date(2025, 6, 14)),
+                (datetime.date(2025, 6, 13), datetime.date(2025, 6, 14)),
+            ],
+            "The second run should only fetch the two unsettled days",
+        )
+        self.assertEqual(second["rows"], first["rows"])
+        self.assertEqual(second["row_count"], 58)
+        self.assertEqual(
+            second["incremental_cache"],
+            {"days": 30, "fetched_days": 2, "cached_days": 28},
+        )
+
+    def test_extends_the_window(self):
+        """Tests that a wider window fetches the days it lacks, per span."""
+        self._run(_request("2025-06-01", "2025-06-08"))
+        result = self._run(_request("2025-05-30", "2025-06-14"))
+
+        self.assertEqual(
+            self.api.ranges[1:],
+            [
+                (datetime.date(2025, 5, 30), datetime.date(2025, 5, 31)),
+                (datetime.date(2025, 6, 9), datetime.date(2025, 6, 14)),
+            ],
+        )
+        self.assertEqual(result["rows"][0][0], "20250530")
+        self.assertEqual(result["rows"][-1][0], "20250614")
+        self.assertNotIn(
+            "20250610",
+            [row[0] for row in result["rows"]],
+            "Days without data should stay empty",
+        )
+
+    def test_order_and_limit(self):
+        """Tests that order_bys, offset and limit apply to the merged rows."""
+        order_by = data_v1beta.OrderBy(
+            metric=data_v1beta.OrderBy.MetricOrderBy(metric_name="sessions"),
+            desc=True,
+        )
+        result = self._run(
+            _request("2025-06-01", "2025-06-05", order_bys=[order_by], limit=3)
+        )
+
+        self.assertEqual(
+            [row[2] for row in result["rows"]],
+            ["10", "8", "6"],
+            "Rows should be sorted numerically by sessions, descending",
+        )
+        self.assertEqual(result["row_count"], 10)
+
+    def test_ineligible_requests(self):
+        """Tests that reports without a single dated range aren't cached."""
+        no_date = _request()
+        no_date.dimensions = [
+            data_v1beta.Dimension(name="sessionDefaultChannelGroup")
+        ]
+        with_quota = _request(return_property_quota=True)
+
+        self.assertIsNone(self._run(no_date))
+        self.assertIsNone(self._run(with_quota))
+        self.assertEqual(self.api.ranges, [])
+
+    def test_resolve_date(self):
+        """Tests the resolution of relative and absolute dates."""
+        self.assertEqual(report_cache.resolve_date("today", _TODAY), _TODAY)
+        self.assertEqual(
+            report_cache.resolve_date("7daysAgo", _TODAY),
+            datetime.date(2025, 6, 8),
+        )
+        self.assertEqual(
+            report_cache.resolve_date("2025-01-31", _TODAY),
+            datetime.date(2025, 1, 31),
+        )
+        self.assertIsNone(report_cache.resolve_date("lastMonth", _TODAY))
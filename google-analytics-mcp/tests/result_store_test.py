@@ -0,0 +1,84 @@
+# Copyright 2025 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test cases for the result_store module."""
+
+import os
+import tempfile
+import time
+import unittest
+
+from analytics_mcp.tools import result_store
+
+
+class TestResultStore(unittest.TestCase):
+    """Test cases for the result store."""
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.store = result_store.ResultStore(self._directory.name)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _create(self, rows):
+        writer = self.store.create(columns=["date", "sessions"])
+        for i in range(rows):
+            writer.write([f"day{i}", str(i)])
+        return writer.close()
+
+    def test_page(self):
+        """Tests reading slices of a stored result."""
+        handle = self._create(250)
+
+        self.assertEqual(handle["rows"], 250)
+        self.assertEqual(
+            self.store.page(handle["result_id"], 0, 2),
+            [["day0", "0"], ["day1", "1"]],
+        )
+        self.assertEqual(
+            self.store.page(handle["result_id"], 248, 10),
+            [["day248", "248"], ["day249", "249"]],
+            "Last page should stop at the last row",
+        )
+        self.assertEqual(self.store.page(handle["result_id"], 250, 10), [])
+
+    def test_describe(self):
+        """Tests the metadata of a stored result."""
+        handle = self._create(3)
+
+        description = self.store.describe(handle["result_id"])
+
+        self.assertEqual(description["columns"], ["date", "sessions"])
+        self.assertEqual(description["rows"], 3)
+        self.assertGreater(description["expires_in_seconds"], 0)
+
+    def test_unknown_result(self):
+        """Tests that unknown and malformed IDs are rejected."""
+        with self.assertRaises(result_store.ResultNotFoundError):
+            self.store.describe("0" * 32)
+        with self.assertRaises(result_store.ResultNotFoundError):
+            self.store.page("../../etc/passwd", 0, 1)
+
+    def test_expired_results_are_removed(self):
+        """Tests that results past their TTL expire and are cleaned up."""
+        handle = self._create(3)
+        self.store.ttl_seconds = 0
+        time.sleep(0.01)
+
+        with self.assertRaises(result_store.ResultNotFoundError):
+            self.store.describe(handle["result_id"])
+        self.store.cleanup()
+        self.assertEqual(os.listdir(self._directory.name), [])
@@ -29,3 +29,15 @@ class TestUtils(unittest.TestCase):
         from analytics_mcp import server
 
         self.assertIsNotNone(server.mcp, "MCP server instance not initialized")
+
+    def test_create_app_is_stateless(self):
+        """Tests that the HTTP app can be served by several workers."""
+        from analytics_mcp import server
+
+        app = server.create_app()
+
+        self.assertIsNotNone(app, "HTTP app not created")
+        self.assertTrue(
+            server.mcp.settings.stateless_http,
+            "Streamable HTTP app should be stateless",
+        )
@@ -14,11 +14,32 @@
 
 """Test cases for the utils module."""
 
+import os
+import tempfile
 import unittest
 
+from analytics_mcp.tools import result_store
 from analytics_mcp.tools import utils
 
 
+def _report(rows):
+    """Returns a `RunReportResponse` with a date dimension and a metric."""
+    from google.analytics import data_v1beta
+
+    return data_v1beta.RunReportResponse(
+        dimension_headers=[data_v1beta.DimensionHeader(name="date")],
+        metric_headers=[data_v1beta.MetricHeader(name="sessions")],
+        rows=[
+            data_v1beta.Row(
+                dimension_values=[data_v1beta.DimensionValue(value=f"day{i}")],
+                metric_values=[data_v1beta.MetricValue(value=str(i))],
+            )
+            for i in range(rows)
+        ],
+        row_count=rows,
+    )
+
+
 class TestUtils(unittest.TestCase):
     """Test cases for the utils module."""
 
@@ -68,3 +89,52 @@ class TestUtils(unittest.TestCase):
             msg="Resource name with more than 2 components should fail",
         ):
             utils.construct_property_rn("properties/123/abc")
+
+    def test_report_to_dict(self):
+        """Tests that report rows are encoded as lists of values."""
+        result = utils.report_to_dict(_report(3))
+
+        self.assertEqual(result["columns"], ["date", "sessions"])
+        self.assertEqual(
+            result["rows"],
+            [["day0", "0"], ["day1", "1"], ["day2", "2"]],
+            "Rows should list the dimension values, then the metric values",
+        )
+        self.assertEqual(result["row_count"], 3)
+        self.assertNotIn("result", result)
+
+    def test_report_to_dict_spills_large_reports(self):
+        """Tests that rows above the inline budget go to the result store."""
+        with tempfile.TemporaryDirectory() as directory:
+            store = result_store.ResultStore(directory)
+            result = utils.report_to_dict(
+                _report(1000), inline_bytes=1000, store=store
+            )
+            handle = result["result"]
+            spilled = store.page(handle["result_id"], 0, 1000)
+
+        self.assertEqual(handle["rows"], 1000)
+        self.assertEqual(len(spilled), 1000, "All rows should be spilled")
+        self.assertEqual(spilled[999], ["day999", "999"])
+        self.assertLess(len(result["rows"]), 1000)
+        self.assertEqual(result["rows"], spilled[: len(result["rows"])])
+
+    def test_encode_rows_discards_failed_spills(self):
+        """Tests that a spill that fails halfway leaves nothing behind."""
+
+        def rows():
+            for i in range(1000):
+                yield [f"day{i}", str(i)]
+            raise RuntimeError("Broken stream")
+
+        with tempfile.TemporaryDirectory() as directory:
+            store = result_store.ResultStore(directory)
+            with self.assertRaisesRegex(RuntimeError, "Broken stream"):
+                utils.encode_rows(
+                    {"columns": ["date", "sessions"]},
+                    rows(),
+                    inline_bytes=1000,
+                    store=store,
+                )
+
+            self.assertEqual(os.listdir(directory), [])
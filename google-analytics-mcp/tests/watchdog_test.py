@@ -0,0 +1,59 @@
+# Copyright 2025 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the watchdog module."""
+
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+from analytics_mcp import watchdog
+
+
+async def _blocking_tool():
+    time.sleep(0.2)
+
+
+class TestLoopWatchdog(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the event loop watchdog."""
+
+    async def test_reports_blocking_tool(self):
+        """Tests that a blocked loop is logged and attributed to the tool."""
+        dog = watchdog.LoopWatchdog(
+            threshold_ms=50,
+            tool_codes={_blocking_tool.__code__: "blocking_tool"},
+            interval_ms=10,
+        )
+        dog.start()
+        try:
+            await asyncio.sleep(0.05)
+            with self.assertLogs(watchdog._logger, "WARNING") as logs:
+                await _blocking_tool()
+                await asyncio.sleep(0.05)
+        finally:
+            dog.stop()
+
+        self.assertEqual(dog.stalls, 1, "Stall not detected")
+        self.assertIn("tool: blocking_tool", logs.output[0])
+        self.assertIn("time.sleep(0.2)", logs.output[0])
+
+    async def test_disabled_by_default(self):
+        """Tests that nothing is started unless the env enables it."""
+        from analytics_mcp.coordinator import mcp
+
+        with mock.patch.dict(
+            "os.environ", {"ANALYTICS_MCP_LOOP_WATCHDOG_MS": ""}
+        ):
+            self.assertIsNone(watchdog.start_from_env(mcp))
@@ -0,0 +1,189 @@
+# llm/answer_cache.py
+"""Caché de respuestas del chat para preguntas repetidas o casi idénticas.
+
+Dos niveles, ambos acotados (LRU) y con ventana de frescura:
+
+- Resultados de tools: clave exacta (tool + argumentos canónicos). Si el LLM
+  resuelve una pregunta a la misma llamada que otra reciente, se reutiliza el
+  resultado sin volver al servidor MCP. Activo por defecto
+  (`CHAT_MCP_TOOL_RESULT_TTL_S`, 300 s).
+- Respuestas finales (opcional, `CHAT_MCP_ANSWER_CACHE_TTL_S`, desactivado por
+  defecto): la pregunta se normaliza y se busca por similitud de trigramas de
+  caracteres en un índice invertido local. Solo se sirve si la similitud
+  supera `CHAT_MCP_ANSWER_SIMILARITY` y los tokens con dígitos (IDs, fechas,
+  años) coinciden exactamente, para no confundir "org 123" con "org 456". Solo
+  se guardan respuestas que necesitaron alguna tool.
+
+  Cada respuesta se guarda en un ámbito. Si todos los identificadores, nombres
+  y valores con dígitos que usaron sus tools aparecen en la pregunta
+  (`grounded_in_query`), la respuesta no depende de nada más y se comparte
+  entre sesiones. Si no (un seguimiento como "¿y sus campañas?", cuyo
+  `organization_id` viene del contexto de la sesión o del historial), solo se
+  sirve a la misma sesión y con los mismos argumentos recordados
+  (`session_scope`).
+"""
+import os
+import re
+import unicodedata
+from collections.abc import Iterable, Mapping
+from typing import Any, Dict, FrozenSet, Iterator, Optional, Set, Tuple
+from connectors.single_flight import canonical_args
+from connectors.ttl_cache import UNCACHEABLE_TOOLS, TTLCache
+
+DEFAULT_TOOL_RESULT_TTL_SECONDS = 300
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_SIMILARITY = 0.85
+# Ámbito de las respuestas que se pueden servir a cualquier sesión.
+SHARED_SCOPE = ""
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize_query(query: str) -> str:
+    """Minúsculas, sin acentos ni puntuación y con los espacios colapsados."""
+    text = unicodedata.normalize("NFKD", query.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(_WORD.findall(text))
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _key_tokens(text: str) -> FrozenSet[str]:
+    return frozenset(t for t in text.split() if any(c.isdigit() for c in t))
+
+
+def _is_identifier(key: str) -> bool:
+    return key.endswith(("_id", "_ids", "_name")) or key == "name"
+
+
+def _leaves(key: str, value: Any) -> Iterator[Tuple[str, Any]]:
+    """Pares (clave, valor escalar) de unos argumentos, también los de Gemini
+    (`MapComposite`, `RepeatedComposite`)."""
+    if isinstance(value, Mapping):
+        for k, v in value.items():
+            yield from _leaves(k, v)
+    elif isinstance(value, (str, bytes)) or not isinstance(value, Iterable):
+        yield key, value
+    else:
+        for v in value:
+            yield from _leaves(key, v)
+
+
+def grounded_in_query(query: str, args: Dict[str, Any]) -> bool:
+    """True si los argumentos salen de la pregunta: cada token con dígitos de
+    cualquier valor aparece en ella, y los identificadores y nombres sin
+    dígitos también (como texto seguido)."""
+    text = normalize_query(query)
+    tokens = set(text.split())
+    for key, value in _leaves("", args):
+        if value is None or isinstance(value, bool):
+            continue
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        normalized = normalize_query(str(value))
+        if not normalized:
+            continue
+        digits = _key_tokens(normalized)
+        if digits:
+            if not digits <= tokens:
+                return False
+        elif _is_identifier(key) and f" {normalized} " not in f" {text} ":
+            return False
+    return True
+
+
+def session_scope(session_id: str, remembered: Dict[str, Any]) -> str:
+    """Ámbito de las respuestas que dependen de la sesión y de sus argumentos recordados."""
+    return f"{session_id}:{canonical_args(remembered)}"
+
+
+class _AnswerIndex(TTLCache):
+    """LRU de respuestas con índice invertido trigrama -> (ámbito, pregunta)."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, similarity: float):
+        super().__init__(max_entries, ttl_seconds)
+        self.similarity = similarity
+        self._postings: Dict[str, Set[Tuple[str, str]]] = {}
+
+    def search(self, text: str, scopes: Tuple[str, ...]) -> Optional[str]:
+        grams, keys = _trigrams(text), _key_tokens(text)
+        for scope in scopes:
+            exact = self.get((scope, text))
+            if exact is not None:
+                return exact[0]
+        overlap: Dict[Tuple[str, str], int] = {}
+        for gram in grams:
+            for candidate in self._postings.get(gram, ()):
+                if candidate[0] in scopes:
+                    overlap[candidate] = overlap.get(candidate, 0) + 1
+        best, best_score = None, self.similarity
+        for candidate, shared in overlap.items():
+            # Las caducadas se descartan (y se borran) antes de competir.
+            value = self.peek(candidate)
+            if value is None:
+                continue
+            candidate_grams = len(value[1])
+            # Jaccard sobre los conjuntos de trigramas.
+            score = shared / (len(grams) + candidate_grams - shared)
+            if score >= best_score and _key_tokens(candidate[1]) == keys:
+                best, best_score = candidate, score
+        if best is None:
+            return None
+        value = self.get(best)
+        return value[0] if value is not None else None
+
+    def put(self, key: Tuple[str, str], answer: str):
+        self.pop(key)
+        grams = _trigrams(key[1])
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(key)
+        super().put(key, (answer, grams))
+
+    def pop(self, key: Tuple[str, str]) -> Optional[Any]:
+        value = super().pop(key)
+        if value is not None:
+            for gram in value[1]:
+                postings = self._postings.get(gram)
+                if postings is not None:
+                    postings.discard(key)
+                    if not postings:
+                        del self._postings[gram]
+        return value
+
+
+class AnswerCache:
+    def __init__(self, tool_result_ttl: Optional[float] = None, answer_ttl: Optional[float] = None,
+                 max_entries: Optional[int] = None, similarity: Optional[float] = None):
+        tool_result_ttl = float(tool_result_ttl if tool_result_ttl is not None else os.getenv("CHAT_MCP_TOOL_RESULT_TTL_S", DEFAULT_TOOL_RESULT_TTL_SECONDS))
+        answer_ttl = float(answer_ttl if answer_ttl is not None else os.getenv("CHAT_MCP_ANSWER_CACHE_TTL_S", 0))
+        max_entries = int(max_entries or os.getenv("CHAT_MCP_ANSWER_CACHE_SIZE", DEFAULT_MAX_ENTRIES))
+        similarity = float(similarity or os.getenv("CHAT_MCP_ANSWER_SIMILARITY", DEFAULT_SIMILARITY))
+        self.tool_results = TTLCache(max_entries, tool_result_ttl) if tool_result_ttl > 0 else None
+        self.answers = _AnswerIndex(max_entries, answer_ttl, similarity) if answer_ttl > 0 else None
+
+    # ---- Resultados de tools ----
+    def get_tool_result(self, tool_name: str, args: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if self.tool_results is None or tool_name in UNCACHEABLE_TOOLS:
+            return None
+        return self.tool_results.get((tool_name, canonical_args(args)))
+
+    def put_tool_result(self, tool_name: str, args: Dict[str, Any], result: Dict[str, Any]):
+        if self.tool_results is not None and tool_name not in UNCACHEABLE_TOOLS:
+            self.tool_results.put((tool_name, canonical_args(args)), result)
+
+    # ---- Respuestas finales ----
+    def get_answer(self, query: str, scope: str = SHARED_SCOPE) -> Optional[str]:
+        """Respuesta guardada en `scope` o compartida entre sesiones."""
+        if self.answers is None:
+            return None
+        text = normalize_query(query)
+        scopes = (scope, SHARED_SCOPE) if scope != SHARED_SCOPE else (SHARED_SCOPE,)
+        return self.answers.search(text, scopes) if text else None
+
+    def put_answer(self, query: str, answer: str, scope: str = SHARED_SCOPE):
+        text = normalize_query(query)
+        if self.answers is not None and text:
+            self.answers.put((scope, text), answer)
@@ -0,0 +1,126 @@
+# llm/argument_context.py
+"""Argumentos que se arrastran de una llamada a otra dentro de una sesión.
+
+Cuando el usuario pregunta "¿y sus campañas?" después de consultar una
+organización, el LLM suele omitir el `organization_id`. Se recuerda solo lo
+que sirve para eso: los identificadores (`*_id` escalares y `*_ids` listas de
+escalares), nunca fechas (`from_date`, `to_date`), nombres, filtros ni listas
+de dimensiones, aunque la tool los declare obligatorios. Y solo se inyectan en
+las tools cuyo esquema declara esa clave y cuando la llamada no la trae.
+
+Los valores son por sesión (la sesión de Gradio; ver `session`) y caducan a
+los `CHAT_MCP_ARG_CONTEXT_TTL_S` segundos (30 minutos por defecto) desde que
+el LLM los envió por última vez: inyectar un valor no renueva su caducidad,
+así que `remember` recibe los argumentos tal y como los generó el LLM. Las
+claves de cada tool se calculan una vez al registrar el catálogo, así que
+completar una llamada recorre solo los parámetros de esa tool.
+"""
+import os
+import time
+import contextvars
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, Optional, Tuple
+
+DEFAULT_TTL_SECONDS = 1800
+MAX_SESSIONS = 1000
+DEFAULT_SESSION = "default"
+
+_SCALARS = (str, int, float, bool)
+
+_session: contextvars.ContextVar = contextvars.ContextVar("chat_session", default=DEFAULT_SESSION)
+
+
+@contextmanager
+def session(session_id: Optional[str]) -> Iterator[None]:
+    """Marca la sesión del turno en curso (se propaga por los await)."""
+    token = _session.set(session_id or DEFAULT_SESSION)
+    try:
+        yield
+    finally:
+        _session.reset(token)
+
+
+def current_session() -> str:
+    return _session.get()
+
+
+def carry_over_keys(schema: Optional[Dict[str, Any]]) -> FrozenSet[str]:
+    """Parámetros de un esquema de entrada que se pueden arrastrar."""
+    if not schema:
+        return frozenset()
+    properties = schema.get("properties") or {}
+    return frozenset(name for name in properties if name.endswith("_id") or name.endswith("_ids"))
+
+
+def _storable(key: str, value: Any) -> Optional[Any]:
+    """Valor que se puede recordar para `key`, o None.
+
+    Las listas de Gemini llegan como `RepeatedComposite` de proto, no como
+    `list`: se convierten antes de guardarlas.
+    """
+    if key.endswith("_ids"):
+        if isinstance(value, (str, bytes, dict)) or not isinstance(value, Iterable):
+            return None
+        values = list(value)
+        return values if values and all(isinstance(v, _SCALARS) for v in values) else None
+    return value if isinstance(value, _SCALARS) else None
+
+
+class ArgumentContext:
+    def __init__(self, defaults: Optional[Dict[str, Any]] = None, ttl_seconds: Optional[float] = None):
+        # Valores fijos para todas las sesiones (el antiguo `session_context`).
+        self.defaults = defaults if defaults is not None else {}
+        self.ttl_seconds = float(ttl_seconds if ttl_seconds is not None else os.getenv("CHAT_MCP_ARG_CONTEXT_TTL_S", DEFAULT_TTL_SECONDS))
+        self._tool_keys: Dict[str, FrozenSet[str]] = {}
+        # sesión -> clave -> (valor, caduca en)
+        self._sessions: "OrderedDict[str, Dict[str, Tuple[Any, float]]]" = OrderedDict()
+
+    def index_tools(self, tools: Iterable[Any]):
+        for tool in tools:
+            self._tool_keys[tool.name] = carry_over_keys(getattr(tool, "inputSchema", None))
+
+    def merge(self, tool_name: str, args: Dict[str, Any], session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Completa `args` con los valores recordados que la tool declara."""
+        keys = self._tool_keys.get(tool_name)
+        if not keys:
+            return args
+        values = self._sessions.get(session_id or current_session(), {})
+        now = time.monotonic()
+        merged = dict(args)
+        for key in keys:
+            if key in merged:
+                continue
+            entry = values.get(key)
+            if entry is not None and entry[1] > now:
+                merged[key] = entry[0]
+            elif key in self.defaults:
+                merged[key] = self.defaults[key]
+        return merged
+
+    def remember(self, tool_name: str, args: Dict[str, Any], session_id: Optional[str] = None):
+        """Guarda los identificadores de `args`, los que envió el LLM (antes de `merge`)."""
+        keys = self._tool_keys.get(tool_name)
+        if not keys:
+            return
+        session_id = session_id or current_session()
+        values = self._sessions.get(session_id)
+        if values is None:
+            values = self._sessions[session_id] = {}
+            while len(self._sessions) > MAX_SESSIONS:
+                self._sessions.popitem(last=False)
+        self._sessions.move_to_end(session_id)
+        expires = time.monotonic() + self.ttl_seconds
+        for key in keys:
+            value = _storable(key, args.get(key))
+            if value is not None:
+                values[key] = (value, expires)
+
+    def remembered(self, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Valores vigentes de la sesión (sin los `defaults`, que son comunes)."""
+        now = time.monotonic()
+        values = self._sessions.get(session_id or current_session(), {})
+        return {key: value for key, (value, expires) in values.items() if expires > now}
+
+    def forget(self, session_id: Optional[str] = None):
+        self._sessions.pop(session_id or current_session(), None)
@@ -1,33 +1,71 @@
 # llm/base.py
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Any, Callable, List, Dict
+from llm.argument_context import ArgumentContext
 
 class LLMClient(ABC):
     """Estrategia de LLM intercambiable (Gemini, Claude, GPT, etc.)."""
 
+    # Clave de las declaraciones convertidas en la caché de herramientas.
+    provider = "generic"
+
     def __init__(self, connectors: List[Any] = None, conversation_history: List[Any] = None, session_context: Dict[str, Any] = None):
         """Inicializa el cliente LLM con conectores opcionales."""
         self.connectors = connectors or []
         self.sessions = {}  
         self.tools_map = {} 
+        self.declarations_map = {}
         self.conversation_history = conversation_history or []
         self.session_context = session_context or {}
+        # Argumentos arrastrados entre llamadas, por sesión y según el esquema de cada tool.
+        self.argument_context = ArgumentContext(defaults=self.session_context)
+        self._background_tasks = set()
 
     @abstractmethod
     async def process_query(self, query: str) -> str:
         """Procesa un query y devuelve la respuesta generada."""
         raise NotImplementedError
 
+    def convert_tools(self, tools: List[Any]) -> List[Any]:
+        """Convierte las tools MCP al formato de declaraciones del LLM."""
+        return tools
+
+    def _register_tools(self, connector, tools: List[Any], declarations: List[Any] = None):
+        self.tools_map[connector.name] = tools
+        self.argument_context.index_tools(tools)
+        self.declarations_map[connector.name] = declarations if declarations is not None else self.convert_tools(tools)
+
+    async def _connect(self, connector, cached=None, connecting=None):
+        try:
+            session = await (connecting or connector.connect_to_server())
+            self.sessions[connector.name] = session
+
+            tools = await connector.list_tools()
+            live_names = [t.name for t in tools]
+            if cached and [t.name for t in cached["tools"]] != live_names:
+                print(f"🔄 {connector.name}: catálogo de herramientas actualizado: {live_names}")
+            self._register_tools(connector, tools)
+            connector.save_cached_tools({self.provider: self.declarations_map[connector.name]})
+        except Exception as e:
+            print(f"⚠️ Error inicializando conector {connector.name}: {e}")
+
     async def connect_to_servers(self):
-        """Inicializa todos los MCPs y almacena sus tools."""
-        for connector in self.connectors:
-            try:
-                session = await connector.connect_to_server()
-                self.sessions[connector.name] = session
+        """Inicializa todos los MCPs y almacena sus tools.
 
-                tools = await connector.list_tools()
-                self.tools_map[connector.name] = tools
-            except Exception as e:
-                print(f"⚠️ Error inicializando conector {connector.name}: {e}")
+        Los conectores con catálogo en caché registran sus tools al instante y
+        se conectan en segundo plano; al llegar la lista real se reconcilia.
+        """
+        pending = []
+        for connector in self.connectors:
+            cached = connector.load_cached_tools()
+            if cached:
+                self._register_tools(connector, cached["tools"], cached["declarations"].get(self.provider))
+                task = asyncio.create_task(self._connect(connector, cached, connector.connect_in_background()))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
+            else:
+                pending.append(self._connect(connector))
 
-        return self.tools_map
\ No newline at end of file
+        await asyncio.gather(*pending)
+        return self.tools_map
@@ -0,0 +1,82 @@
+# llm/fake_llm.py
+import os
+import json
+import time
+import asyncio
+import itertools
+from typing import Any, Dict, List, Optional
+from llm.argument_context import current_session
+from llm.base import LLMClient
+from observability import loop_watchdog
+
+
+class ScriptedLLM(LLMClient):
+    """LLM falso para pruebas de carga: no necesita GEMINI_API_KEY.
+
+    Cada turno toma el siguiente paso del guion (en bucle) y simula el mismo
+    recorrido que `GeminiLLM`: una llamada al LLM, las function calls del paso
+    contra los conectores reales y una segunda llamada al LLM con el resultado.
+
+    Un guion es una lista de pasos:
+        [{"calls": [{"name": "get_organization", "args": {"organization_id": "1"}}],
+          "answer": "Texto de respuesta"}]
+
+    `latency_ms` simula cada llamada al LLM. Con `blocking=True` se simula con
+    `time.sleep`, igual que el `generate_content` síncrono de Gemini bloquea el
+    event loop; si no, con `asyncio.sleep`.
+    """
+
+    provider = "scripted"
+
+    def __init__(self, connectors: List[Any] = None, script: Optional[List[Dict[str, Any]]] = None,
+                 latency_ms: Optional[float] = None, blocking: Optional[bool] = None, **kwargs):
+        super().__init__(connectors, **kwargs)
+        if script is None:
+            script_path = os.getenv("FAKE_LLM_SCRIPT")
+            script = json.load(open(script_path, encoding="utf-8")) if script_path else [{"calls": [], "answer": "OK"}]
+        self.set_script(script)
+        self.latency_ms = latency_ms if latency_ms is not None else float(os.getenv("FAKE_LLM_LATENCY_MS", "0"))
+        self.blocking = blocking if blocking is not None else os.getenv("FAKE_LLM_BLOCKING", "1") == "1"
+
+    def convert_tools(self, tools: List[Any]) -> List[Dict[str, Any]]:
+        # Declaraciones mínimas (serializables en la caché de herramientas).
+        return [{"name": t.name} for t in tools]
+
+    def set_script(self, script: List[Dict[str, Any]]):
+        self.script = script
+        self._steps = itertools.cycle(script)
+
+    async def _llm_call(self):
+        if not self.latency_ms:
+            return
+        with loop_watchdog.attribute(f"llm:{self.provider}"):
+            if self.blocking:
+                time.sleep(self.latency_ms / 1000)
+            else:
+                await asyncio.sleep(self.latency_ms / 1000)
+
+    def _find_connector(self, tool_name: str):
+        for connector in self.connectors:
+            if any(t.name == tool_name for t in self.tools_map.get(connector.name, [])):
+                return connector
+        return None
+
+    async def process_query(self, query: str) -> str:
+        self.conversation_history.append({"role": "user", "parts": [{"text": query}]})
+        step = next(self._steps)
+        try:
+            await self._llm_call()
+            final_parts = []
+            for call in step.get("calls", []):
+                connector = self._find_connector(call["name"])
+                if not connector:
+                    final_parts.append(f"⚠️ No se encontró conector para la función {call['name']}")
+                    continue
+                await connector.execute(call["name"], dict(call.get("args", {})), session_id=current_session())
+                await self._llm_call()
+            final_parts.append(step.get("answer", "OK"))
+            answer = "\n".join(final_parts)
+            self.conversation_history.append({"role": "model", "parts": [{"text": answer}]})
+            return answer
+        except Exception as e:
+            return f"Error: {str(e)}"
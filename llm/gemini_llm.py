@@ -1,15 +1,22 @@
 # llm/gemini_llm.py
 
 import os
-import json
+import time
 from typing import Any, Dict, List
 import google.generativeai as genai
+from llm.answer_cache import SHARED_SCOPE, AnswerCache, grounded_in_query, session_scope
+from llm.argument_context import current_session
 from llm.base import LLMClient
-from tools.tool_converter import clean_schema_for_gemini
+from llm.tool_router import ToolRouter
+from observability import loop_watchdog, metrics, tracing
+from tools import fast_json
+from tools.tool_converter import convert_mcp_tools_to_gemini
 from google.protobuf.struct_pb2 import Struct
 
 
 class GeminiLLM(LLMClient):
+    provider = "gemini"
+
     def __init__(self, connectors: List[Any] = None, conversation_history: List[Any] = None, session_context: Dict[str, Any] = None):
         super().__init__(connectors, conversation_history, session_context)
         api_key = os.getenv("GEMINI_API_KEY")
@@ -17,56 +24,71 @@ class GeminiLLM(LLMClient):
             raise RuntimeError("❌ GEMINI_API_KEY no configurado")
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(os.getenv("GEMINI_MODEL", "gemini-1.5-turbo"))
+        self.answer_cache = AnswerCache()
+        self.tool_router = ToolRouter()
 
     def convert_mcp_tools_to_gemini(self, mcp_tools: List) -> List[Dict]:
-            gemini_tools = []
-            for tool in mcp_tools:
-                function_declaration = {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "parameters": {"type": "object", "properties": {}, "required": []}
-                }
-                if hasattr(tool, 'inputSchema') and tool.inputSchema:
-                    schema = clean_schema_for_gemini(tool.inputSchema)
-                    if "properties" in schema:
-                        cleaned_props = {}
-                        for prop_name, prop_schema in schema["properties"].items():
-                            cleaned_prop = {}
-                            if isinstance(prop_schema, dict):
-                                if "type" in prop_schema:
-                                    cleaned_prop["type"] = prop_schema["type"]
-                                if "description" in prop_schema:
-                                    cleaned_prop["description"] = prop_schema["description"]
-                                if "enum" in prop_schema:
-                                    cleaned_prop["enum"] = prop_schema["enum"]
-                                if prop_schema.get("type") == "array":
-                                    cleaned_prop["items"] = prop_schema.get("items", {"type": "string"})
-                            cleaned_props[prop_name] = cleaned_prop
-                        function_declaration["parameters"]["properties"] = cleaned_props
-                    if "required" in schema:
-                        function_declaration["parameters"]["required"] = schema["required"]
-                gemini_tools.append({"function_declarations": [function_declaration]})
-            return gemini_tools
+        return convert_mcp_tools_to_gemini(mcp_tools)
+
+    def convert_tools(self, tools: List) -> List[Dict]:
+        return self.convert_mcp_tools_to_gemini(tools)
 
     def _normalize_tool_result(self, result):
         if isinstance(result, dict):
             return result
 
+        # FastMCP ya manda el resultado estructurado: se usa tal cual, sin
+        # volver a parsear el texto (que es el mismo JSON con indentación).
+        structured = getattr(result, "structuredContent", None)
+        if structured:
+            value = structured["result"] if len(structured) == 1 and "result" in structured else structured
+            return value if isinstance(value, dict) else {"result": value}
+
         if hasattr(result, "content") and result.content:
             for c in result.content:
                 if hasattr(c, "text") and c.text:
                     try:
-                        return json.loads(c.text)
-                    except Exception:
+                        value = fast_json.loads(c.text)
+                    except fast_json.JSONDecodeError:
                         return {"data": c.text}
-
-        if hasattr(result, "structuredContent") and result.structuredContent:
-            return result.structuredContent.get("result")
+                    return value if isinstance(value, dict) else {"result": value}
 
         return {"data": str(result)}
 
 
+    def _generate(self, contents: List[Any], **kwargs) -> Any:
+        model = self.model.model_name
+        started = time.perf_counter()
+        try:
+            with tracing.span("llm.generate_content", model=model, messages=len(contents), tools=len(kwargs.get("tools") or [])), \
+                    loop_watchdog.attribute(f"llm:{model}"):
+                return self.model.generate_content(contents, **kwargs)
+        except Exception:
+            metrics.LLM_ERRORS.inc(model=model)
+            raise
+        finally:
+            metrics.LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, model=model)
+
     async def process_query(self, query: str) -> str:
+        with tracing.span("chat.turn", history=len(self.conversation_history)) as span:
+            # Lo que no sale de la pregunta sale del contexto de la sesión: forma parte de la clave
+            scope = session_scope(current_session(), self.argument_context.remembered())
+            if self.answer_cache.answers is not None:
+                cached = self.answer_cache.get_answer(query, scope)
+                metrics.record_cache("answer", cached is not None)
+                span.set_attribute("answer_cache_hit", cached is not None)
+                if cached is not None:
+                    self.conversation_history.append({"role": "user", "parts": [{"text": query}]})
+                    self.conversation_history.append({"role": "model", "parts": [{"text": cached}]})
+                    return cached
+            turn = {"tool_calls": 0, "grounded": True}
+            answer = await self._process_query(query, turn)
+            if turn["tool_calls"] and not answer.startswith("Error:") and "⚠️" not in answer:
+                self.answer_cache.put_answer(query, answer, SHARED_SCOPE if turn["grounded"] else scope)
+            span.set_attribute("answer_chars", len(answer))
+            return answer
+
+    async def _process_query(self, query: str, turn: Dict[str, Any] = None) -> str:
         # Agregar mensaje del usuario al historial
         self.conversation_history.append({"role": "user", "parts": [{"text": query}]})
 
@@ -74,21 +96,21 @@ class GeminiLLM(LLMClient):
         all_gemini_tools = []
         tool_connector_map = {}
         for connector_name, tools in self.tools_map.items():
-            gemini_tools = self.convert_mcp_tools_to_gemini(tools)
-            all_gemini_tools.extend(gemini_tools)
+            all_gemini_tools.extend(self.declarations_map.get(connector_name, []))
             for t in tools:
                 tool_connector_map[t.name] = connector_name
 
         try:
             # Generar respuesta considerando el historial
             if all_gemini_tools:
-                response = self.model.generate_content(
+                # Solo las tools relevantes para la pregunta (o todas si no encaja ninguna)
+                response = self._generate(
                     self.conversation_history,
-                    tools=all_gemini_tools,
+                    tools=self.tool_router.select(query, all_gemini_tools),
                     tool_config={'function_calling_config': {'mode': 'AUTO'}}
                 )
             else:
-                response = self.model.generate_content(self.conversation_history)
+                response = self._generate(self.conversation_history)
 
             if response.candidates and response.candidates[0].content.parts:
                 parts = response.candidates[0].content.parts
@@ -99,13 +121,14 @@ class GeminiLLM(LLMClient):
                         fc = part.function_call
                         args = dict(fc.args) if hasattr(fc, 'args') else {}
 
-                        for k, v in self.session_context.items():
-                            if k not in args:
-                                args[k] = v
-
-                        for k, v in args.items():
-                            self.session_context[k] = v
+                        # Completar solo con los argumentos recordados que la tool declara;
+                        # se recuerda lo que envió el LLM, así lo inyectado no renueva su caducidad.
+                        self.argument_context.remember(fc.name, args)
+                        args = self.argument_context.merge(fc.name, args)
+                        if turn is not None and not grounded_in_query(query, args):
+                            turn["grounded"] = False
 
+                        self.tool_router.note_used(fc.name)
                         connector_name = tool_connector_map.get(fc.name)
                         if not connector_name:
                             final_parts.append(f"⚠️ No se encontró conector para la función {fc.name}")
@@ -116,16 +139,28 @@ class GeminiLLM(LLMClient):
                             final_parts.append(f"⚠️ No se encontró instancia del conector {connector_name}")
                             continue
 
-                        # Ejecutar herramienta y normalizar resultado
-                        tool_result_raw = await connector.execute(fc.name, args)
-                        tool_result = self._normalize_tool_result(tool_result_raw)
-
-                        args_struct = Struct()
-                        args_struct.update(args)
-
-                            # Convertir response a Struct
-                        resp_struct = Struct()
-                        resp_struct.update(tool_result)
+                        with tracing.span("tool.dispatch", connector=connector_name, tool=fc.name), \
+                                loop_watchdog.attribute(f"tool:{connector_name}/{fc.name}"):
+                            # Ejecutar herramienta y normalizar resultado (o reutilizar uno reciente)
+                            tool_result = self.answer_cache.get_tool_result(fc.name, args)
+                            if self.answer_cache.tool_results is not None:
+                                metrics.record_cache("tool_result", tool_result is not None)
+                            if tool_result is None:
+                                tool_result_raw = await connector.execute(fc.name, args, session_id=current_session())
+                                with tracing.span("tool.normalize", tool=fc.name):
+                                    tool_result = self._normalize_tool_result(tool_result_raw)
+                                if not getattr(tool_result_raw, "isError", False):
+                                    self.answer_cache.put_tool_result(fc.name, args, tool_result)
+                            if turn is not None:
+                                turn["tool_calls"] += 1
+
+                            with tracing.span("tool.struct_conversion", tool=fc.name):
+                                args_struct = Struct()
+                                args_struct.update(args)
+
+                                # Convertir response a Struct
+                                resp_struct = Struct()
+                                resp_struct.update(tool_result)
 
 
                         follow_up = self.conversation_history + [
@@ -143,7 +178,7 @@ class GeminiLLM(LLMClient):
                                 }
                             }]}
                         ]
-                        final = self.model.generate_content(follow_up)
+                        final = self._generate(follow_up)
                         if final.text:
                             final_parts.append(final.text)
                             self.conversation_history.append({"role": "model", "parts": [{"text": final.text}]})
@@ -0,0 +1,203 @@
+# llm/tool_router.py
+"""Selección local de las tools relevantes para cada pregunta.
+
+Mandar el catálogo completo en cada `generate_content` cuesta varios miles de
+tokens (solo las pistas de `run_report` y `run_realtime_report` ocupan ~14 KB
+cada una). El router indexa el nombre y la descripción de cada tool con BM25
+sobre prefijos de palabras (así "campaña" y "campaigns" comparten "campa") y un
+pequeño diccionario español -> inglés, y envía solo las `top_k` mejores
+(descartando las que quedan muy por debajo de la primera).
+
+Si ninguna tool alcanza `min_score` (preguntas de seguimiento como "¿y el mes
+anterior?", saludos...) se manda el catálogo completo. Las tools llamadas en
+los últimos turnos de la misma sesión (ver `llm.argument_context.session`) se
+incluyen siempre, para que las preguntas encadenadas sigan teniendo a mano la
+tool que estaban usando.
+
+Se configura con `CHAT_MCP_TOOL_ROUTER_TOP_K` (6 por defecto, `0` lo
+desactiva) y `CHAT_MCP_TOOL_ROUTER_MIN_SCORE`.
+"""
+import os
+import re
+import math
+from collections import Counter, OrderedDict, deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from llm.answer_cache import normalize_query
+from llm.argument_context import MAX_SESSIONS, current_session
+
+DEFAULT_TOP_K = 6
+DEFAULT_MIN_SCORE = 2.0
+# Se descartan las tools con menos de esta fracción de la mejor puntuación.
+RELATIVE_CUTOFF = 0.3
+# Tools llamadas recientemente que se mantienen en la selección.
+RECENT_TOOLS = 4
+# Peso de las palabras del nombre frente a las de la descripción.
+NAME_WEIGHT = 3
+STEM_LENGTH = 5
+
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+_CAMEL = re.compile(r"(?<=[a-z])(?=[A-Z])")
+
+# Palabras frecuentes de las preguntas (en español) y su equivalente en las
+# descripciones de las tools (en inglés).
+SYNONYMS = {
+    "gasto": "spend cost media entries aggregate",
+    "gastos": "spend cost media entries aggregate",
+    "inversion": "spend cost media entries aggregate",
+    "presupuesto": "budget media entries",
+    "informe": "report",
+    "reporte": "report",
+    "tiempo": "realtime",
+    "ahora": "realtime",
+    "vivo": "realtime",
+    "propiedad": "property",
+    "propiedades": "property properties",
+    "cuenta": "account",
+    "cuentas": "account accounts",
+    "usuarios": "users report",
+    "sesiones": "sessions report",
+    "visitas": "sessions report",
+    "trafico": "traffic report",
+    "paginas": "pages report",
+    "metricas": "metrics",
+    "dimensiones": "dimensions",
+    "personalizadas": "custom",
+    "filiales": "subsidiaries",
+    "subsidiarias": "subsidiaries",
+    "socios": "partners",
+    "resumen": "overview",
+    "panorama": "overview",
+    "jerarquia": "hierarchy tree",
+    "arbol": "hierarchy tree",
+    "nombre": "name find",
+    "llama": "name find",
+    "vehiculos": "vehicles",
+    "medios": "media mediatypes",
+    "medio": "media mediatypes",
+    "campos": "fields",
+    "campo": "field",
+    "entradas": "entries",
+    "anuncios": "ads",
+    "enlaces": "links",
+    "detalle": "details",
+    "detalles": "details",
+    "filtro": "filter hints",
+    "filtrar": "filter hints",
+    "ordenar": "order hints",
+    "ordenado": "order hints",
+    "resultado": "result",
+    "pagina": "page",
+    "siguiente": "page result",
+    "mas": "page result",
+}
+
+_STOPWORDS = frozenset(
+    "the and for are with this that from you your any all get returns list "
+    "los las del que por para con una como sus mas cual cuales cuanto cuantos fue han".split()
+)
+
+
+def _tokens(text: str) -> List[str]:
+    words = normalize_query(_CAMEL.sub(" ", text).replace("_", " ")).split()
+    return [w[:STEM_LENGTH] for w in words if len(w) > 2 and w not in _STOPWORDS and not w.isdigit()]
+
+
+def _query_tokens(query: str) -> List[str]:
+    words = normalize_query(query).split()
+    expanded = " ".join([query] + [SYNONYMS[w] for w in words if w in SYNONYMS])
+    return _tokens(expanded)
+
+
+def _declaration(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Declaración de Gemini dentro de `{"function_declarations": [...]}`."""
+    return entry["function_declarations"][0] if "function_declarations" in entry else entry
+
+
+class ToolRouter:
+    def __init__(self, top_k: Optional[int] = None, min_score: Optional[float] = None):
+        self.top_k = int(top_k if top_k is not None else os.getenv("CHAT_MCP_TOOL_ROUTER_TOP_K", DEFAULT_TOP_K))
+        self.min_score = float(min_score if min_score is not None else os.getenv("CHAT_MCP_TOOL_ROUTER_MIN_SCORE", DEFAULT_MIN_SCORE))
+        # sesión -> tools llamadas en sus últimos turnos
+        self._recent: "OrderedDict[str, deque]" = OrderedDict()
+        self._catalog: Tuple[str, ...] = ()
+        # (nombre, descripción) de cada tool indexada: el índice se rehace si cambia cualquiera.
+        self._signature: Tuple[Tuple[str, str], ...] = ()
+        self._docs: List[Counter] = []
+        self._lengths: List[int] = []
+        self._idf: Dict[str, float] = {}
+        self._avg_length = 1.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.top_k > 0
+
+    def recent(self, session_id: Optional[str] = None) -> Tuple[str, ...]:
+        return tuple(self._recent.get(session_id or current_session(), ()))
+
+    def note_used(self, tool_name: str, session_id: Optional[str] = None):
+        session_id = session_id or current_session()
+        recent = self._recent.get(session_id)
+        if recent is None:
+            recent = self._recent[session_id] = deque(maxlen=RECENT_TOOLS)
+            while len(self._recent) > MAX_SESSIONS:
+                self._recent.popitem(last=False)
+        self._recent.move_to_end(session_id)
+        if tool_name in recent:
+            recent.remove(tool_name)
+        recent.append(tool_name)
+
+    def _index(self, declarations: List[Dict[str, Any]]):
+        # Comparar las mismas cadenas es casi gratis (primero se compara la identidad).
+        signature = tuple((decl["name"], decl.get("description") or "") for decl in map(_declaration, declarations))
+        if signature == self._signature:
+            return
+        self._signature = signature
+        self._catalog = tuple(name for name, _ in signature)
+        self._docs = []
+        for d in declarations:
+            decl = _declaration(d)
+            doc = Counter(_tokens(decl.get("description") or ""))
+            for token in _tokens(decl["name"]):
+                doc[token] += NAME_WEIGHT
+            self._docs.append(doc)
+        self._lengths = [sum(doc.values()) for doc in self._docs]
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 1.0
+        df = Counter(token for doc in self._docs for token in doc)
+        n = len(self._docs)
+        self._idf = {t: math.log(1 + (n - f + 0.5) / (f + 0.5)) for t, f in df.items()}
+
+    def scores(self, query: str, declarations: List[Dict[str, Any]]) -> List[float]:
+        self._index(declarations)
+        terms = set(_query_tokens(query))
+        scores = []
+        for doc, length in zip(self._docs, self._lengths):
+            score = 0.0
+            norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * length / self._avg_length)
+            for term in terms:
+                tf = doc.get(term)
+                if tf:
+                    score += self._idf[term] * tf * (_BM25_K1 + 1) / (tf + norm)
+            scores.append(score)
+        return scores
+
+    def select(self, query: str, declarations: List[Dict[str, Any]], session_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Devuelve las declaraciones a enviar: las `top_k` mejores más las
+        usadas recientemente en la sesión, o todas si la pregunta no encaja
+        con ninguna."""
+        if not self.enabled or len(declarations) <= self.top_k:
+            return declarations
+        scores = self.scores(query, declarations)
+        ranked = sorted(range(len(declarations)), key=lambda i: scores[i], reverse=True)
+        if scores[ranked[0]] < self.min_score:
+            return declarations
+        cutoff = scores[ranked[0]] * RELATIVE_CUTOFF
+        chosen = {i for i in ranked[:self.top_k] if scores[i] >= cutoff}
+        recent = self.recent(session_id)
+        chosen.update(i for i, name in enumerate(self._catalog) if name in recent)
+        return [declarations[i] for i in sorted(chosen)]
+
+
+def catalog_names(declarations: Iterable[Dict[str, Any]]) -> List[str]:
+    return [_declaration(d)["name"] for d in declarations]
@@ -1,39 +1,110 @@
-# main.py
 import asyncio
 import os
+import time
 import gradio as gr
+import uvicorn
+from fastapi import FastAPI, Response
 from connectors.ga4_connector import GA4Connector
 from connectors.camphouse_connector import CamphouseConnector
-from llm.gemini_llm import GeminiLLM
+from llm import argument_context
+from observability import loop_watchdog, metrics
 
 
-llm_client = GeminiLLM(connectors=[
-    GA4Connector(),
-    CamphouseConnector(),
-])
+def build_llm_client():
+    """Elige el LLM con `LLM_PROVIDER`: "gemini" (por defecto) o "fake" para
+    pruebas de carga sin API key (ver `llm/fake_llm.py`)."""
+    connectors = [
+        GA4Connector(),
+        CamphouseConnector(),
+    ]
+    provider = os.getenv("LLM_PROVIDER", "gemini").lower()
+    if provider == "fake":
+        from llm.fake_llm import ScriptedLLM
+        return ScriptedLLM(connectors=connectors)
+    from llm.gemini_llm import GeminiLLM
+    return GeminiLLM(connectors=connectors)
+
+
+llm_client = build_llm_client()
+
+# Sesiones de Gradio con algún turno en los últimos CHAT_MCP_SESSION_IDLE_S segundos
+sessions = metrics.SessionTracker(float(os.getenv("CHAT_MCP_SESSION_IDLE_S", "1800")))
 
 async def init_client():
     await llm_client.connect_to_servers()
 
 
-async def run():
-    async def handler(msg, hist):
+async def handler(msg, hist, request: gr.Request = None):
+    session_id = getattr(request, "session_hash", None)
+    sessions.touch(session_id or argument_context.DEFAULT_SESSION)
+    metrics.CHAT_ACTIVE_TURNS.inc()
+    started = time.perf_counter()
+    try:
         if not llm_client.tools_map:
             try:
                 await init_client()
             except Exception as e:
                 return f"⚠️ Error conectando a los MCP servers: {e}"
 
-        return await llm_client.process_query(msg)
+        # Los argumentos recordados (IDs de propiedad, organización...) son por sesión de Gradio
+        with argument_context.session(session_id):
+            return await llm_client.process_query(msg)
+    finally:
+        metrics.CHAT_TURN_SECONDS.observe(time.perf_counter() - started)
+        metrics.CHAT_ACTIVE_TURNS.dec()
+
+
+def _pool_sessions():
+    for c in llm_client.connectors:
+        yield (c.name,), c.pool.size
+
+
+def _pool_queue_depth():
+    for c in llm_client.connectors:
+        yield (c.name,), c.pool.queue_depth
+
+
+def _active_sessions():
+    yield (), sessions.active()
 
-    gr.ChatInterface(
+
+def _history_messages():
+    yield (), len(llm_client.conversation_history)
+
+
+metrics.REGISTRY.register(metrics.CallbackGauge(
+    "mcp_pool_sessions", "Sesiones MCP activas por conector.", ["connector"], _pool_sessions))
+metrics.REGISTRY.register(metrics.CallbackGauge(
+    "mcp_pool_queue_depth", "Llamadas MCP en curso por conector.", ["connector"], _pool_queue_depth))
+metrics.REGISTRY.register(metrics.CallbackGauge(
+    "chat_active_sessions", "Sesiones del chat con actividad reciente (CHAT_MCP_SESSION_IDLE_S).", [], _active_sessions))
+metrics.REGISTRY.register(metrics.CallbackGauge(
+    "chat_history_messages", "Mensajes en el historial de la conversación.", [], _history_messages))
+
+
+def build_app() -> FastAPI:
+    demo = gr.ChatInterface(
         fn=handler,
         title="Multi-MCP Chat",
         description="Interfaz para interactuar con LLM y múltiples MCP tools",
-    ).launch(
-        server_name="0.0.0.0",
-        server_port=int(os.environ.get("PORT", 8080)),
     )
+    app = FastAPI()
+
+    @app.get("/metrics")
+    def metrics_endpoint():
+        return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+    return gr.mount_gradio_app(app, demo, path="")
+
+
+async def run():
+    loop_watchdog.start_from_env()
+    config = uvicorn.Config(
+        build_app(),
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", 8080)),
+    )
+    await uvicorn.Server(config).serve()
 
 
 def main():
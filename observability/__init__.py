@@ -0,0 +1,4 @@
+from . import tracing
+
+from . import metrics
+from . import loop_watchdog
@@ -0,0 +1,147 @@
+# observability/loop_watchdog.py
+"""Detector opcional de bloqueos del event loop.
+
+Se activa con `CHAT_MCP_LOOP_WATCHDOG_MS=<umbral en ms>` en el chat y en el
+servidor MCP de Camphouse. Un latido dentro del loop actualiza una marca de
+tiempo; un hilo aparte la vigila y, si el loop lleva más de `threshold_ms` sin
+despertar, hay código síncrono bloqueándolo (el `generate_content` de Gemini,
+un `Struct.update` enorme, una tool síncrona de FastMCP...). En ese momento se
+vuelca en stderr la pila del hilo del loop y se atribuye el bloqueo a:
+
+  - la tool de un servidor FastMCP cuyo código aparece en la pila
+    (`watch_fastmcp`), o
+  - la etiqueta activa en la tarea en curso (`attribute("llm:gemini-...")`).
+
+El retraso de cada latido va a `event_loop_lag_seconds` y cada bloqueo a
+`event_loop_stalls_total{source}`. Desactivado, `attribute` no cuesta nada.
+"""
+import os
+import sys
+import time
+import asyncio
+import threading
+import traceback
+from contextlib import contextmanager
+from types import CodeType
+from typing import Any, Dict, Iterator, List, Optional
+from observability import metrics
+
+# Frames de la pila que se vuelcan por bloqueo (los más internos).
+STACK_DEPTH = 25
+
+_task_labels: Dict[Optional[asyncio.Task], List[str]] = {}
+_code_labels: Dict[CodeType, str] = {}
+_watchdog: Optional["LoopWatchdog"] = None
+
+
+@contextmanager
+def attribute(label: str) -> Iterator[None]:
+    """Etiqueta el trabajo de la tarea actual para atribuirle los bloqueos."""
+    if _watchdog is None:
+        yield
+        return
+    labels = _task_labels.setdefault(asyncio.current_task(), [])
+    labels.append(label)
+    try:
+        yield
+    finally:
+        labels.pop()
+        if not labels:
+            _task_labels.pop(asyncio.current_task(), None)
+
+
+def watch_fastmcp(server: Any):
+    """Atribuye a cada tool de un servidor FastMCP los bloqueos de su código."""
+    for tool in server._tool_manager.list_tools():
+        _code_labels[tool.fn.__code__] = f"tool:{tool.name}"
+
+
+class LoopWatchdog:
+    def __init__(self, threshold_ms: float, interval_ms: Optional[float] = None, stream=None):
+        self.threshold = threshold_ms / 1000
+        self.interval = (interval_ms if interval_ms is not None else max(threshold_ms / 4, 5)) / 1000
+        self.stream = stream or sys.stderr
+        self.stalls = 0
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._heartbeat = time.monotonic()
+        self._stop = threading.Event()
+        self._beat_task: Optional[asyncio.Task] = None
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> "LoopWatchdog":
+        """Arranca el latido y el hilo vigía; se llama desde el hilo del loop."""
+        self.loop = loop or asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._beat_task = self.loop.create_task(self._beat(), name="loop-watchdog-beat")
+        threading.Thread(target=self._watch, name="loop-watchdog", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._beat_task and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._beat_task.cancel)
+
+    async def _beat(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            metrics.EVENT_LOOP_LAG_SECONDS.observe(max(0.0, now - expected))
+            self._heartbeat = now
+
+    def _watch(self):
+        stalled_at = None
+        while not self._stop.wait(self.interval / 2):
+            if self.loop.is_closed():
+                return
+            if not self.loop.is_running():
+                continue
+            beat = self._heartbeat
+            blocked = time.monotonic() - beat - self.interval
+            if stalled_at is None and blocked > self.threshold:
+                stalled_at = beat
+                self._report(blocked)
+            elif stalled_at is not None and beat != stalled_at:
+                self._write(f"🐢 Event loop libre tras {(beat - stalled_at - self.interval) * 1000:.0f}ms\n")
+                stalled_at = None
+
+    def _attribution(self, frame) -> str:
+        f = frame
+        while f is not None:
+            label = _code_labels.get(f.f_code)
+            if label:
+                return label
+            f = f.f_back
+        labels = list(_task_labels.get(asyncio.current_task(self.loop)) or [])
+        return labels[-1] if labels else "desconocido"
+
+    def _report(self, blocked: float):
+        frame = sys._current_frames().get(self._loop_thread)
+        source = self._attribution(frame)
+        self.stalls += 1
+        metrics.EVENT_LOOP_STALLS.inc(source=source)
+        stack = "".join(traceback.format_stack(frame, limit=STACK_DEPTH)) if frame else ""
+        self._write(f"🐢 Event loop bloqueado más de {blocked * 1000:.0f}ms ({source})\n{stack}")
+
+    def _write(self, text: str):
+        self.stream.write(text)
+        self.stream.flush()
+
+
+def start_from_env(server: Any = None) -> Optional[LoopWatchdog]:
+    """Arranca el watchdog en el loop actual si `CHAT_MCP_LOOP_WATCHDOG_MS` está
+    definido. Idempotente: con HTTP sin estado se llama en cada petición."""
+    global _watchdog
+    threshold = os.getenv("CHAT_MCP_LOOP_WATCHDOG_MS")
+    if not threshold:
+        return None
+    if server is not None:
+        watch_fastmcp(server)
+    loop = asyncio.get_running_loop()
+    if _watchdog is None or _watchdog.loop is not loop:
+        if _watchdog is not None:
+            _watchdog.stop()
+        _watchdog = LoopWatchdog(float(threshold)).start(loop)
+        print(f"🐢 Watchdog del event loop activo (umbral {threshold}ms)", file=sys.stderr)
+    return _watchdog
@@ -0,0 +1,221 @@
+# observability/metrics.py
+"""Métricas en formato de exposición de Prometheus, sin dependencias.
+
+Registrar en el hot path es barato: un diccionario por combinación de labels
+y, en los histogramas, un `bisect` sobre los límites de los buckets. Los
+valores que ya existen en memoria (sesiones del pool, tamaño del historial)
+se leen con `CallbackGauge` solo cuando se hace scrape.
+"""
+import bisect
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Buckets por defecto, en segundos: de 5 ms a 2 minutos.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in list(self._values.items())
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str):
+        self._values[self._key(labels)] = value
+
+    def dec(self, amount: float = 1, **labels: str):
+        self.inc(-amount, **labels)
+
+
+class CallbackGauge(_Metric):
+    """Gauge cuyo valor se calcula al hacer scrape.
+
+    `fn` devuelve pares (valores de labels, valor).
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], fn: Callable[[], Iterable[Tuple[LabelValues, float]]]):
+        super().__init__(name, documentation, labelnames)
+        self.fn = fn
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in self.fn()
+        ]
+
+
+class SessionTracker:
+    """Sesiones distintas con actividad en los últimos `idle_seconds`.
+
+    `touch` mueve la sesión al final; al contar se descartan por el principio
+    las que llevan más de `idle_seconds` sin actividad.
+    """
+
+    def __init__(self, idle_seconds: float):
+        self.idle_seconds = idle_seconds
+        self._last_seen: "OrderedDict[str, float]" = OrderedDict()
+
+    def touch(self, session_id: str):
+        self._last_seen[session_id] = time.monotonic()
+        self._last_seen.move_to_end(session_id)
+
+    def active(self) -> int:
+        cutoff = time.monotonic() - self.idle_seconds
+        while self._last_seen:
+            session_id, last_seen = next(iter(self._last_seen.items()))
+            if last_seen > cutoff:
+                break
+            del self._last_seen[session_id]
+        return len(self._last_seen)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Por labels: [conteos por bucket (+Inf al final), suma, total]
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect.bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def count(self, **labels: str) -> int:
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total, n) in list(self._values.items()):
+            cumulative = 0
+            for bound, c in zip(self.buckets + (math.inf,), counts):
+                cumulative += c
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {n}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrica duplicada: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name: str):
+        self._metrics.pop(name, None)
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# ---- Métricas del chat ----
+CHAT_TURN_SECONDS = REGISTRY.register(Histogram(
+    "chat_turn_seconds", "Latencia de extremo a extremo de un turno del chat."))
+CHAT_ACTIVE_TURNS = REGISTRY.register(Gauge(
+    "chat_active_turns", "Turnos del chat en curso."))
+LLM_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "llm_request_seconds", "Latencia de cada llamada al LLM.", ["model"]))
+LLM_ERRORS = REGISTRY.register(Counter(
+    "llm_errors_total", "Llamadas al LLM que lanzaron una excepción.", ["model"]))
+TOOL_CALL_SECONDS = REGISTRY.register(Histogram(
+    "mcp_tool_call_seconds", "Latencia de ida y vuelta de cada llamada a una tool MCP.", ["connector", "tool"]))
+TOOL_ERRORS = REGISTRY.register(Counter(
+    "mcp_tool_errors_total", "Llamadas a tools MCP con error, por conector.", ["connector", "tool"]))
+EVENT_LOOP_LAG_SECONDS = REGISTRY.register(Histogram(
+    "event_loop_lag_seconds", "Retraso del event loop medido por el watchdog.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)))
+EVENT_LOOP_STALLS = REGISTRY.register(Counter(
+    "event_loop_stalls_total", "Bloqueos del event loop por encima del umbral, por origen.", ["source"]))
+SINGLE_FLIGHT_CALLS = REGISTRY.register(Counter(
+    "mcp_single_flight_calls_total",
+    "Llamadas a tools por papel en el single-flight: leader (llega al servidor) o shared (reutiliza una en curso).",
+    ["connector", "tool", "role"]))
+PREFETCH_CALLS = REGISTRY.register(Counter(
+    "mcp_prefetch_calls_total",
+    "Precargas especulativas de tools por resultado: issued, hit (la usó una llamada real), error, dropped (sin hueco) o cancelled (la llamada real llegó antes de empezar).",
+    ["connector", "tool", "outcome"]))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "cache_requests_total", "Consultas a las cachés por resultado (hit/miss).", ["cache", "result"]))
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
@@ -0,0 +1,148 @@
+# observability/tracing.py
+"""Spans ligeros para medir dónde se va el tiempo de cada turno del chat.
+
+El backend se elige con `CHAT_MCP_TRACING`:
+  - "" / "none": no-op (por defecto, coste casi nulo en el hot path)
+  - "console":   una línea legible por span en stderr
+  - "json":      una línea JSON por span en `CHAT_MCP_TRACE_FILE` (o stderr)
+  - "otel":      spans de OpenTelemetry (requiere `opentelemetry-api`; el
+                 exportador lo configura el SDK del host)
+
+Nunca se escribe en stdout: en los servidores MCP por stdio es el canal del
+protocolo.
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+
+class Span:
+    """Span registrado por los exportadores locales (console/json)."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attributes", "start", "duration_ms", "error")
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.start = time.time()
+        self.duration_ms = 0.0
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+
+class _LocalExporter:
+    def __init__(self, fmt: str, path: Optional[str]):
+        self.fmt = fmt
+        self.stream = open(path, "a", encoding="utf-8") if path else sys.stderr
+        self.lock = threading.Lock()
+
+    def export(self, span: Span):
+        if self.fmt == "json":
+            line = json.dumps(span.to_dict(), default=str)
+        else:
+            attrs = " ".join(f"{k}={v}" for k, v in span.attributes.items())
+            status = f" ❌ {span.error}" if span.error else ""
+            line = f"⏱️ {span.name} {span.duration_ms:.1f}ms {attrs}{status}"
+        with self.lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+_mode = "none"
+_exporter: Optional[_LocalExporter] = None
+_otel_tracer = None
+
+
+def configure(mode: Optional[str] = None, path: Optional[str] = None):
+    """(Re)configura el backend de trazas; por defecto lee el entorno."""
+    global _mode, _exporter, _otel_tracer
+    mode = (mode if mode is not None else os.getenv("CHAT_MCP_TRACING", "")).lower() or "none"
+    path = path or os.getenv("CHAT_MCP_TRACE_FILE")
+    _exporter, _otel_tracer = None, None
+
+    if mode == "otel":
+        try:
+            from opentelemetry import trace
+            _otel_tracer = trace.get_tracer("chat_mcp")
+        except ImportError:
+            print("⚠️ CHAT_MCP_TRACING=otel requiere opentelemetry-api; trazas desactivadas.", file=sys.stderr)
+            mode = "none"
+    elif mode in ("console", "json"):
+        _exporter = _LocalExporter(mode, path)
+    elif mode != "none":
+        print(f"⚠️ CHAT_MCP_TRACING desconocido: {mode}; trazas desactivadas.", file=sys.stderr)
+        mode = "none"
+    _mode = mode
+
+
+def enabled() -> bool:
+    return _mode != "none"
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """Mide un bloque. Usable en código síncrono y asíncrono:
+
+        with span("mcp.call_tool", tool=name) as s:
+            ...
+            s.set_attribute("payload_bytes", n)
+    """
+    if _mode == "none":
+        yield NOOP_SPAN
+        return
+
+    if _otel_tracer is not None:
+        with _otel_tracer.start_as_current_span(name, attributes=attributes) as otel_span:
+            yield otel_span
+        return
+
+    current = Span(name, _current_span.get(), attributes)
+    token = _current_span.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.duration_ms = (time.perf_counter() - started) * 1000
+        _current_span.reset(token)
+        _exporter.export(current)
+
+
+configure()
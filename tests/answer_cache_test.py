@@ -0,0 +1,124 @@
+# tests/answer_cache_test.py
+"""Pruebas de la caché de respuestas (`llm/answer_cache.py`)."""
+import re
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from connectors import ttl_cache
+from llm import argument_context
+from llm.answer_cache import AnswerCache, grounded_in_query
+from llm.gemini_llm import GeminiLLM
+
+CAMPAIGNS_TOOL = SimpleNamespace(name="get_organization_campaigns", description="Campaigns of an organization.", inputSchema={
+    "type": "object", "properties": {"organization_id": {"type": "string"}},
+})
+
+
+class FakeModel:
+    """Pide las campañas de la organización que cite la pregunta (u omite el ID)
+    y responde con el resultado de la tool."""
+    model_name = "fake"
+
+    def generate_content(self, contents, tools=None, **kwargs):
+        if tools:
+            digits = re.findall(r"\d+", contents[-1]["parts"][0]["text"])
+            call = SimpleNamespace(name=CAMPAIGNS_TOOL.name, args={"organization_id": digits[0]} if digits else {})
+            part = SimpleNamespace(function_call=call, text=None)
+            return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))], text=None)
+        response = contents[-1]["parts"][0]["function_response"]["response"]
+        return SimpleNamespace(text=f"Campañas de {response['organization_id']}")
+
+
+class AnswerCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(ttl_cache.time, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = AnswerCache(tool_result_ttl=60, answer_ttl=60, similarity=0.5)
+
+    def test_similar_question(self):
+        """Una pregunta casi idéntica reutiliza la respuesta."""
+        self.cache.put_answer("¿Cuántas sesiones tuvo la propiedad 123 ayer?", "42")
+
+        self.assertEqual(self.cache.get_answer("cuantas sesiones tuvo la propiedad 123 ayer"), "42")
+        self.assertIsNone(self.cache.get_answer("¿Cuántas sesiones tuvo la propiedad 456 ayer?"))
+
+    def test_expired_best_candidate_is_skipped(self):
+        """Si la más parecida ha caducado se usa la siguiente vigente."""
+        self.cache.put_answer("sesiones de la propiedad 123 ayer por canal", "antigua")
+        self.now += 45
+        self.cache.put_answer("sesiones de la propiedad 123 de ayer", "vigente")
+        self.now += 30
+
+        self.assertEqual(self.cache.get_answer("sesiones de la propiedad 123 ayer por canales"), "vigente")
+        self.assertEqual(len(self.cache.answers), 1, "La caducada se borra del índice")
+
+    def test_expired_tool_result(self):
+        """Los resultados de tools caducan a los `tool_result_ttl` segundos."""
+        self.cache.put_tool_result("get_item", {"item_id": "a"}, {"id": "a"})
+        self.assertEqual(self.cache.get_tool_result("get_item", {"item_id": "a"}), {"id": "a"})
+
+        self.now += 61
+        self.assertIsNone(self.cache.get_tool_result("get_item", {"item_id": "a"}))
+
+    def test_scoped_answers(self):
+        """Una respuesta de una sesión no se sirve a otra; las compartidas sí."""
+        self.cache.put_answer("¿y sus campañas?", "Campañas de 111", "a:111")
+        self.cache.put_answer("campañas de la organización 111", "Campañas de 111")
+
+        self.assertEqual(self.cache.get_answer("y sus campañas", "a:111"), "Campañas de 111")
+        self.assertIsNone(self.cache.get_answer("y sus campañas", "b:222"))
+        self.assertEqual(self.cache.get_answer("campañas de la organización 111", "b:222"), "Campañas de 111")
+
+    def test_grounded_in_query(self):
+        """Los identificadores, nombres y valores con dígitos deben salir de la pregunta."""
+        query = "Sesiones de ayer de la propiedad 123 para Acme Corp"
+
+        self.assertTrue(grounded_in_query(query, {
+            "property_id": "properties/123", "metrics": ["sessions"],
+            "date_ranges": [{"start_date": "yesterday", "end_date": "yesterday"}],
+        }))
+        self.assertTrue(grounded_in_query(query, {"property_id": 123.0, "name": "acme corp"}))
+        self.assertFalse(grounded_in_query(query, {"property_id": "456"}))
+        self.assertFalse(grounded_in_query(query, {"name": "Globex"}))
+        self.assertFalse(grounded_in_query(query, {"date_ranges": [{"start_date": "2025-01-01"}]}))
+
+
+class FollowUpAnswerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        with mock.patch.dict("os.environ", {"GEMINI_API_KEY": "test"}):
+            self.llm = GeminiLLM(connectors=[SimpleNamespace(name="camphouse", execute=self.execute)])
+        self.llm.model = FakeModel()
+        self.llm.answer_cache = AnswerCache(tool_result_ttl=0, answer_ttl=60)
+        self.llm._register_tools(self.llm.connectors[0], [CAMPAIGNS_TOOL])
+        self.calls = []
+
+    async def execute(self, tool_name, args, session_id=None):
+        self.calls.append((session_id, args.get("organization_id")))
+        return {"organization_id": args.get("organization_id")}
+
+    async def ask(self, session_id, query):
+        with argument_context.session(session_id):
+            return await self.llm.process_query(query)
+
+    async def test_same_follow_up_in_two_sessions(self):
+        """El mismo seguimiento sobre organizaciones distintas no comparte respuesta."""
+        self.assertEqual(await self.ask("a", "Campañas de la organización 111"), "Campañas de 111")
+        self.assertEqual(await self.ask("b", "Campañas de la organización 222"), "Campañas de 222")
+
+        self.assertEqual(await self.ask("a", "¿Y sus campañas?"), "Campañas de 111")
+        self.assertEqual(await self.ask("b", "¿Y sus campañas?"), "Campañas de 222")
+        self.assertEqual(len(self.calls), 4)
+
+        # Dentro de la misma sesión y contexto, el seguimiento sí se reutiliza.
+        self.assertEqual(await self.ask("a", "¿Y sus campañas?"), "Campañas de 111")
+        self.assertEqual(len(self.calls), 4)
+        # Y la pregunta autocontenida se comparte entre sesiones.
+        self.assertEqual(await self.ask("b", "Campañas de la organización 111"), "Campañas de 111")
+        self.assertEqual(len(self.calls), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+# tests/argument_context_test.py
+"""Pruebas de los argumentos arrastrados entre llamadas (`llm/argument_context.py`)."""
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from llm import argument_context
+from llm.argument_context import ArgumentContext
+
+TOOLS = [
+    SimpleNamespace(name="find_organizations", inputSchema={
+        "properties": {"name": {"type": "string"}},
+        "required": ["name"],
+    }),
+    SimpleNamespace(name="get_aggregate_media_entries", inputSchema={
+        "properties": {
+            "organization_id": {"type": "string"},
+            "mediatype_ids": {"type": "array", "items": {"type": "string"}},
+            "from_date": {"type": "string"},
+            "to_date": {"type": "string"},
+        },
+        "required": ["organization_id", "from_date", "to_date"],
+    }),
+    SimpleNamespace(name="list_campaigns", inputSchema={
+        "properties": {"organization_id": {"type": "string"}, "mediatype_ids": {"type": "array"}},
+    }),
+]
+
+
+class ArgumentContextTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(argument_context.time, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.context = ArgumentContext(ttl_seconds=60)
+        self.context.index_tools(TOOLS)
+
+    def test_carries_identifiers(self):
+        """Los identificadores de una llamada completan la siguiente."""
+        self.context.remember("get_aggregate_media_entries", {
+            "organization_id": "org-1", "from_date": "2025-01-01", "to_date": "2025-01-31",
+        }, "s1")
+
+        self.assertEqual(self.context.merge("list_campaigns", {}, "s1"), {"organization_id": "org-1"})
+        self.assertEqual(
+            self.context.merge("list_campaigns", {"organization_id": "org-2"}, "s1"),
+            {"organization_id": "org-2"},
+        )
+
+    def test_dates_and_names_not_carried(self):
+        """Las fechas y los nombres no se arrastran aunque sean obligatorios."""
+        self.context.remember("find_organizations", {"name": "Acme"}, "s1")
+        self.context.remember("get_aggregate_media_entries", {
+            "organization_id": "org-1", "from_date": "2025-01-01", "to_date": "2025-01-31",
+        }, "s1")
+
+        self.assertEqual(self.context.merge("find_organizations", {}, "s1"), {})
+        self.assertEqual(
+            self.context.merge("get_aggregate_media_entries", {}, "s1"),
+            {"organization_id": "org-1"},
+        )
+
+    def test_repeated_proto_values(self):
+        """Las listas de Gemini (`RepeatedComposite`) se guardan como `list`."""
+        from google.ai.generativelanguage import FunctionCall
+
+        call = FunctionCall(name="list_campaigns", args={"organization_id": "org-1", "mediatype_ids": ["a", "b"]})
+        args = dict(call.args)
+        self.assertNotIsInstance(args["mediatype_ids"], list)
+
+        self.context.remember("list_campaigns", args, "s1")
+
+        merged = self.context.merge("list_campaigns", {}, "s1")
+        self.assertEqual(merged["mediatype_ids"], ["a", "b"])
+        self.assertIsInstance(merged["mediatype_ids"], list)
+
+    def test_injection_keeps_ttl(self):
+        """Inyectar un valor no renueva su caducidad."""
+        self.context.remember("list_campaigns", {"organization_id": "org-1"}, "s1")
+
+        for _ in range(3):
+            self.now += 30
+            sent = {}
+            self.context.remember("list_campaigns", sent, "s1")
+            merged = self.context.merge("list_campaigns", sent, "s1")
+
+        self.assertEqual(merged, {})
+
+    def test_sessions_isolated(self):
+        """Cada sesión tiene sus propios valores."""
+        self.context.remember("list_campaigns", {"organization_id": "org-1"}, "s1")
+
+        self.assertEqual(self.context.merge("list_campaigns", {}, "s2"), {})
+        self.context.forget("s1")
+        self.assertEqual(self.context.merge("list_campaigns", {}, "s1"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+# tests/mediatypes_test.py
+"""Pruebas de las tools de media types de Camphouse (`camphouse_mcp/camphouse_connector/mediatypes/main.py`)."""
+import asyncio
+import unittest
+from unittest import mock
+
+from camphouse_mcp.camphouse_connector.mediatypes import main as mediatypes
+
+
+class MediatypesTest(unittest.IsolatedAsyncioTestCase):
+    async def test_requests_are_bounded(self):
+        """Una lista larga de IDs no lanza más de MEDIATYPES_CONCURRENCY peticiones a la vez."""
+        in_flight, peak = 0, 0
+
+        async def request(endpoint, method="GET"):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return {"mediaType": {"_id": endpoint.split("/")[1]}}
+
+        ids = [f"mt{i:03d}" for i in range(100)]
+        with mock.patch.object(mediatypes, "make_request_async", request), \
+                mock.patch.object(mediatypes, "MEDIATYPES_CONCURRENCY", 4):
+            result = await mediatypes.get_mediatypes_data(ids)
+
+        self.assertEqual([mt["_id"] for mt in result], ids)
+        self.assertEqual(peak, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+# tests/metrics_test.py
+"""Pruebas de las métricas propias (`observability/metrics.py`)."""
+import unittest
+from unittest import mock
+
+from observability import metrics
+
+
+class SessionTrackerTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(metrics.time, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_counts_distinct_sessions(self):
+        """Varios turnos de la misma sesión cuentan una vez."""
+        tracker = metrics.SessionTracker(idle_seconds=60)
+        for session_id in ("a", "b", "a", "a"):
+            tracker.touch(session_id)
+
+        self.assertEqual(tracker.active(), 2)
+
+    def test_idle_sessions_expire(self):
+        """Las sesiones sin turnos en `idle_seconds` dejan de contar."""
+        tracker = metrics.SessionTracker(idle_seconds=60)
+        tracker.touch("a")
+        tracker.touch("b")
+        self.now += 45
+        tracker.touch("a")
+        self.now += 30
+
+        self.assertEqual(tracker.active(), 1)
+        self.now += 60
+        self.assertEqual(tracker.active(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+# tests/org_index_test.py
+"""Pruebas del índice de organizaciones de Camphouse (`camphouse_mcp/tools/org_index.py`)."""
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from camphouse_mcp.tools import org_index
+from camphouse_mcp.tools.org_index import OrganizationIndex
+
+
+class FakeMediatool:
+    """Árbol root -> a, b; los socios de cada organización se pueden cambiar."""
+
+    def __init__(self):
+        self.subsidiaries = [{"_id": "a", "name": "Alfa", "parentId": "root"},
+                             {"_id": "b", "name": "Beta", "parentId": "root"}]
+        self.partners = {"root": [], "a": [{"_id": "p1", "name": "Socio Uno"}], "b": []}
+        self.requests = []
+
+    async def request(self, endpoint, method="GET"):
+        self.requests.append(endpoint)
+        parts = endpoint.split("/")
+        if len(parts) == 2:
+            return {"organization": {"_id": parts[1], "name": "Raíz"}}
+        if parts[2] == "subsidiaries":
+            return {"organizations": self.subsidiaries}
+        return {"organizations": self.partners.get(parts[1], [])}
+
+
+class OrganizationIndexTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.api = FakeMediatool()
+        self.now = 1000.0
+        patches = [mock.patch.object(org_index, "make_request_async", self.api.request),
+                   # Solo el reloj del módulo: el del event loop sigue siendo el real.
+                   mock.patch.object(org_index, "time", SimpleNamespace(monotonic=lambda: self.now))]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.index = OrganizationIndex("root", ttl_seconds=900, partners_ttl_seconds=3600)
+
+    def partner_requests(self):
+        return sorted(e.split("/")[1] for e in self.api.requests if e.endswith("/partners"))
+
+    async def test_incremental_refresh_fetches_only_new_partners(self):
+        await self.index.ensure()
+        self.api.subsidiaries.append({"_id": "c", "name": "Gamma", "parentId": "root"})
+        self.api.requests.clear()
+
+        self.now += 901
+        await self.index.ensure()
+
+        self.assertEqual(self.partner_requests(), ["c"])
+        self.assertEqual(self.index.relation("c"), "subsidiary")
+
+    async def test_stale_partner_lists_are_refetched(self):
+        await self.index.ensure()
+        self.api.partners["a"] = [{"_id": "p2", "name": "Socio Dos"}]
+
+        self.now += 901
+        await self.index.ensure()
+        self.assertEqual(self.index.partners["a"], ["p1"], "Los socios aún no han caducado")
+
+        self.api.requests.clear()
+        self.now += 3600
+        await self.index.ensure()
+
+        self.assertEqual(self.partner_requests(), ["a", "b", "root"])
+        self.assertEqual(self.index.partners["a"], ["p2"])
+        self.assertIsNone(self.index.relation("p1"), "Un socio que ya no lo es sale del índice")
+        self.assertEqual([o["_id"] for o in self.index.find("socio dos")], ["p2"])
+
+    async def test_failed_partner_request_keeps_previous_list(self):
+        await self.index.ensure()
+        request = self.api.request
+
+        async def failing(endpoint, method="GET"):
+            if endpoint == "organizations/a/partners":
+                raise org_index.MediatoolAPIError("caído")
+            return await request(endpoint, method)
+
+        self.now += 3601
+        with mock.patch.object(org_index, "make_request_async", failing):
+            await self.index.ensure()
+        self.assertEqual(self.index.partners["a"], ["p1"])
+
+        self.api.requests.clear()
+        self.now += 901
+        await self.index.ensure()
+        self.assertEqual(self.partner_requests(), ["a"], "Se reintenta en el siguiente refresco")
+
+    async def test_failed_partner_request_on_full_refresh(self):
+        await self.index.ensure()
+        self.api.partners["b"] = [{"_id": "p3", "name": "Socio Tres"}]
+        request = self.api.request
+
+        async def failing(endpoint, method="GET"):
+            if endpoint == "organizations/a/partners":
+                self.api.requests.append(endpoint)
+                raise org_index.MediatoolAPIError("caído")
+            return await request(endpoint, method)
+
+        self.api.requests.clear()
+        with mock.patch.object(org_index, "make_request_async", failing):
+            await self.index.reload(full=True)
+
+        self.assertEqual(self.partner_requests(), ["a", "b", "root"], "Un refresco completo pide todos los socios")
+        self.assertEqual(self.index.partners["a"], ["p1"], "Se conserva la lista anterior")
+        self.assertEqual([o["_id"] for o in self.index.find("socio uno")], ["p1"])
+        self.assertEqual(self.index.partners["b"], ["p3"])
+
+        self.api.requests.clear()
+        self.now += 901
+        await self.index.ensure()
+        self.assertEqual(self.partner_requests(), ["a"], "La lista que falló se reintenta")
+
+
+if __name__ == "__main__":
+    unittest.main()
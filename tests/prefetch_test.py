@@ -0,0 +1,109 @@
+# tests/prefetch_test.py
+"""Pruebas de la precarga especulativa (`connectors/prefetch.py`)."""
+import asyncio
+import unittest
+from collections import Counter
+from types import SimpleNamespace
+
+from connectors.prefetch import Prefetcher
+
+TOOLS = [
+    SimpleNamespace(name="list_items", inputSchema={}),
+    SimpleNamespace(name="get_item", inputSchema={"required": ["item_id"]}),
+]
+
+
+def listing(*ids):
+    return SimpleNamespace(structuredContent={"items": [{"id": i} for i in ids]}, content=None)
+
+
+class FakeUpstream:
+    """Cuenta las llamadas por argumentos; con `gate` las retiene hasta abrirlo."""
+
+    def __init__(self, gate: bool = False):
+        self.calls = Counter()
+        self.gate = asyncio.Event()
+        if not gate:
+            self.gate.set()
+
+    async def call(self, tool_name, args):
+        self.calls[(tool_name, args.get("item_id"))] += 1
+        await self.gate.wait()
+        return SimpleNamespace(structuredContent={"result": args["item_id"]}, content=None, isError=False)
+
+
+class PrefetcherTest(unittest.IsolatedAsyncioTestCase):
+    def make(self, upstream, concurrency=4):
+        prefetcher = Prefetcher("test", upstream.call, lambda: TOOLS, budget=2, concurrency=concurrency,
+                                min_probability=0.3, min_samples=1, ttl_seconds=60)
+        # Una sesión enseña la secuencia list_items -> get_item(item_id <- items[].id).
+        prefetcher.observe("list_items", {}, listing("a", "b"), "s1")
+        prefetcher.observe("get_item", {"item_id": "a"}, None, "s1")
+        return prefetcher
+
+    async def wait_inflight(self, prefetcher):
+        await asyncio.gather(*list(prefetcher._inflight.values()), return_exceptions=True)
+
+    async def test_hit_is_served_once(self):
+        upstream = FakeUpstream()
+        prefetcher = self.make(upstream)
+        prefetcher.observe("list_items", {}, listing("x", "y"), "s2")
+        await self.wait_inflight(prefetcher)
+
+        result = await prefetcher.take("get_item", {"item_id": "x"})
+        self.assertEqual(result.structuredContent, {"result": "x"})
+        self.assertIsNone(await prefetcher.take("get_item", {"item_id": "x"}))
+        self.assertEqual(upstream.calls[("get_item", "x")], 1)
+        self.assertEqual(prefetcher.stats()["hits"], 1)
+
+    async def test_miss(self):
+        upstream = FakeUpstream()
+        prefetcher = self.make(upstream)
+        prefetcher.observe("list_items", {}, listing("x"), "s2")
+        await self.wait_inflight(prefetcher)
+
+        self.assertIsNone(await prefetcher.take("get_item", {"item_id": "other"}))
+        self.assertEqual(prefetcher.stats()["hits"], 0)
+
+    async def test_real_call_joins_started_prefetch(self):
+        upstream = FakeUpstream(gate=True)
+        prefetcher = self.make(upstream)
+        prefetcher.observe("list_items", {}, listing("x"), "s2")
+        await asyncio.sleep(0)
+
+        take = asyncio.create_task(prefetcher.take("get_item", {"item_id": "x"}))
+        await asyncio.sleep(0)
+        self.assertFalse(take.done(), "la llamada real debe esperar a la precarga en curso")
+        upstream.gate.set()
+
+        self.assertEqual((await take).structuredContent, {"result": "x"})
+        self.assertEqual(upstream.calls[("get_item", "x")], 1)
+        self.assertEqual(prefetcher.stats()["hits"], 1)
+        self.assertIsNone(await prefetcher.take("get_item", {"item_id": "x"}))
+
+    async def test_queued_prefetch_is_cancelled(self):
+        upstream = FakeUpstream(gate=True)
+        prefetcher = self.make(upstream, concurrency=1)
+        prefetcher.observe("list_items", {}, listing("x", "y"), "s2")
+        await asyncio.sleep(0)
+
+        # "y" espera turno tras "x": la llamada real no la espera ni la duplica.
+        self.assertIsNone(await prefetcher.take("get_item", {"item_id": "y"}))
+        upstream.gate.set()
+        await self.wait_inflight(prefetcher)
+
+        self.assertEqual(upstream.calls[("get_item", "y")], 0)
+        stats = prefetcher.stats()
+        self.assertEqual((stats["hits"], stats["cancelled"], stats["issued"]), (0, 1, 1))
+
+    async def test_sessions_are_independent(self):
+        upstream = FakeUpstream()
+        prefetcher = Prefetcher("test", upstream.call, lambda: TOOLS, min_probability=0.3, min_samples=1)
+        prefetcher.observe("list_items", {}, listing("a"), "s1")
+        # La siguiente llamada es de otra sesión: no es una continuación.
+        prefetcher.observe("get_item", {"item_id": "a"}, None, "s2")
+        self.assertEqual(prefetcher.predictions("list_items"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+# tests/result_store_test.py
+"""Pruebas del almacén de resultados grandes (`tools/result_store.py`)."""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from tools.result_store import ResultStore, ResultWriter, spill_large_result
+
+
+class SpillTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.store = ResultStore(self.directory.name)
+
+    def test_large_result_is_spilled(self):
+        """La lista más grande se guarda y se devuelven sus primeros elementos."""
+        result = {"items": [{"id": i} for i in range(100)], "total": 100}
+
+        spilled = spill_large_result(result, "list_items", inline_bytes=100, store=self.store)
+
+        handle = spilled["stored_result"][0]
+        self.assertEqual(handle["rows"], 100)
+        self.assertEqual(len(spilled["items"]), 20)
+        self.assertEqual(self.store.page(handle["result_id"], 98, 10), [{"id": 98}, {"id": 99}])
+
+    def test_failed_spill_is_not_published(self):
+        """Si la escritura falla a medias no queda ningún fichero."""
+        result = {"items": [{"id": i} for i in range(100)]}
+        write = ResultWriter.write
+
+        def failing(writer, item):
+            if item["id"] == 50:
+                raise TypeError("no serializable")
+            write(writer, item)
+
+        with mock.patch.object(ResultWriter, "write", failing), self.assertRaises(TypeError):
+            spill_large_result(result, "list_items", inline_bytes=100, store=self.store)
+
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+# tests/tool_converter_test.py
+"""Pruebas de la conversión de esquemas MCP a Gemini (`tools/tool_converter.py`)."""
+import unittest
+from types import SimpleNamespace
+
+from tools import tool_converter
+from tools.tool_converter import clean_schema_for_gemini, convert_mcp_tools_to_gemini
+
+
+class CleanSchemaTest(unittest.TestCase):
+    def setUp(self):
+        tool_converter.clear_cache()
+
+    def test_nested_objects(self):
+        """Los objetos anidados y las referencias `$defs` se resuelven."""
+        schema = {
+            "type": "object",
+            "$defs": {"DateRange": {
+                "type": "object",
+                "properties": {"start_date": {"type": "string"}, "end_date": {"type": "string"}},
+                "required": ["start_date", "missing"],
+            }},
+            "properties": {
+                "range": {"$ref": "#/$defs/DateRange"},
+                "filter": {"properties": {"field": {"type": "string"}}},
+                "unknown": {"$ref": "#/$defs/Missing"},
+            },
+            "required": ["range", "gone"],
+        }
+
+        self.assertEqual(clean_schema_for_gemini(schema), {
+            "type": "object",
+            "properties": {
+                "range": {
+                    "type": "object",
+                    "properties": {"start_date": {"type": "string"}, "end_date": {"type": "string"}},
+                    "required": ["start_date"],
+                },
+                "filter": {"type": "object", "properties": {"field": {"type": "string"}}},
+                "unknown": {"type": "object"},
+            },
+            "required": ["range"],
+        })
+
+    def test_recursive_reference(self):
+        """Una referencia recursiva termina en un objeto libre."""
+        schema = {
+            "$defs": {"Node": {"type": "object", "properties": {"child": {"$ref": "#/$defs/Node"}}}},
+            "properties": {"root": {"$ref": "#/$defs/Node"}},
+        }
+
+        root = clean_schema_for_gemini(schema)["properties"]["root"]
+        self.assertEqual(root["properties"]["child"], {"type": "object"})
+
+    def test_arrays(self):
+        """Los arrays conservan sus `items` y, sin ellos, son de strings."""
+        schema = {"type": "object", "properties": {
+            "ids": {"type": "array", "items": {"anyOf": [{"type": "integer"}, {"type": "string"}]}},
+            "amounts": {"type": "array", "items": {"anyOf": [{"type": "integer"}, {"type": "number"}]}},
+            "tags": {"type": "array"},
+            "rows": {"items": {"type": "object", "properties": {"n": {"type": "integer"}}}},
+        }}
+
+        properties = clean_schema_for_gemini(schema)["properties"]
+        self.assertEqual(properties["ids"], {"type": "array", "items": {"type": "string"}})
+        self.assertEqual(properties["amounts"], {"type": "array", "items": {"type": "number"}})
+        self.assertEqual(properties["tags"], {"type": "array", "items": {"type": "string"}})
+        self.assertEqual(properties["rows"], {
+            "type": "array",
+            "items": {"type": "object", "properties": {"n": {"type": "integer"}}},
+        })
+
+    def test_enums(self):
+        """`enum` y `const` pasan a `enum`."""
+        schema = {"type": "object", "properties": {
+            "kind": {"type": "string", "enum": ["a", "b"], "description": "Tipo"},
+            "mode": {"const": "fixed"},
+        }}
+
+        properties = clean_schema_for_gemini(schema)["properties"]
+        self.assertEqual(properties["kind"], {"type": "string", "enum": ["a", "b"], "description": "Tipo"})
+        self.assertEqual(properties["mode"], {"type": "string", "enum": ["fixed"]})
+
+    def test_nullable_types(self):
+        """`X | None` pasa a `X` con `nullable`, en `anyOf` y en listas de tipos."""
+        schema = {"type": "object", "properties": {
+            "limit": {"anyOf": [{"type": "integer", "format": "int64"}, {"type": "null"}]},
+            "ratio": {"type": ["number", "null"]},
+            "flag": {"type": "boolean", "nullable": True},
+        }}
+
+        properties = clean_schema_for_gemini(schema)["properties"]
+        self.assertEqual(properties["limit"], {"type": "integer", "format": "int64", "nullable": True})
+        self.assertEqual(properties["ratio"], {"type": "number", "nullable": True})
+        self.assertEqual(properties["flag"], {"type": "boolean", "nullable": True})
+
+    def test_drops_unsupported_keywords(self):
+        """Se descartan las palabras clave y los formatos que Gemini no admite."""
+        schema = {
+            "type": "object",
+            "title": "Args",
+            "additionalProperties": False,
+            "properties": {
+                "date": {"type": "string", "format": "date", "title": "Date", "default": "today",
+                         "minLength": 10, "pattern": "^\\d{4}"},
+                "when": {"type": "string", "format": "date-time", "examples": ["2025-01-01T00:00:00Z"]},
+            },
+        }
+
+        self.assertEqual(clean_schema_for_gemini(schema), {
+            "type": "object",
+            "properties": {
+                "date": {"type": "string"},
+                "when": {"type": "string", "format": "date-time"},
+            },
+            "required": [],
+        })
+
+    def test_result_is_memoized(self):
+        """El mismo esquema se convierte una sola vez."""
+        schema = {"type": "object", "properties": {"a": {"type": "string"}}}
+
+        self.assertIs(clean_schema_for_gemini(schema), clean_schema_for_gemini(schema))
+
+    def test_tool_without_schema(self):
+        """Una tool sin `inputSchema` recibe un objeto vacío."""
+        tool = SimpleNamespace(name="ping", description="Ping", inputSchema=None)
+
+        declaration = convert_mcp_tools_to_gemini([tool])[0]["function_declarations"][0]
+        self.assertEqual(declaration["parameters"], {"type": "object", "properties": {}, "required": []})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+# tests/tool_router_test.py
+"""Pruebas del router de tools (`llm/tool_router.py`)."""
+import unittest
+
+from llm import argument_context
+from llm.tool_router import ToolRouter, catalog_names
+
+DECLARATIONS = [
+    {"name": "run_report", "description": "Runs a Google Analytics report with dimensions and metrics."},
+    {"name": "run_realtime_report", "description": "Runs a realtime report for the last minutes."},
+    {"name": "get_account_summaries", "description": "Account and property summaries."},
+    {"name": "find_organizations", "description": "Find organizations by name."},
+    {"name": "get_organization_campaigns", "description": "Campaigns of an organization."},
+    {"name": "get_aggregate_media_entries", "description": "Aggregate spend and cost of media entries."},
+]
+
+
+class ToolRouterTest(unittest.TestCase):
+    def setUp(self):
+        self.router = ToolRouter(top_k=1, min_score=0.1)
+
+    def test_selects_best_tools(self):
+        """Una pregunta clara recibe solo las tools que encajan."""
+        selected = catalog_names(self.router.select("gasto de la organización", DECLARATIONS, "s1"))
+
+        self.assertEqual(selected, ["get_aggregate_media_entries"])
+
+    def test_recent_tools_per_session(self):
+        """Las tools recientes de una sesión no se añaden en otra."""
+        self.router.note_used("find_organizations", "s1")
+
+        s1 = catalog_names(self.router.select("gasto", DECLARATIONS, "s1"))
+        s2 = catalog_names(self.router.select("gasto", DECLARATIONS, "s2"))
+
+        self.assertIn("find_organizations", s1)
+        self.assertNotIn("find_organizations", s2)
+
+    def test_current_session_by_default(self):
+        """Sin `session_id` se usa la sesión del turno en curso."""
+        with argument_context.session("s1"):
+            self.router.note_used("find_organizations")
+            self.assertEqual(self.router.recent(), ("find_organizations",))
+        with argument_context.session("s2"):
+            self.assertEqual(self.router.recent(), ())
+
+    def test_reindexes_changed_descriptions(self):
+        """Las mismas tools con otras descripciones se vuelven a indexar."""
+        self.assertEqual(len(self.router.select("budget", DECLARATIONS, "s1")), len(DECLARATIONS),
+                         "Ninguna descripción habla de presupuestos")
+
+        changed = [dict(d, description="Budget of each campaign.") if d["name"] == "get_organization_campaigns" else d
+                   for d in DECLARATIONS]
+        self.assertEqual(catalog_names(self.router.select("budget", changed, "s1")), ["get_organization_campaigns"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+# tools/fast_json.py
+"""JSON rápido y opcional para las rutas calientes (respuestas de Mediatool y
+resultados de tools).
+
+Usa `orjson` o `msgspec` si están instalados y, si no, el `json` estándar. Se
+puede forzar con `CHAT_MCP_JSON=orjson|msgspec|stdlib`. `loads` acepta str o
+bytes (sin decodificar antes) y `dumps` devuelve str compacto. Los errores de
+`loads` se capturan con `JSONDecodeError`.
+"""
+import os
+import json
+from typing import Any, Callable, Tuple, Union
+
+
+def _stdlib() -> Tuple[Callable[[Union[str, bytes]], Any], Callable[[Any], str]]:
+    return json.loads, lambda obj: json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _orjson():
+    import orjson
+    return orjson.loads, lambda obj: orjson.dumps(obj, default=str).decode()
+
+
+def _msgspec():
+    import msgspec
+    decoder, encoder = msgspec.json.Decoder(), msgspec.json.Encoder(enc_hook=str)
+
+    def decode(data: Union[str, bytes]) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    return decode, lambda obj: encoder.encode(obj).decode()
+
+
+_BACKENDS = {"orjson": _orjson, "msgspec": _msgspec, "stdlib": _stdlib}
+
+
+def _select(preferred: str):
+    names = [preferred] if preferred in _BACKENDS else ["orjson", "msgspec", "stdlib"]
+    for name in names:
+        try:
+            return (name,) + _BACKENDS[name]()
+        except ImportError:
+            continue
+    return ("stdlib",) + _stdlib()
+
+
+BACKEND, loads, dumps = _select(os.getenv("CHAT_MCP_JSON", "auto").lower())
+
+# Excepción común de `loads` en todos los backends.
+JSONDecodeError = ValueError
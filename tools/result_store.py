@@ -0,0 +1,190 @@
+# tools/result_store.py
+"""Almacén en disco para resultados de tools demasiado grandes.
+
+Cuando un resultado supera `CHAT_MCP_INLINE_BYTES`, su lista más grande se
+guarda como NDJSON (un elemento por línea) en `CHAT_MCP_RESULT_DIR` y la tool
+devuelve solo los primeros elementos más un handle en `stored_result`. Las
+tools `fetch_stored_result_page` y `describe_stored_result` leen después porciones del
+fichero con mmap y un índice de offsets de línea, sin cargarlo entero. Los
+resultados caducan a los `CHAT_MCP_RESULT_TTL_S` segundos y se borran al
+guardar uno nuevo.
+"""
+import os
+import re
+import mmap
+import time
+import uuid
+import array
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+from tools import fast_json
+
+DEFAULT_INLINE_BYTES = 500_000
+DEFAULT_TTL_SECONDS = 3600
+PREVIEW_ITEMS = 20
+
+# Índices de offsets que se mantienen en memoria (los últimos paginados).
+_MAX_INDEXES = 16
+
+_RESULT_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+class ResultNotFoundError(ValueError):
+    """Handle desconocido, mal formado o caducado."""
+    pass
+
+
+class ResultWriter:
+    def __init__(self, store: "ResultStore", meta: Dict[str, Any]):
+        self.store = store
+        self.result_id = uuid.uuid4().hex
+        self.meta = dict(meta)
+        self.rows = 0
+        self._file = open(store.rows_path(self.result_id), "w", encoding="utf-8")
+
+    def write(self, item: Any):
+        self._file.write(fast_json.dumps(item) + "\n")
+        self.rows += 1
+
+    def discard(self):
+        """Abandona el resultado a medias: nunca llega a tener handle ni metadatos."""
+        self._file.close()
+        try:
+            os.remove(self.store.rows_path(self.result_id))
+        except OSError:
+            pass
+
+    def close(self) -> Dict[str, Any]:
+        self._file.close()
+        self.meta.update(
+            result_id=self.result_id,
+            rows=self.rows,
+            bytes=os.path.getsize(self.store.rows_path(self.result_id)),
+            created=time.time(),
+        )
+        with open(self.store.meta_path(self.result_id), "w", encoding="utf-8") as f:
+            f.write(fast_json.dumps(self.meta))
+        return self.store.handle(self.meta)
+
+
+class ResultStore:
+    def __init__(self, directory: Optional[str] = None, ttl_seconds: Optional[float] = None):
+        self.directory = directory or os.getenv("CHAT_MCP_RESULT_DIR") or os.path.join(tempfile.gettempdir(), "chat_mcp_results")
+        self.ttl_seconds = float(ttl_seconds if ttl_seconds is not None else os.getenv("CHAT_MCP_RESULT_TTL_S", DEFAULT_TTL_SECONDS))
+        self._indexes: Dict[str, array.array] = {}
+        self._lock = threading.Lock()
+
+    def rows_path(self, result_id: str) -> str:
+        return os.path.join(self.directory, f"{result_id}.ndjson")
+
+    def meta_path(self, result_id: str) -> str:
+        return os.path.join(self.directory, f"{result_id}.json")
+
+    def create(self, **meta: Any) -> ResultWriter:
+        os.makedirs(self.directory, exist_ok=True)
+        self.cleanup()
+        return ResultWriter(self, meta)
+
+    def handle(self, meta: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "result_id": meta["result_id"],
+            "field": meta.get("field"),
+            "rows": meta["rows"],
+            "bytes": meta["bytes"],
+            "expires_in_seconds": max(0, int(meta["created"] + self.ttl_seconds - time.time())),
+        }
+
+    def describe(self, result_id: str) -> Dict[str, Any]:
+        meta = self._meta(result_id)
+        return dict(meta, **self.handle(meta))
+
+    def page(self, result_id: str, offset: int, limit: int) -> List[Any]:
+        meta = self._meta(result_id)
+        offset = max(0, offset)
+        end = min(meta["rows"], offset + max(0, limit))
+        if offset >= end:
+            return []
+        with open(self.rows_path(result_id), "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                index = self._index(result_id, mm)
+                stop = index[end] if end < len(index) else len(mm)
+                return [fast_json.loads(line) for line in mm[index[offset]:stop].splitlines()]
+
+    def cleanup(self):
+        if not os.path.isdir(self.directory):
+            return
+        deadline = time.time() - self.ttl_seconds
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < deadline:
+                    os.remove(path)
+                    self._indexes.pop(name.split(".")[0], None)
+            except OSError:
+                pass
+
+    def _meta(self, result_id: str) -> Dict[str, Any]:
+        if not _RESULT_ID.match(result_id or ""):
+            raise ResultNotFoundError(f"result_id inválido: {result_id}")
+        try:
+            with open(self.meta_path(result_id), "rb") as f:
+                meta = fast_json.loads(f.read())
+        except FileNotFoundError:
+            raise ResultNotFoundError(f"El resultado {result_id} no existe o ha caducado; vuelve a ejecutar la tool.") from None
+        if meta["created"] + self.ttl_seconds < time.time():
+            raise ResultNotFoundError(f"El resultado {result_id} ha caducado; vuelve a ejecutar la tool.")
+        return meta
+
+    def _index(self, result_id: str, mm: mmap.mmap) -> array.array:
+        """Offset del inicio de cada línea, cacheado por resultado."""
+        with self._lock:
+            index = self._indexes.get(result_id)
+            if index is None:
+                index = array.array("Q", [0])
+                position = mm.find(b"\n")
+                while position != -1 and position + 1 < len(mm):
+                    index.append(position + 1)
+                    position = mm.find(b"\n", position + 1)
+                if len(self._indexes) >= _MAX_INDEXES:
+                    self._indexes.pop(next(iter(self._indexes)))
+                self._indexes[result_id] = index
+            return index
+
+
+_store: Optional[ResultStore] = None
+
+
+def get_store() -> ResultStore:
+    global _store
+    if _store is None:
+        _store = ResultStore()
+    return _store
+
+
+def spill_large_result(result: Any, tool_name: str = "", inline_bytes: Optional[int] = None,
+                       store: Optional[ResultStore] = None) -> Any:
+    """Si `result` es un dict demasiado grande, guarda su lista más grande en el
+    almacén y la sustituye por sus primeros elementos.
+
+    El handle va en `stored_result` como lista de un elemento, para que el
+    resultado siga cumpliendo esquemas de salida como `Dict[str, List[Dict]]`.
+    """
+    if not isinstance(result, dict):
+        return result
+    if inline_bytes is None:
+        inline_bytes = int(os.getenv("CHAT_MCP_INLINE_BYTES", DEFAULT_INLINE_BYTES))
+    lists = [(len(v), k) for k, v in result.items() if isinstance(v, list)]
+    if not lists or len(fast_json.dumps(result)) <= inline_bytes:
+        return result
+
+    _, field = max(lists)
+    writer = (store or get_store()).create(tool=tool_name, field=field)
+    try:
+        for item in result[field]:
+            writer.write(item)
+    except BaseException:
+        writer.discard()
+        raise
+    handle = writer.close()
+    return dict(result, **{field: result[field][:PREVIEW_ITEMS], "stored_result": [handle]})
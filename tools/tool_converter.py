@@ -1,16 +1,160 @@
+# tools/tool_converter.py
+"""Conversión de los JSON Schema de las tools MCP al subconjunto de OpenAPI que
+acepta Gemini (type, format, description, nullable, enum, items, properties,
+required).
+
+Cada esquema se recorre una sola vez y solo se construye el resultado final:
+se resuelven `$ref`/`$defs`, se colapsan `anyOf`/`oneOf` (`int | str` pasa a
+string, `X | None` a `X` con `nullable`) y se descarta lo que Gemini no admite
+(`title`, `default`, `additionalProperties`...). Los resultados se memorizan
+por identidad del esquema (compilar cuesta menos que serializarlo para usar su
+contenido como clave; entre reinicios ya los guarda la caché de tools): el
+resultado es compartido y no debe modificarse.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+# Formatos que Gemini admite por tipo; el resto se descarta.
+_FORMATS = {
+    "string": {"enum", "date-time"},
+    "number": {"float", "double"},
+    "integer": {"int32", "int64"},
+}
+_SCALARS = {"string", "number", "integer", "boolean"}
+
+_CACHE_SIZE = 512
+_by_id: Dict[int, Tuple[dict, dict]] = {}
+
+
+def _collapse_types(types: List[str]) -> str:
+    """Un único tipo para una unión: números juntos a number y cualquier otra
+    mezcla de escalares a string, que el LLM siempre puede producir."""
+    unique = set(types)
+    if len(unique) == 1:
+        return types[0]
+    if unique <= {"integer", "number"}:
+        return "number"
+    if unique <= _SCALARS:
+        return "string"
+    return types[0]
+
+
+class _Compiler:
+    def __init__(self, root: dict):
+        self.defs = root.get("$defs") or root.get("definitions") or {}
+        self.resolving: set = set()
+
+    def ref(self, ref: str) -> dict:
+        name = ref.rsplit("/", 1)[-1]
+        target = self.defs.get(name)
+        if target is None or name in self.resolving:
+            # Referencia desconocida o recursiva: objeto libre.
+            return {"type": "object"}
+        self.resolving.add(name)
+        try:
+            return self.compile(target)
+        finally:
+            self.resolving.discard(name)
+
+    def union(self, variants: List[Any]) -> dict:
+        nullable = False
+        compiled = []
+        for v in variants:
+            if isinstance(v, dict) and v.get("type") == "null":
+                nullable = True
+            else:
+                compiled.append(self.compile(v))
+        if not compiled:
+            out = {"type": "string"}
+        elif len(compiled) == 1:
+            out = dict(compiled[0])
+        else:
+            type_ = _collapse_types([c.get("type", "string") for c in compiled])
+            same = [c for c in compiled if c.get("type") == type_]
+            # Si una variante ya es del tipo elegido, se conserva su forma.
+            out = dict(same[0]) if same else {"type": type_}
+        if nullable:
+            out["nullable"] = True
+        return out
+
+    def compile(self, schema: Any) -> dict:
+        if not isinstance(schema, dict):
+            return {"type": "string"}
+
+        if "$ref" in schema:
+            out = dict(self.ref(schema["$ref"]))
+        elif "anyOf" in schema or "oneOf" in schema:
+            out = self.union(schema.get("anyOf") or schema.get("oneOf"))
+        elif "allOf" in schema and len(schema["allOf"]) == 1:
+            out = dict(self.compile(schema["allOf"][0]))
+        else:
+            out = {}
+            type_ = schema.get("type")
+            if isinstance(type_, list):
+                if "null" in type_:
+                    out["nullable"] = True
+                type_ = _collapse_types([t for t in type_ if t != "null"] or ["string"])
+            if type_ is None:
+                type_ = "object" if "properties" in schema else "array" if "items" in schema else "string"
+            out["type"] = type_
+
+            if type_ == "object":
+                props = schema.get("properties")
+                if props:
+                    out["properties"] = {k: self.compile(v) for k, v in props.items()}
+                    required = [r for r in schema.get("required", ()) if r in props]
+                    if required:
+                        out["required"] = required
+            elif type_ == "array":
+                out["items"] = self.compile(schema["items"]) if "items" in schema else {"type": "string"}
+
+            fmt = schema.get("format")
+            if fmt in _FORMATS.get(type_, ()):
+                out["format"] = fmt
+            if "enum" in schema:
+                out["enum"] = list(schema["enum"])
+            elif "const" in schema:
+                out["enum"] = [schema["const"]]
+
+        if "description" in schema:
+            out["description"] = schema["description"]
+        if schema.get("nullable"):
+            out["nullable"] = True
+        return out
+
+
 def clean_schema_for_gemini(schema: dict) -> dict:
+    """Convierte el `inputSchema` de una tool en los `parameters` de Gemini."""
     if not isinstance(schema, dict):
         return schema
-    cleaned = {}
-    for k, v in schema.items():
-        if k == "additionalProperties":
-            continue
-        if isinstance(v, dict):
-            cleaned[k] = clean_schema_for_gemini(v)
-        elif isinstance(v, list):
-            cleaned[k] = [clean_schema_for_gemini(i) for i in v]
-        else:
-            cleaned[k] = v
-    return cleaned
+    hit = _by_id.get(id(schema))
+    if hit is not None and hit[0] is schema:
+        return hit[1]
+    converted = _Compiler(schema).compile(schema)
+    converted.setdefault("properties", {})
+    converted.setdefault("required", [])
+    if len(_by_id) >= _CACHE_SIZE:
+        _by_id.pop(next(iter(_by_id)))
+    # Se guarda también el esquema para que su id no se reutilice.
+    _by_id[id(schema)] = (schema, converted)
+    return converted
+
+
+def clear_cache():
+    _by_id.clear()
 
 
+def convert_mcp_tools_to_gemini(mcp_tools: List[Any]) -> List[Dict[str, Any]]:
+    """Declaraciones de funciones de Gemini, una por tool MCP."""
+    gemini_tools = []
+    for tool in mcp_tools:
+        schema: Optional[dict] = getattr(tool, "inputSchema", None)
+        parameters = (
+            clean_schema_for_gemini(schema) if schema
+            else {"type": "object", "properties": {}, "required": []}
+        )
+        gemini_tools.append({"function_declarations": [{
+            "name": tool.name,
+            "description": tool.description,
+            "parameters": parameters,
+        }]})
+    return gemini_tools